@@ -0,0 +1,152 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Measure how long it takes to press the split hotkey after a match.
+
+Run from the project root:
+    python scripts/benchmark_split_latency.py [--splits N] [--fps FPS]
+
+Compares ActionDispatcher, which presses the hotkey on its own thread as soon
+as a split is decided on, with the old approach, where the hotkey was pressed
+by the UI the next time it polled the splitter's flags (every 1000 / FPS ms,
+at most 50 ms). No keys are really pressed; the press is only timed. Settings
+are kept in a temporary file, so the real settings aren't touched.
+"""
+
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src"))
+
+
+def measure_polling(splits: int, interval: float) -> list:
+    """Time hotkey presses made by a loop polling a flag, like the old UI.
+
+    Args:
+        splits (int): How many splits to time.
+        interval (float): The poll interval, in seconds.
+
+    Returns:
+        list: The latency of each split, in seconds.
+    """
+    latencies = []
+    decided_at = None
+    finished = threading.Event()
+
+    def poll() -> None:
+        nonlocal decided_at
+        while not finished.is_set():
+            if decided_at is not None:
+                latencies.append(time.perf_counter() - decided_at)
+                decided_at = None
+            time.sleep(interval)
+
+    poller = threading.Thread(target=poll, daemon=True)
+    poller.start()
+    for _ in range(splits):
+        time.sleep(random.uniform(interval, interval * 3))
+        decided_at = time.perf_counter()
+        while decided_at is not None:
+            time.sleep(0.001)
+    finished.set()
+    return latencies
+
+
+def measure_dispatcher(splits: int, interval: float) -> list:
+    """Time hotkey presses made by ActionDispatcher.
+
+    Args:
+        splits (int): How many splits to time.
+        interval (float): Used to space out the splits like measure_polling.
+
+    Returns:
+        list: The latency of each split, in seconds.
+    """
+    from splitter.action_dispatcher import ActionDispatcher, SplitAction
+
+    latencies = []
+    dispatcher = ActionDispatcher(press_key=lambda key_code: None)
+    dispatcher.on_action_sent = lambda action, latency: latencies.append(latency)
+    for _ in range(splits):
+        time.sleep(random.uniform(interval, interval * 3))
+        dispatcher.dispatch(SplitAction.SPLIT)
+    dispatcher.stop()
+    return latencies
+
+
+def describe(latencies: list) -> str:
+    """Summarize a list of latencies.
+
+    Args:
+        latencies (list): Latencies, in seconds.
+
+    Returns:
+        str: The median, 99th percentile, and max, in milliseconds.
+    """
+    in_ms = sorted(latency * 1000 for latency in latencies)
+    p99 = in_ms[min(len(in_ms) - 1, int(len(in_ms) * 0.99))]
+    return (
+        f"median {statistics.median(in_ms):7.2f} ms   p99 {p99:7.2f} ms   "
+        f"max {in_ms[-1]:7.2f} ms"
+    )
+
+
+def main() -> None:
+    """Print the latency of both approaches."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--splits", type=int, default=100, help="splits to time")
+    parser.add_argument("--fps", type=int, default=30, help="the FPS setting")
+    args = parser.parse_args()
+
+    settings_dir = tempfile.TemporaryDirectory()
+    os.environ["PILGRIM_AUTOSPLITTER_SETTINGS"] = os.path.join(
+        settings_dir.name, "settings.json"
+    )
+    import settings
+
+    settings.set_value("SPLIT_HOTKEY_CODE", "f1")
+
+    # The same interval ui_controller polls at
+    interval = min(1000 // args.fps, 50) / 1000
+    polling = describe(measure_polling(args.splits, interval))
+    dispatcher = describe(measure_dispatcher(args.splits, interval))
+    print(f"Polling every {interval * 1000:.0f} ms: {polling}")
+    print(f"ActionDispatcher:      {dispatcher}")
+    settings_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Measure how long Pilgrim Autosplitter takes to show its window.
+
+Run from the project root:
+    python scripts/benchmark_startup.py [--runs N] [--timeline]
+
+Each run starts the program in a fresh Python process and stops it as soon as
+the main window is first painted. Reports the median time from the process
+starting to the first paint, and the median peak memory use at that point. The
+window is painted offscreen unless QT_QPA_PLATFORM is already set.
+
+With --timeline, the startup timeline of the last run is printed too (see
+src/startup_timeline.py).
+"""
+
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src")
+
+# Run in each child process. The event filter watches every paint event, so
+# it works no matter how the window is built.
+CHILD_SCRIPT = """
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, ".")
+import pilgrim_autosplitter
+from PyQt5.QtCore import QEvent, QObject
+
+
+class FirstPaintFilter(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and obj.isWindow():
+            elapsed = time.perf_counter() - START_TIME
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform == "darwin":
+                max_rss //= 1024
+            print(f"RESULT {elapsed} {max_rss}", flush=True)
+            os._exit(0)
+        return False
+
+
+app = pilgrim_autosplitter.PilgrimAutosplitter().app
+paint_filter = FirstPaintFilter()
+app.installEventFilter(paint_filter)
+app.exec()
+"""
+
+
+def run_once(show_timeline: bool) -> tuple:
+    """Start the program in a new process and wait for its first paint.
+
+    Args:
+        show_timeline (bool): Whether to print the startup timeline.
+
+    Returns:
+        tuple: The time to first paint (seconds) and the peak memory use (KB).
+    """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if show_timeline:
+        env["PILGRIM_AUTOSPLITTER_STARTUP_TIMELINE"] = "1"
+
+    # START_TIME is set as the first statement, so interpreter startup is the
+    # only thing not counted
+    script = "import time\nSTART_TIME = time.perf_counter()\n" + CHILD_SCRIPT
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("[startup]") and show_timeline:
+            print(line)
+        if line.startswith("RESULT"):
+            _, elapsed, max_rss = line.split()
+            return float(elapsed), int(max_rss)
+    raise RuntimeError(f"The window was never painted:\n{result.stderr}")
+
+
+def main() -> None:
+    """Start the program several times and print the median results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of starts")
+    parser.add_argument(
+        "--timeline", action="store_true", help="print the last run's timeline"
+    )
+    args = parser.parse_args()
+
+    results = [
+        run_once(args.timeline and run == args.runs - 1) for run in range(args.runs)
+    ]
+    first_paint = statistics.median(elapsed for elapsed, _ in results)
+    max_rss = statistics.median(rss for _, rss in results)
+    print(f"Time to first paint: {first_paint * 1000:8.1f} ms")
+    print(f"Peak memory:         {max_rss / 1024:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
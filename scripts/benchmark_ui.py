@@ -0,0 +1,101 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Measure how long the UI takes to do its work, using an offscreen window.
+
+Run from the project root:
+    python scripts/benchmark_ui.py [--polls N]
+
+Reports the average cost of UIController._poll when nothing has changed (the
+usual case between frames) and when every widget is redrawn.
+"""
+
+
+import argparse
+import os
+import sys
+import time
+
+# Don't open a real window
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src"))
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+import settings  # noqa: E402
+from splitter.splitter import Splitter  # noqa: E402
+from ui.ui_controller import UIController  # noqa: E402
+
+
+def benchmark_poll(controller: UIController, polls: int, redraw_all: bool) -> float:
+    """Time UIController._poll.
+
+    Args:
+        controller (UIController): The controller to poll.
+        polls (int): How many times to poll.
+        redraw_all (bool): If True, make every poll redraw every widget.
+
+    Returns:
+        float: The average time per poll, in microseconds.
+    """
+    total = 0.0
+    for _ in range(polls):
+        if redraw_all:
+            controller._redraw_all = True
+        start_time = time.perf_counter()
+        controller._poll()
+        total += time.perf_counter() - start_time
+    return total / polls * 1_000_000
+
+
+def main() -> None:
+    """Set up the UI offscreen and print the benchmark results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=2000, help="polls per test")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    settings.set_program_vals()
+    splitter = Splitter()
+    controller = UIController(app, splitter)
+    controller._poller.stop()  # Only count the polls made here
+    app.processEvents()
+
+    # Settle the UI before timing anything
+    benchmark_poll(controller, 10, redraw_all=False)
+
+    idle = benchmark_poll(controller, args.polls, redraw_all=False)
+    full = benchmark_poll(controller, args.polls, redraw_all=True)
+    print(f"Idle poll:   {idle:8.1f} us")
+    print(f"Redraw poll: {full:8.1f} us")
+
+    splitter.safe_exit_all_threads()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,487 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Run Pilgrim Autosplitter without a window.
+
+The headless autosplitter captures video, compares it to the split images,
+and presses the split, pause, and reset hotkeys, just like the GUI does, but it
+never imports PyQt5's GUI modules. It starts faster and uses much less memory,
+which makes it a better fit for low-powered machines, capture PCs, and
+servers.
+
+Settings are shared with the GUI, so the easiest way to set it up is to pick a
+split image directory and hotkeys in the GUI first. Alternatively, settings can
+be kept in a JSON file (which doesn't need PyQt5 at all) and changed from the
+command line.
+
+Usage (run from the src directory):
+    python -m headless [split image dir] [--settings FILE] [--set KEY=VALUE]
+        [--duration SECS]
+"""
+
+
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# The longest time (in seconds) between checks of the splitter's flags. Split
+# actions and results wake the loop right away (see Splitter.wait_for_changes),
+# so this only limits how quickly the video is restarted and state server
+# commands are carried out. Same as ui_controller's slowest poll interval.
+POLL_INTERVAL = 0.05
+
+# How long (in seconds) to wait before trying to reopen a video feed that
+# stopped
+CAPTURE_RETRY_INTERVAL = 3
+
+
+class HeadlessAutosplitter:
+    """React to the splitter's split flags without a UI.
+
+    This does the same job as ui_controller's _react_to_split_flags and
+    _request_* methods, minus everything to do with widgets. There's no
+    keyboard listener, so the split hotkey is never "caught" -- the split image
+    is always moved forward here after the hotkey is pressed.
+
+    When the last split is reached, the run is over. If there's a reset image,
+    splitting stops until it's matched. Otherwise, the split images go back to
+    the first one, so the next run can start without restarting the program.
+
+    Imports are in __init__ for the same reason as in PilgrimAutosplitter, and
+    so SETTINGS_FILE_ENV_VAR can be set before settings is imported.
+
+    Attributes:
+        splitter (Splitter): Backend for capturing and comparing images to
+            video.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, str]] = None) -> None:
+        """Load settings and split images, but don't start the video yet.
+
+        Args:
+            overrides (Dict[str, str] | None): Settings to save before the
+                split images are loaded. They're applied after the defaults
+                are filled in, so they aren't overwritten on the first run.
+                Default is None.
+        """
+        import settings
+        from splitter.splitter import Change, Splitter
+        from splitter.state_server import StateServer, get_splitter_state
+        from ui.ui_keyboard_controller import UIKeyboardController
+
+        self._settings = settings
+        self._awaited_changes = Change.ACTION | Change.RESULT
+        settings.set_program_vals()
+        if overrides is not None:
+            for key, value in overrides.items():
+                settings.set_value(key, value)
+
+        self.splitter = Splitter(make_pixmaps=False)
+        # There's nothing to show frames on
+        self.splitter.preview_paused = True
+        self._keyboard = UIKeyboardController()
+        self.splitter.action_dispatcher.press_key = self._keyboard.press_and_release
+        self.splitter.action_dispatcher.on_action_sent = self._log_action_sent
+        self.splitter.action_dispatcher.update_output()
+        self._state_server = None
+        if settings.get_bool("STATE_SERVER_ENABLED"):
+            self._state_server = StateServer(
+                lambda: get_splitter_state(self.splitter),
+                settings.get_int("STATE_SERVER_PORT"),
+                settings.get_float("STATE_SERVER_RATE_HZ"),
+            )
+        self._stop_event = threading.Event()
+        self._warned_similar_pairs = set()
+        self._last_capture_attempt = 0
+        self._video_alive = False
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """Start the splitter and react to it until stop is called.
+
+        Args:
+            duration (float | None): Stop after this many seconds. If None,
+                run until stop is called or Ctrl+C is pressed. Default is None.
+        """
+        self._start_capture()
+        self._start_state_server()
+        end_time = None if duration is None else time.perf_counter() + duration
+
+        try:
+            while not self._stop_event.is_set():
+                self.splitter.wait_for_changes(self._awaited_changes, POLL_INTERVAL)
+                self._poll()
+                if end_time is not None and time.perf_counter() >= end_time:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._log(self.splitter.action_dispatcher.get_stats().describe())
+            self.splitter.safe_exit_all_threads()
+            self.splitter.clip_encoder.stop()
+            self.splitter.close_run_history()
+            if self._state_server is not None:
+                self._state_server.stop()
+
+    def stop(self) -> None:
+        """Make run return. Safe to call from any thread."""
+        self._stop_event.set()
+
+    ###################
+    #                 #
+    # Private Methods #
+    #                 #
+    ###################
+
+    def _poll(self) -> None:
+        """Restart the video if it's down, and react to the splitter's flags."""
+        self._warn_about_similar_images()
+        self._check_video()
+        if not self.splitter.capture_thread.is_alive():
+            if (
+                time.perf_counter() - self._last_capture_attempt
+                > CAPTURE_RETRY_INTERVAL
+            ):
+                self._start_capture()
+            return
+
+        self._react_to_state_server_commands()
+        self._react_to_split_flags()
+        self._set_recording_enabled()
+        self._log_result_text()
+
+    def _warn_about_similar_images(self) -> None:
+        """Log each pair of split images that are similar enough to trigger
+        each other (see SplitDir.similar_pairs), the first time it's found.
+        """
+        similar_pairs = self.splitter.splits.similar_pairs
+        if similar_pairs is None:
+            return
+        dir_path = self._settings.get_str("LAST_IMAGE_DIR")
+        for pair in similar_pairs:
+            key = (dir_path, pair.first.name, pair.second.name)
+            if key not in self._warned_similar_pairs:
+                self._warned_similar_pairs.add(key)
+                self._log(f"Warning: split images look alike: {pair.describe()}")
+
+    def _start_capture(self) -> None:
+        """Try to start the video and the splitter's threads."""
+        if self._last_capture_attempt == 0:
+            source = self._settings.get_int("LAST_CAPTURE_SOURCE_INDEX")
+            self._log(f"Opening video source {source}")
+        self._last_capture_attempt = time.perf_counter()
+        self.splitter.restart()
+
+    def _check_video(self) -> None:
+        """Log when the video feed comes up or goes down.
+
+        splitter.comparison_frame is only set once a frame has been read, and
+        is set back to None when the feed goes down, so it's a better test
+        than whether capture_thread is alive.
+        """
+        video_alive = self.splitter.comparison_frame is not None
+        if video_alive == self._video_alive:
+            return
+
+        self._video_alive = video_alive
+        source = self._settings.get_int("LAST_CAPTURE_SOURCE_INDEX")
+        if video_alive:
+            self._log(
+                f"Capturing from source {source}, "
+                f"{len(self.splitter.splits.list)} split image(s) loaded from "
+                f"{self.splitter.splits.dir_path}"
+            )
+        else:
+            self._log(
+                f"Video source {source} stopped, retrying every "
+                f"{CAPTURE_RETRY_INTERVAL} seconds"
+            )
+
+    def _react_to_split_flags(self) -> None:
+        """Go to next split when self.splitter sets flags.
+
+        The hotkeys have already been pressed by splitter.action_dispatcher.
+        """
+        if self.splitter.pause_split_action:
+            self.splitter.pause_split_action = False
+            self._log(f"Pause split ({self._get_split_name()})")
+            self._post_split_event("pause split")
+            self._next_split()
+
+        elif self.splitter.dummy_split_action:
+            self.splitter.dummy_split_action = False
+            self._log(f"Dummy split ({self._get_split_name()})")
+            self._post_split_event("dummy split")
+            self._next_split()
+
+        elif self.splitter.normal_split_action:
+            self.splitter.normal_split_action = False
+            self._log(f"Split ({self._get_split_name()})")
+            self._post_split_event("split")
+            self._next_split()
+
+        elif self.splitter.reset_split_action:
+            self.splitter.reset_split_action = False
+            self._log("Reset")
+            self._post_split_event("reset")
+            self._reset_splits()
+
+    def _start_state_server(self) -> None:
+        """Start the state server, if STATE_SERVER_ENABLED is set."""
+        if self._state_server is None:
+            return
+        if self._state_server.start():
+            self._log(f"State server listening on port {self._state_server.port}")
+        else:
+            self._log(
+                f"Couldn't start the state server on port {self._state_server.port}"
+            )
+            self._state_server = None
+
+    def _react_to_state_server_commands(self) -> None:
+        """Carry out the commands sent to the state server by its clients,
+        like ui_controller's _react_to_state_server_commands.
+        """
+        # Imported here for the same reason as in __init__
+        from splitter.action_dispatcher import SplitAction
+
+        if self._state_server is None:
+            return
+
+        for command in self._state_server.get_commands():
+            self._log(f"Received {command} command")
+            if command == "split":
+                if self.splitter.compare_split_thread.is_alive():
+                    self.splitter.save_recording = True
+                    self.splitter.normal_split_action = True
+                    self.splitter.action_dispatcher.dispatch(SplitAction.SPLIT)
+
+            elif command == "reset":
+                self.splitter.reset_split_action = True
+                self.splitter.action_dispatcher.dispatch(SplitAction.RESET)
+
+            elif command == "undo":
+                if self.splitter.compare_split_thread.is_alive():
+                    self.splitter.safe_exit_record_thread()
+                    self.splitter.change_splits(
+                        self.splitter.splits.previous_split_image
+                    )
+                    self.splitter.restart_record_thread()
+
+            elif command == "skip":
+                if self.splitter.compare_split_thread.is_alive():
+                    self._next_split()
+
+            elif command == "pause":
+                self.splitter.toggle_suspended()
+
+    def _post_split_event(self, event: str) -> None:
+        """Tell the state server's clients about a split action on the current
+        split image.
+
+        Args:
+            event (str): The kind of split action, e.g. "split" or "reset".
+        """
+        if self._state_server is not None:
+            self._state_server.post_event(event, self._get_split_name() or None)
+
+    def _next_split(self) -> None:
+        """Go to the next split image, or end the run if this was the last
+        one (see the class docstring).
+
+        Recording is handled the same way as in ui_controller's
+        _request_next_split.
+        """
+        if not self.splitter.continue_recording:
+            self.splitter.safe_exit_record_thread()
+
+        splits = self.splitter.splits
+        split_index = splits.current_image_index
+        if split_index == splits.get_last_index() and (
+            splits.current_loop == splits.list[split_index].loops
+        ):
+            self._end_run()
+        else:
+            self.splitter.change_splits(splits.next_split_image)
+
+        if self.splitter.continue_recording:
+            self.splitter.continue_recording = False
+        else:
+            self.splitter.restart_record_thread()
+
+    def _end_run(self) -> None:
+        """Stop looking for splits once the last split is done, and get ready
+        for the next run (see the class docstring).
+        """
+        self.splitter.safe_exit_compare_split_thread()
+        if self.splitter.splits.reset_image is not None:
+            self._log("Run finished, waiting for the reset image")
+        else:
+            self._log("Run finished, starting again from the first split")
+            self.splitter.splits.reset_split_images()
+            self.splitter.restart_compare_split_thread()
+
+    def _reset_splits(self) -> None:
+        """Go back to the first split image and restart the compare threads,
+        like ui_controller's _request_reset_splits.
+        """
+        self.splitter.safe_exit_record_thread()
+        self.splitter.safe_exit_compare_split_thread()
+        self.splitter.safe_exit_compare_reset_thread()
+        self.splitter.splits.reset_split_images()
+
+        if len(self.splitter.splits.list) > 0:
+            self.splitter.restart_compare_split_thread()
+            if self.splitter.splits.reset_image is not None:
+                self.splitter.restart_compare_reset_thread()
+
+        self.splitter.restart_record_thread()
+
+    def _set_recording_enabled(self) -> None:
+        """Enable recording while splits are being compared, except on the
+        first split image (see ui_controller's
+        _set_buttons_and_hotkeys_enabled).
+        """
+        splits = self.splitter.splits
+        self.splitter.recording_enabled = (
+            self.splitter.compare_split_thread.is_alive()
+            and splits.current_image_index is not None
+            and not (splits.current_image_index == 0 and splits.current_loop == 1)
+        )
+
+    def _log_result_text(self) -> None:
+        """Log the splitter's result_text (e.g. that a clip was saved, and how
+        fast clips are being encoded), like ui_controller's
+        _update_video_info_overlay.
+        """
+        text = self.splitter.result_text
+        if text is not None:
+            self.splitter.result_text = None
+            self._log(text)
+
+    def _log_action_sent(self, action: str, latency: float) -> None:
+        """Log when a hotkey was pressed, and when its action actually
+        happened (see ActionDispatcher.on_action_sent).
+
+        Args:
+            action (str): The SplitAction whose hotkey was pressed.
+            latency (float): The time from when the action happened (when the
+                matching frame was captured, plus any delay) to the key press,
+                in seconds.
+        """
+        happened_at = datetime.now() - timedelta(seconds=latency)
+        self._log(
+            f"Pressed {action} hotkey for the {action} at "
+            f"{happened_at.strftime('%H:%M:%S.%f')[:-3]} "
+            f"({latency * 1000:.2f} ms pipeline latency)"
+        )
+
+    def _get_split_name(self) -> str:
+        """Get the name of the current split image.
+
+        Returns:
+            str: The name, or an empty string if there are no split images.
+        """
+        split_index = self.splitter.splits.current_image_index
+        if split_index is None or split_index >= len(self.splitter.splits.list):
+            return ""
+        return self.splitter.splits.list[split_index].name
+
+    def _log(self, message: str) -> None:
+        """Print a timestamped status message.
+
+        Args:
+            message (str): The message.
+        """
+        print(f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] {message}", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the headless autosplitter from the command line.
+
+    Args:
+        argv (List[str] | None): Command line arguments. If None, use
+            sys.argv. Default is None.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m headless",
+        description="Run Pilgrim Autosplitter without a window.",
+    )
+    parser.add_argument(
+        "split_dir",
+        nargs="?",
+        help="split image directory (default: the last one used); saved, like "
+        "choosing it in the GUI",
+    )
+    parser.add_argument(
+        "--settings",
+        metavar="FILE",
+        help="keep settings in this JSON file instead of sharing the GUI's",
+    )
+    parser.add_argument(
+        "--set",
+        metavar="KEY=VALUE",
+        action="append",
+        default=[],
+        help="save a setting before starting, e.g. --set SPLIT_HOTKEY_CODE=f1 "
+        "(can be repeated)",
+    )
+    parser.add_argument(
+        "--duration",
+        metavar="SECS",
+        type=float,
+        help="stop after this many seconds (default: run until Ctrl+C)",
+    )
+    args = parser.parse_args(argv)
+
+    # Must be set before settings is imported (see settings.SETTINGS_FILE_ENV_VAR)
+    if args.settings is not None:
+        os.environ["PILGRIM_AUTOSPLITTER_SETTINGS"] = args.settings
+
+    overrides = {}
+    for assignment in args.set:
+        key, separator, value = assignment.partition("=")
+        if separator == "":
+            parser.error(f"--set needs KEY=VALUE, got {assignment!r}")
+        overrides[key] = value
+    if args.split_dir is not None:
+        overrides["LAST_IMAGE_DIR"] = os.path.abspath(args.split_dir)
+
+    autosplitter = HeadlessAutosplitter(overrides)
+    print("Running Pilgrim Autosplitter without a window. Press Ctrl+C to quit.")
+    autosplitter.run(args.duration)
+
+
+if __name__ == "__main__":
+    # Required for the clip encoder process in PyInstaller builds
+    multiprocessing.freeze_support()
+    main()
@@ -28,6 +28,10 @@
 
 """Initialize and run Pilgrim Autosplitter."""
 
+# Imported first, so the startup timeline starts as early as possible
+from startup_timeline import timeline
+
+import multiprocessing
 import os
 import platform
 import sys
@@ -42,6 +46,11 @@ class PilgrimAutosplitter:
     appear before the import statements are run (they can take a long time to
     complete, especially using PyInstaller).
 
+    Only what's needed to show the main window is done here. Starting the
+    video, the keyboard listener, and the update check waits until the window
+    has been painted (see UIController._finish_startup). Each step is recorded
+    in startup_timeline.timeline.
+
     Attributes:
         pilgrim_autosplitter (QApplication): The application container that
             allows QObjects, including the UI, to be initialized.
@@ -56,10 +65,17 @@ class PilgrimAutosplitter:
         from PyQt5.QtGui import QIcon, QPixmap
         from PyQt5.QtWidgets import QApplication
 
+        timeline.mark("import PyQt5")
+
         import settings
         from splitter.splitter import Splitter
+
+        timeline.mark("import splitter")
+
         from ui.ui_controller import UIController
 
+        timeline.mark("import UI")
+
         program_directory = os.path.dirname(os.path.abspath(__file__))
 
         if platform.system() == "Windows":
@@ -89,23 +105,36 @@ class PilgrimAutosplitter:
             self.app.setWindowIcon(
                 QIcon(QPixmap(f"{program_directory}/../resources/icon-macos.png"))
             )
+        timeline.mark("create QApplication")
 
         settings.set_program_vals()
+        timeline.mark("load settings")
 
         self.splitter = Splitter()
-        if settings.get_bool("START_WITH_VIDEO"):
-            self.splitter.restart()
+        timeline.mark("load split images")
 
+        # The video is started once the window is showing (see
+        # UIController._finish_startup)
         self.ui_controller = UIController(self.app, self.splitter)
+        timeline.mark("build UI")
 
 
 def main():
-    """Initialize PilgrimAutosplitter."""
+    """Initialize PilgrimAutosplitter.
+
+    Pass --startup-timeline to print how long each step of startup takes (see
+    startup_timeline.py).
+    """
+    if "--startup-timeline" in sys.argv:
+        sys.argv.remove("--startup-timeline")
+        timeline.enabled = True
+
     os.system("cls || clear")  # Cross-platform clear screen
 
     print("Welcome to Pilgrim Autosplitter!")
     print("You may minimize this window, but DO NOT close it.\n")
     print("Loading Pilgrim Autosplitter (this may take a few minutes)...")
+    timeline.mark("clear console")
 
     pilgrim_autosplitter = PilgrimAutosplitter()
 
@@ -116,6 +145,18 @@ def main():
     pilgrim_autosplitter.app.aboutToQuit.connect(
         pilgrim_autosplitter.splitter.safe_exit_all_threads
     )
+    # Let the encoder process finish writing any clips that are still queued
+    pilgrim_autosplitter.app.aboutToQuit.connect(
+        pilgrim_autosplitter.splitter.clip_encoder.stop
+    )
+    # Disconnect state server clients instead of leaving them hanging
+    pilgrim_autosplitter.app.aboutToQuit.connect(
+        pilgrim_autosplitter.ui_controller.stop_state_server
+    )
+    # Write any split events that are still queued
+    pilgrim_autosplitter.app.aboutToQuit.connect(
+        pilgrim_autosplitter.splitter.close_run_history
+    )
     # Wait for any singleshot QTimers started by widgets to finish.
     # Right now, this includes only the double click timer in some
     # ui_main_window widgets. If we quit while a timer is running, it
@@ -127,4 +168,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the clip encoder process in PyInstaller builds
+    multiprocessing.freeze_support()
     main()
@@ -29,11 +29,17 @@
 """Persist and reference user settings and key values."""
 
 
+import json
 import os
+import threading
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Optional, Union
 
-import requests
-from PyQt5.QtCore import QSettings
+if TYPE_CHECKING:
+    # Imported in open_settings, so nothing from PyQt5 is imported when
+    # FileSettings is used
+    from PyQt5.QtCore import QSettings
 
 # The width of the frame generated and used by splitter.py to find a match
 COMPARISON_FRAME_WIDTH = 320
@@ -50,8 +56,162 @@ REPO_URL = "https://github.com/pilgrimtabby/pilgrim-autosplitter/"
 # The URL of Pilgrim Autosplitter's user manual
 USER_MANUAL_URL = "https://pilgrimtabby.github.io/pilgrim-autosplitter/"
 
-# Create or access the QSettings file that persists user settings
-settings = QSettings("pilgrim_tabby", "Pilgrim Autosplitter")
+# The GitHub API endpoint describing Pilgrim Autosplitter's latest release. It
+# returns a small JSON document (unlike REPO_URL) and supports conditional
+# requests, which GitHub doesn't count against the rate limit when nothing has
+# changed.
+LATEST_RELEASE_URL = (
+    "https://api.github.com/repos/pilgrimtabby/pilgrim-autosplitter/releases/latest"
+)
+
+# If set, settings are kept in this JSON file instead of in QSettings
+SETTINGS_FILE_ENV_VAR = "PILGRIM_AUTOSPLITTER_SETTINGS"
+
+# Where settings are kept when PyQt5 isn't installed and SETTINGS_FILE_ENV_VAR
+# isn't set
+DEFAULT_SETTINGS_FILE = "~/.pilgrim_autosplitter/settings.json"
+
+
+class FileSettings:
+    """Keep settings in a JSON file, for running without Qt.
+
+    Implements the small part of the QSettings API this module uses, so it can
+    be passed anywhere a QSettings can. Every change is written to disk right
+    away (settings change rarely, and the file is small), so nothing is lost
+    if the program is killed.
+
+    Attributes:
+        path (str): The path to the JSON file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Read the settings file, if it exists.
+
+        Args:
+            path (str): The path to the JSON file. "~" is expanded. The file
+                and its directory are created on the first change.
+        """
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as settings_file:
+                self._values = json.load(settings_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._values = {}
+
+    def value(self, key: str, default: Any = None) -> Any:
+        """Get a setting.
+
+        Args:
+            key (str): The name of the setting.
+            default (Any): Returned if the setting doesn't exist. Default is
+                None, which matches QSettings.
+
+        Returns:
+            Any: The setting.
+        """
+        with self._lock:
+            return self._values.get(key, default)
+
+    def setValue(self, key: str, value: Any) -> None:
+        """Set a setting and save the file.
+
+        Args:
+            key (str): The name of the setting.
+            value (Any): The setting. Must be JSON serializable.
+        """
+        with self._lock:
+            self._values[key] = value
+            self._save()
+
+    def contains(self, key: str) -> bool:
+        """Check whether a setting exists.
+
+        Args:
+            key (str): The name of the setting.
+
+        Returns:
+            bool: True if the setting exists.
+        """
+        with self._lock:
+            return key in self._values
+
+    def allKeys(self) -> List[str]:
+        """Get the name of every setting.
+
+        Returns:
+            List[str]: The names.
+        """
+        with self._lock:
+            return list(self._values)
+
+    def remove(self, key: str) -> None:
+        """Delete a setting, if it exists, and save the file.
+
+        Args:
+            key (str): The name of the setting.
+        """
+        with self._lock:
+            self._values.pop(key, None)
+            self._save()
+
+    def clear(self) -> None:
+        """Delete every setting and save the file."""
+        with self._lock:
+            self._values = {}
+            self._save()
+
+    def sync(self) -> None:
+        """Do nothing, since changes are saved as soon as they're made."""
+        pass
+
+    def fileName(self) -> str:
+        """Get the path to the settings file.
+
+        Returns:
+            str: The path.
+        """
+        return self.path
+
+    def _save(self) -> None:
+        """Write the settings to a temporary file, then replace the settings
+        file with it, so the file is never left half-written.
+
+        Must be called with self._lock held.
+        """
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as settings_file:
+            json.dump(self._values, settings_file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+def open_settings(path: Optional[str] = None) -> Union["QSettings", FileSettings]:
+    """Open the store that persists user settings.
+
+    Args:
+        path (str | None): A JSON settings file to use. If None, use the file
+            named by SETTINGS_FILE_ENV_VAR if it's set, or the QSettings file
+            shared with the GUI if it isn't. If PyQt5 isn't installed, fall
+            back to DEFAULT_SETTINGS_FILE. Default is None.
+
+    Returns:
+        QSettings | FileSettings: The settings store.
+    """
+    if path is None:
+        path = os.environ.get(SETTINGS_FILE_ENV_VAR)
+    if path is None:
+        try:
+            from PyQt5.QtCore import QSettings
+        except ImportError:  # Headless installs don't need PyQt5
+            path = DEFAULT_SETTINGS_FILE
+        else:
+            return QSettings("pilgrim_tabby", "Pilgrim Autosplitter")
+    return FileSettings(path)
+
+
+# Create or access the file that persists user settings
+settings = open_settings()
 
 # The default number of loops per split
 DEFAULT_LOOP_COUNT = 1
@@ -63,7 +223,7 @@ MAX_LOOPS_AND_WAIT = 99999
 MAX_THRESHOLD = 1
 
 
-def get_str(key: str, settings: QSettings = settings) -> str:
+def get_str(key: str, settings: "QSettings" = settings) -> str:
     """Return a str from settings, regardless of the stored value's type.
 
     Args:
@@ -75,7 +235,7 @@ def get_str(key: str, settings: QSettings = settings) -> str:
     return str(settings.value(key))
 
 
-def get_bool(key: str, settings: QSettings = settings) -> bool:
+def get_bool(key: str, settings: "QSettings" = settings) -> bool:
     """Return a bool from settings, regardless of the stored value's type.
 
     Args:
@@ -90,7 +250,7 @@ def get_bool(key: str, settings: QSettings = settings) -> bool:
         return False
 
 
-def get_int(key: str, settings: QSettings = settings) -> int:
+def get_int(key: str, settings: "QSettings" = settings) -> int:
     """Return an int from settings, regardless of the stored value's type.
 
     This should only be used on settings for which is_digit would return True,
@@ -105,7 +265,7 @@ def get_int(key: str, settings: QSettings = settings) -> int:
     return int(settings.value(key))
 
 
-def get_float(key: str, settings: QSettings = settings) -> float:
+def get_float(key: str, settings: "QSettings" = settings) -> float:
     """Return a float from settings, regardless of the stored value's type.
 
     This should only be used to retrieve settings for which float(foo) would
@@ -120,7 +280,7 @@ def get_float(key: str, settings: QSettings = settings) -> float:
     return float(settings.value(key))
 
 
-def set_value(key: str, value: any, settings: QSettings = settings) -> None:
+def set_value(key: str, value: any, settings: "QSettings" = settings) -> None:
     """Persist a setting as a str, regardless of the value's type.
 
     Strings are preferred because QSettings doesn't remember types on all
@@ -133,7 +293,7 @@ def set_value(key: str, value: any, settings: QSettings = settings) -> None:
     settings.setValue(key, str(value))
 
 
-def set_program_vals(settings: QSettings = settings) -> None:
+def set_program_vals(settings: "QSettings" = settings) -> None:
     """Ensure that settings values are updated and make sense before use.
 
     Unsets hotkeys if last used version was <=1.0.6 due to a change in the way
@@ -225,6 +385,64 @@ def set_program_vals(settings: QSettings = settings) -> None:
         # Whether program checks for updates on launch
         set_value("CHECK_FOR_UPDATES", True, settings)
 
+    # Populate settings added after v1.1.0. These are checked one at a time,
+    # instead of being set in the block above, so that users upgrading from
+    # an earlier version get the defaults too.
+    for key, value in {
+        # Memory (in MB) used to keep recent split image directories loaded
+        "SPLIT_SET_MEMORY_MB": 512,
+        # Recently used split image directories, separated by newlines
+        "RECENT_IMAGE_DIRS": "",
+        # Hotkey for switching to the next recent split image directory
+        "NEXT_SPLIT_SET_HOTKEY_NAME": "",
+        "NEXT_SPLIT_SET_HOTKEY_CODE": "",
+        # Record each whole split, or only the frames around each split
+        "RECORD_MODE": "whole split",
+        # Seconds of video kept before and after each split in "around split"
+        # recording mode
+        "RECORD_PRE_SPLIT_SECS": 5.0,
+        "RECORD_POST_SPLIT_SECS": 2.0,
+        # Whether frames are JPEG-compressed in memory in "around split" mode
+        "RECORD_COMPRESS_FRAMES": True,
+        # How often the video preview is refreshed: "same as FPS", a number of
+        # frames per second, or "off while running"
+        "PREVIEW_FPS": "same as FPS",
+        # The latest version found by get_latest_version, and the values it
+        # needs to make a conditional request next time
+        "LATEST_VERSION": "",
+        "LATEST_VERSION_ETAG": "",
+        "LATEST_VERSION_LAST_MODIFIED": "",
+        "LATEST_VERSION_CHECK_TIME": 0.0,
+        # How long (in hours) LATEST_VERSION is trusted before checking again
+        "UPDATE_CHECK_TTL_HOURS": 24.0,
+        # How split actions are sent to the timer: "hotkeys" (pressed like
+        # a keyboard) or "LiveSplit Server" (sent over TCP)
+        "SPLIT_OUTPUT": "hotkeys",
+        # The host and port of LiveSplit Server
+        "LIVESPLIT_SERVER_ADDRESS": "localhost:16834",
+        # Whether to set LiveSplit's game time to the corrected split time
+        "LIVESPLIT_SYNC_GAME_TIME": False,
+        # Whether other programs on this machine can connect to see the
+        # splitter's state and send commands (see state_server.py), the port
+        # they connect to, and how many times per second state is sent
+        "STATE_SERVER_ENABLED": False,
+        "STATE_SERVER_PORT": 16835,
+        "STATE_SERVER_RATE_HZ": 20.0,
+        # Whether each comparison frame and the match percents are written to
+        # a memory-mapped file for other programs (see frame_export.py), and
+        # the file's path ("" for the default, in the temp directory). Read
+        # when the program starts and each time settings are saved
+        "FRAME_EXPORT_ENABLED": False,
+        "FRAME_EXPORT_PATH": "",
+        # Whether each split and reset is recorded to a database (see
+        # run_history.py), and the database's path ("" for the default). Read
+        # when the program starts and each time settings are saved
+        "RUN_HISTORY_ENABLED": False,
+        "RUN_HISTORY_PATH": "",
+    }.items():
+        if not settings.contains(key):
+            set_value(key, value, settings)
+
     # Make sure image dir exists and is within the user's home dir
     # (This limits i/o to user-controlled areas)
     last_image_dir = get_str("LAST_IMAGE_DIR", settings)
@@ -297,6 +515,7 @@ def unset_hotkey_bindings() -> None:
     set_value("NEXT_HOTKEY_NAME", "", settings)
     set_value("SCREENSHOT_HOTKEY_NAME", "", settings)
     set_value("TOGGLE_HOTKEYS_HOTKEY_NAME", "", settings)
+    set_value("NEXT_SPLIT_SET_HOTKEY_NAME", "", settings)
 
     # Key IDs
     set_value("SPLIT_HOTKEY_CODE", "", settings)
@@ -308,40 +527,79 @@ def unset_hotkey_bindings() -> None:
     set_value("NEXT_HOTKEY_CODE", "", settings)
     set_value("SCREENSHOT_HOTKEY_CODE", "", settings)
     set_value("TOGGLE_HOTKEYS_HOTKEY_CODE", "", settings)
+    set_value("NEXT_SPLIT_SET_HOTKEY_CODE", "", settings)
 
 
-def get_latest_version() -> str:
-    """Get the latest release's version number from the github repo.
+def get_latest_version(
+    url: str = LATEST_RELEASE_URL, settings: "QSettings" = settings
+) -> str:
+    """Get the latest release's version number from GitHub.
 
-    The `try` block at the beginning is to handle cases where the internet is
-    either (1) not connected or (2) very slow.
+    This can take a few seconds, so it should be called from a background
+    thread (see ui_controller._check_for_update).
+
+    The result is cached in LATEST_VERSION. If the cached version was checked
+    less than UPDATE_CHECK_TTL_HOURS ago, it's returned without making a
+    request. Otherwise, a conditional request is made using the ETag and
+    Last-Modified values from last time, so if nothing has changed, GitHub
+    replies 304 Not Modified with no body.
+
+    Args:
+        url (str): The endpoint to ask. It should return JSON with the latest
+            version in "tag_name". Default is LATEST_RELEASE_URL.
+        settings (QSettings): The settings to cache the result in. Default is
+            the program's settings.
 
     Returns:
-        str: The version number (or the current version if something goes
-            wrong).
+        str: The version number (or the cached version, or the current version
+            if there isn't one, if something goes wrong).
     """
-    try:
-        # Use timeout=1 to prevent hanging for too long
-        github_page_text = requests.get(REPO_URL, timeout=1).text
-    except (requests.exceptions.ConnectionError, requests.Timeout):
-        return VERSION_NUMBER
-
-    # The way GitHub works right now, releases_text is present in the html
-    # right before the most recent release number. I know this is a pretty
-    # hacky way of finding the latest release number...
-    releases_text = "/pilgrimtabby/pilgrim-autosplitter/releases/tag/"
-    releases_text_index = int(github_page_text.find(releases_text))
-
-    if releases_text_index == -1:
-        return VERSION_NUMBER  # releases_text text not found, don't worry
+    cached_version = get_str("LATEST_VERSION", settings)
+    if cached_version in ("", "None"):
+        cached_version = None
     else:
-        version_location = releases_text_index + len(releases_text)
-        # The version number is follow by a quotation mark. 9 extra chars is
-        # more than we need, but we're splitting by the `"` anyway.
-        latest_version = github_page_text[
-            version_location : (version_location + 9)
-        ].split('"')[0]
-        return latest_version
+        checked_ago = time.time() - get_float("LATEST_VERSION_CHECK_TIME", settings)
+        if 0 <= checked_ago < get_float("UPDATE_CHECK_TTL_HOURS", settings) * 3600:
+            return cached_version
+
+    fallback_version = VERSION_NUMBER if cached_version is None else cached_version
+    headers = {"Accept": "application/vnd.github+json"}
+    if cached_version is not None:
+        etag = get_str("LATEST_VERSION_ETAG", settings)
+        last_modified = get_str("LATEST_VERSION_LAST_MODIFIED", settings)
+        if etag not in ("", "None"):
+            headers["If-None-Match"] = etag
+        if last_modified not in ("", "None"):
+            headers["If-Modified-Since"] = last_modified
+
+    # Imported here because it's slow to import and only needed once
+    import requests
+
+    try:
+        response = requests.get(url, headers=headers, timeout=5)
+    except requests.RequestException:
+        return fallback_version
+
+    if response.status_code == 304 and cached_version is not None:
+        set_value("LATEST_VERSION_CHECK_TIME", time.time(), settings)
+        return cached_version
+    if response.status_code != 200:
+        return fallback_version
+
+    try:
+        latest_version = str(response.json()["tag_name"])
+    except (ValueError, KeyError, TypeError):
+        return fallback_version
+
+    set_value("LATEST_VERSION", latest_version, settings)
+    set_value("LATEST_VERSION_ETAG", response.headers.get("ETag", ""), settings)
+    set_value(
+        "LATEST_VERSION_LAST_MODIFIED",
+        response.headers.get("Last-Modified", ""),
+        settings,
+    )
+    set_value("LATEST_VERSION_CHECK_TIME", time.time(), settings)
+    return latest_version
 
 
 def get_home_dir() -> str:
@@ -0,0 +1,286 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Press the hotkey for each split action as soon as the splitter decides on it.
+
+Split actions used to be pressed by ui_controller the next time it polled the
+splitter's flags, which added up to a whole poll interval (up to 50 ms) to
+every split. Now the compare threads hand each action to an ActionDispatcher,
+whose output thread is always waiting for one, so the hotkey is pressed
+immediately. The flags are still set, and ui_controller still reads them to
+move to the next split image and update the UI, but it no longer presses any
+keys.
+
+Instead of pressing hotkeys, actions can be sent to LiveSplit Server (see
+livesplit_server.py), depending on the SPLIT_OUTPUT setting.
+"""
+
+
+import queue
+import threading
+from typing import Callable, Optional
+
+import settings
+from splitter.clock import REAL_CLOCK, Clock
+
+
+class SplitAction:
+    """The split actions that press a hotkey.
+
+    Plain strings (rather than an Enum) so they can be used directly as keys,
+    like Change in splitter.py.
+    """
+
+    SPLIT = "split"
+    PAUSE = "pause"
+    RESET = "reset"
+
+
+# The setting holding the key code pressed for each SplitAction
+ACTION_HOTKEY_SETTINGS = {
+    SplitAction.SPLIT: "SPLIT_HOTKEY_CODE",
+    SplitAction.PAUSE: "PAUSE_HOTKEY_CODE",
+    SplitAction.RESET: "RESET_HOTKEY_CODE",
+}
+
+# The values of the SPLIT_OUTPUT setting
+OUTPUT_HOTKEYS = "hotkeys"
+OUTPUT_LIVESPLIT_SERVER = "LiveSplit Server"
+
+
+class DispatchStats:
+    """How quickly ActionDispatcher has pressed hotkeys.
+
+    Latency is measured from the moment the action happened to the moment the
+    hotkey had been pressed and released (or the action had been sent to
+    ActionDispatcher.output). The splitter says an action happened
+    when the frame that triggered it was captured (plus any delay), so the
+    latency covers the whole pipeline: waiting to be compared, comparing, and
+    pressing the key. If no time is given, it's measured from when dispatch
+    was called. Actions whose hotkey isn't set, or that couldn't be sent, aren't
+    counted.
+
+    Attributes:
+        actions_sent (int): The number of hotkeys pressed.
+        last_latency_ms (float | None): The most recent latency, in
+            milliseconds, or None if no hotkeys have been pressed.
+        max_latency_ms (float): The highest latency, in milliseconds.
+        mean_latency_ms (float): The average latency, in milliseconds.
+    """
+
+    def __init__(
+        self,
+        actions_sent: int,
+        total_latency: float,
+        max_latency: float,
+        last_latency: Optional[float],
+    ) -> None:
+        """Convert the dispatcher's totals (in seconds) to a snapshot.
+
+        Args:
+            actions_sent (int): The number of hotkeys pressed.
+            total_latency (float): The sum of every latency, in seconds.
+            max_latency (float): The highest latency, in seconds.
+            last_latency (float | None): The most recent latency, in seconds.
+        """
+        self.actions_sent = actions_sent
+        self.mean_latency_ms = total_latency / max(actions_sent, 1) * 1000
+        self.max_latency_ms = max_latency * 1000
+        self.last_latency_ms = None if last_latency is None else last_latency * 1000
+
+    def describe(self) -> str:
+        """Summarize the stats in a sentence, e.g. for logs.
+
+        Returns:
+            str: The summary.
+        """
+        if self.actions_sent == 0:
+            return "No split actions sent yet"
+        return (
+            f"{self.actions_sent} split action(s) sent, "
+            f"{self.mean_latency_ms:.2f} ms average latency, "
+            f"{self.max_latency_ms:.2f} ms slowest"
+        )
+
+
+class ActionDispatcher:
+    """Press split action hotkeys on a dedicated output thread.
+
+    Attributes:
+        on_action_sent (Callable[[str, float], None] | None): Called on the
+            output thread after each hotkey is pressed, with the SplitAction
+            and its latency in seconds (see DispatchStats). Subtracting the
+            latency from the current time gives when the action actually
+            happened, e.g. to correct a split time. Should return quickly.
+        output (LiveSplitServer | None): Where actions are sent instead of
+            pressing hotkeys, or None to press hotkeys. Set by update_output.
+        press_key (Callable[[str], None] | None): Presses and releases a key,
+            given its key code (e.g. UIKeyboardController.press_and_release).
+            Set by whatever owns the keyboard. If None, actions are dropped.
+    """
+
+    def __init__(
+        self,
+        press_key: Optional[Callable[[str], None]] = None,
+        clock: Clock = REAL_CLOCK,
+    ) -> None:
+        """Set up the dispatcher. The output thread starts on the first
+        dispatch.
+
+        Args:
+            press_key (Callable[[str], None] | None): See press_key above.
+                Default is None.
+            clock (Clock): The clock action times and latencies are measured
+                on (see clock.py). Default is REAL_CLOCK.
+        """
+        self.press_key = press_key
+        self._clock = clock
+        self.on_action_sent = None
+        self.output = None
+        # Held while self.output is sending or being replaced
+        self._output_lock = threading.Lock()
+        # Holds (action, self._clock.now() when it happened) pairs
+        self._actions = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._send_actions)
+        self._stats_lock = threading.Lock()
+        self._actions_sent = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._last_latency = None
+
+    def dispatch(self, action: str, occurred_at: Optional[float] = None) -> None:
+        """Press an action's hotkey as soon as possible.
+
+        Returns right away, so it's safe to call from the compare threads.
+
+        Args:
+            action (str): A SplitAction.
+            occurred_at (float | None): When the action happened, as a
+                clock.now() value (see DispatchStats). If None, use the
+                current time. Default is None.
+        """
+        if occurred_at is None:
+            occurred_at = self._clock.now()
+        self._actions.put((action, occurred_at))
+        if not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._send_actions)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def update_output(self) -> None:
+        """Send actions to the output chosen in settings.
+
+        Call this when the SPLIT_OUTPUT, LIVESPLIT_SERVER_ADDRESS, or
+        LIVESPLIT_SYNC_GAME_TIME settings change. The connection to LiveSplit
+        Server isn't opened until the first action is sent.
+        """
+        # Imported here, since livesplit_server imports this module
+        from splitter.livesplit_server import LiveSplitServer, parse_address
+
+        output = None
+        if settings.get_str("SPLIT_OUTPUT") == OUTPUT_LIVESPLIT_SERVER:
+            try:
+                address = parse_address(settings.get_str("LIVESPLIT_SERVER_ADDRESS"))
+            except ValueError:
+                address = parse_address("")
+            output = LiveSplitServer(
+                address, settings.get_bool("LIVESPLIT_SYNC_GAME_TIME")
+            )
+
+        with self._output_lock:
+            if self.output is not None:
+                self.output.close()
+            self.output = output
+
+    def get_stats(self) -> DispatchStats:
+        """Get how quickly hotkeys have been pressed so far.
+
+        Returns:
+            DispatchStats: The stats.
+        """
+        with self._stats_lock:
+            return DispatchStats(
+                self._actions_sent,
+                self._total_latency,
+                self._max_latency,
+                self._last_latency,
+            )
+
+    def stop(self, timeout: float = 1) -> None:
+        """Press any hotkeys that are still queued, then stop the output
+        thread.
+
+        Args:
+            timeout (float): The longest to wait, in seconds. Default is 1.
+        """
+        if self._thread.is_alive():
+            self._actions.put(None)
+            self._thread.join(timeout)
+
+    def _send_actions(self) -> None:
+        """Wait for actions and press their hotkeys (or send them to
+        self.output) until stop is called."""
+        while True:
+            item = self._actions.get()
+            if item is None:
+                return
+
+            action, occurred_at = item
+            if not self._send_action(action, occurred_at):
+                continue
+
+            latency = self._clock.now() - occurred_at
+            with self._stats_lock:
+                self._actions_sent += 1
+                self._total_latency += latency
+                self._max_latency = max(self._max_latency, latency)
+                self._last_latency = latency
+            if self.on_action_sent is not None:
+                self.on_action_sent(action, latency)
+
+    def _send_action(self, action: str, occurred_at: float) -> bool:
+        """Press an action's hotkey, or send it to self.output if it's set.
+
+        Args:
+            action (str): The SplitAction.
+            occurred_at (float): When the action happened, as a
+                clock.now() value.
+
+        Returns:
+            bool: True if the action was sent.
+        """
+        with self._output_lock:
+            if self.output is not None:
+                return self.output.send(action, occurred_at)
+
+        key_code = settings.get_str(ACTION_HOTKEY_SETTINGS[action])
+        if self.press_key is None or key_code in ("", "None"):
+            return False
+        self.press_key(key_code)
+        return True
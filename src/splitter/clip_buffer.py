@@ -0,0 +1,229 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Buffer recent frames in memory and write clips around splits."""
+
+
+import threading
+from collections import deque
+from queue import SimpleQueue
+from typing import Callable, List, Optional
+
+import cv2
+import numpy
+
+from splitter.clip_encoder import ClipEncoder
+
+# Quality used when compressing buffered frames. High enough that compression
+# isn't noticeable in a 320x240 clip, low enough to cut memory use ~10x.
+JPEG_QUALITY = 90
+
+
+class FrameRing:
+    """Hold the most recent frames, dropping the oldest when full.
+
+    Frames can be stored as-is or JPEG-compressed. Compressed frames cost a
+    little CPU to encode (cv2 releases the GIL while it does this), but use a
+    fraction of the memory, so longer pre-split windows stay cheap.
+
+    Attributes:
+        jpeg_quality (int): The quality frames are compressed with, or 0 if
+            they're stored as-is.
+        max_frames (int): The most frames the ring holds.
+    """
+
+    def __init__(self, max_frames: int = 0, jpeg_quality: int = 0) -> None:
+        """Make an empty ring.
+
+        Args:
+            max_frames (int): The most frames the ring holds. Default is 0.
+            jpeg_quality (int): The quality to compress frames with, or 0 to
+                store them as-is. Default is 0.
+        """
+        self.max_frames = max_frames
+        self.jpeg_quality = jpeg_quality
+        self._frames = deque(maxlen=max_frames)
+
+    def configure(self, max_frames: int, jpeg_quality: int) -> None:
+        """Change the ring's size and compression, clearing it if either
+        changed.
+
+        Args:
+            max_frames (int): The most frames the ring holds.
+            jpeg_quality (int): The quality to compress frames with, or 0 to
+                store them as-is.
+        """
+        if max_frames != self.max_frames or jpeg_quality != self.jpeg_quality:
+            self.max_frames = max_frames
+            self.jpeg_quality = jpeg_quality
+            self._frames = deque(maxlen=max_frames)
+
+    def append(self, frame: numpy.ndarray) -> None:
+        """Add a frame, dropping the oldest frame if the ring is full.
+
+        Args:
+            frame (numpy.ndarray): The frame to add.
+        """
+        self._frames.append(self.encode(frame))
+
+    def encode(self, frame: numpy.ndarray) -> numpy.ndarray:
+        """Compress a frame the way the ring stores it.
+
+        Args:
+            frame (numpy.ndarray): The frame to compress.
+
+        Returns:
+            numpy.ndarray: The JPEG-encoded frame, or the frame itself if
+            compression is off.
+        """
+        if self.jpeg_quality == 0:
+            return frame
+        return cv2.imencode(
+            ".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        )[1]
+
+    def snapshot(self) -> List[numpy.ndarray]:
+        """Get the frames currently in the ring, oldest first.
+
+        Returns:
+            List[numpy.ndarray]: The stored (possibly compressed) frames.
+        """
+        return list(self._frames)
+
+    def clear(self) -> None:
+        """Remove all frames from the ring."""
+        self._frames.clear()
+
+    def get_memory_usage(self) -> int:
+        """Get the number of bytes used by the frames in the ring.
+
+        Returns:
+            int: The memory used, in bytes.
+        """
+        return sum(frame.nbytes for frame in list(self._frames))
+
+
+def decode_frame(frame: numpy.ndarray) -> numpy.ndarray:
+    """Decompress a frame stored by FrameRing.
+
+    JPEG-encoded frames are 1-dimensional byte arrays, so they're easy to tell
+    apart from frames stored as-is.
+
+    Args:
+        frame (numpy.ndarray): The stored frame.
+
+    Returns:
+        numpy.ndarray: The frame as a BGR image.
+    """
+    if frame.ndim == 1:
+        return cv2.imdecode(frame, cv2.IMREAD_COLOR)
+    return frame
+
+
+class PendingClip:
+    """A clip whose post-split frames are still being collected.
+
+    Attributes:
+        fps (int): The clip's framerate.
+        frames (List[numpy.ndarray]): The clip's (possibly compressed) frames.
+        frames_left (int): How many more frames the clip needs.
+        path (str): Where the clip will be written.
+    """
+
+    def __init__(
+        self, path: str, fps: int, frames: List[numpy.ndarray], frames_left: int
+    ) -> None:
+        """Store the clip's details.
+
+        Args:
+            path (str): Where the clip will be written.
+            fps (int): The clip's framerate.
+            frames (List[numpy.ndarray]): The pre-split frames.
+            frames_left (int): How many post-split frames to collect.
+        """
+        self.path = path
+        self.fps = fps
+        self.frames = frames
+        self.frames_left = frames_left
+
+
+class ClipWriter:
+    """Decode clips and send them to a ClipEncoder on a background thread, so
+    the record thread never waits on decoding or encoding.
+    """
+
+    def __init__(
+        self,
+        encoder: ClipEncoder,
+        on_clip_saved: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Set up the writer. The thread is started the first time a clip is
+        written.
+
+        Args:
+            encoder (ClipEncoder): The encoder that writes the clips.
+            on_clip_saved (Callable[[str], None] | None): Called with each
+                clip's path once all its frames are sent to the encoder.
+                Default is None.
+        """
+        self._encoder = encoder
+        self._on_clip_saved = on_clip_saved
+        self._clip_queue = SimpleQueue()
+        self._start_lock = threading.Lock()
+        self._writer_thread = threading.Thread(target=self._write_clips)
+        self._writer_thread.daemon = True
+
+    def write(self, clip: PendingClip) -> None:
+        """Queue a clip to be written.
+
+        Args:
+            clip (PendingClip): The clip. Its frames_left are ignored.
+        """
+        self._clip_queue.put(clip)
+        with self._start_lock:
+            if not self._writer_thread.is_alive():
+                self._writer_thread.start()
+
+    def _write_clips(self) -> None:
+        """Send each queued clip to the encoder.
+
+        Waits for the encoder instead of dropping frames, since these frames
+        were already captured and nothing is waiting on this thread. A
+        blocking write only fails if the encoder process stopped, so the rest
+        of the clip is skipped then.
+        """
+        while True:
+            clip = self._clip_queue.get()
+            stream_id = self._encoder.open_stream(clip.path, clip.fps)
+            for frame in clip.frames:
+                if not self._encoder.write(stream_id, decode_frame(frame), block=True):
+                    break
+            self._encoder.close_stream(stream_id, save_path=clip.path)
+
+            if self._on_clip_saved is not None:
+                self._on_clip_saved(clip.path)
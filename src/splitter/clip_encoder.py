@@ -0,0 +1,392 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Encode clips in a separate process, fed frames through shared memory.
+
+Encoding mp4v video is CPU-heavy, and cv2 holds the GIL for part of every
+VideoWriter.write call. Doing it in the record thread meant the capture and
+compare threads had to fight it for the GIL, which cost comparisons. Instead,
+the record thread copies each frame into a slot in a block of shared memory
+and sends the slot's index to an encoder process, which writes the frame and
+hands the slot back. The copy is cheap (a 320x240 frame is 225 KiB), and no
+frame is ever pickled.
+
+There are a fixed number of slots. If they're all waiting to be encoded, the
+encoder can't keep up, and write either drops the frame (live recording, which
+must never block capture) or waits for a slot (clips written after the fact,
+for as long as the encoder process is running).
+EncoderStats reports how close the encoder is to falling behind.
+"""
+
+
+import multiprocessing
+import pathlib
+import queue
+import threading
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy
+
+from settings import COMPARISON_FRAME_HEIGHT, COMPARISON_FRAME_WIDTH
+
+FRAME_SHAPE = (COMPARISON_FRAME_HEIGHT, COMPARISON_FRAME_WIDTH, 3)
+# About 1 second of 30 FPS video, or 7 MiB of shared memory
+ENCODER_SLOTS = 32
+# How often a blocking write checks that the encoder process is still running
+# while it waits for a free slot, in seconds
+SLOT_WAIT_SECS = 0.5
+
+
+class EncoderStats:
+    """A snapshot of ClipEncoder's performance.
+
+    Attributes:
+        frames_dropped (int): Frames thrown away because every slot was in use.
+        frames_encoded (int): Frames the encoder process has written.
+        mean_encode_ms (float): The average time the encoder process spent
+            writing each frame, in milliseconds.
+        queue_depth (int): Frames sent to the encoder process that it hasn't
+            written yet.
+        slot_count (int): The most frames that can be waiting at once.
+    """
+
+    def __init__(
+        self,
+        queue_depth: int,
+        slot_count: int,
+        frames_encoded: int,
+        frames_dropped: int,
+        encode_secs: float,
+    ) -> None:
+        """Store the stats.
+
+        Args:
+            queue_depth (int): Frames waiting to be encoded.
+            slot_count (int): The most frames that can be waiting at once.
+            frames_encoded (int): Frames written so far.
+            frames_dropped (int): Frames dropped so far.
+            encode_secs (float): Total time spent writing frames, in seconds.
+        """
+        self.queue_depth = queue_depth
+        self.slot_count = slot_count
+        self.frames_encoded = frames_encoded
+        self.frames_dropped = frames_dropped
+        if frames_encoded > 0:
+            self.mean_encode_ms = encode_secs / frames_encoded * 1000
+        else:
+            self.mean_encode_ms = 0.0
+
+
+class ClipEncoder:
+    """Write clips with an encoder process that shares frame memory with this
+    one.
+
+    Several clips (streams) can be open at once, e.g. a whole-split recording
+    and an around-split clip being written. Commands for all of them go to the
+    encoder process in one queue, so they're carried out in the order they
+    were sent.
+
+    The process is started by start, or the first time a stream is opened,
+    and runs until stop is called.
+    """
+
+    def __init__(self, slot_count: int = ENCODER_SLOTS) -> None:
+        """Set up the encoder without starting its process.
+
+        Args:
+            slot_count (int): The number of frames that can be waiting to be
+                encoded at once. Default is ENCODER_SLOTS.
+        """
+        self._slot_count = slot_count
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._process = None
+        self._shared_memory = None
+        self._frames = None
+        self._commands = None
+        self._free_slots = None
+        self._next_stream_id = 0
+        # Guards _frames_dropped, which write and get_stats can use at once
+        self._stats_lock = threading.Lock()
+        self._frames_dropped = 0
+
+        # Updated by the encoder process
+        self._in_flight = self._context.Value("i", 0)
+        self._frames_encoded = self._context.Value("q", 0)
+        self._encode_secs = self._context.Value("d", 0.0)
+
+    def start(self) -> None:
+        """Start the encoder process ahead of time, if it isn't running.
+
+        Starting the process takes a moment, and frames sent before it's ready
+        can only wait in the slots, so start it before frames are expected.
+        """
+        with self._lock:
+            self._start()
+
+    def open_stream(self, path: str, fps: int) -> int:
+        """Start writing a new clip, starting the encoder process if needed.
+
+        Args:
+            path (str): Where to write the clip.
+            fps (int): The clip's framerate.
+
+        Returns:
+            int: The stream's id, to pass to write and close_stream.
+        """
+        with self._lock:
+            self._start()
+            stream_id = self._next_stream_id
+            self._next_stream_id += 1
+            self._commands.put(("open", stream_id, path, fps))
+        return stream_id
+
+    def write(self, stream_id: int, frame: numpy.ndarray, block: bool = False) -> bool:
+        """Send a frame to be encoded.
+
+        Args:
+            stream_id (int): The stream to add the frame to.
+            frame (numpy.ndarray): The frame. Resized if it isn't the
+                comparison frame size.
+            block (bool): If True, wait for a free slot for as long as the
+                encoder process is running; otherwise, drop the frame if there
+                isn't one. Default is False.
+
+        Returns:
+            bool: True if the frame was sent, False if it was dropped (which
+            it always is if the encoder is stopped).
+        """
+        slot = self._get_free_slot(block)
+        if slot is None:
+            with self._stats_lock:
+                self._frames_dropped += 1
+            return False
+
+        if frame.shape != FRAME_SHAPE:
+            frame = cv2.resize(
+                frame,
+                (COMPARISON_FRAME_WIDTH, COMPARISON_FRAME_HEIGHT),
+                interpolation=cv2.INTER_LINEAR,
+            )
+        self._frames[slot] = frame
+
+        with self._in_flight.get_lock():
+            self._in_flight.value += 1
+        self._commands.put(("frame", stream_id, slot))
+        return True
+
+    def close_stream(self, stream_id: int, save_path: Optional[str] = None) -> None:
+        """Finish a clip once its frames are encoded.
+
+        Returns right away; the encoder process finishes the clip after it
+        writes the frames already sent.
+
+        Args:
+            stream_id (int): The stream to finish.
+            save_path (str | None): Where to save the clip. If it's not the
+                path the stream was opened with, the clip is moved there. If
+                None, the clip is deleted. Default is None.
+        """
+        self._commands.put(("close", stream_id, save_path))
+
+    def get_stats(self) -> EncoderStats:
+        """Get the encoder's current performance stats.
+
+        Returns:
+            EncoderStats: The stats.
+        """
+        with self._stats_lock:
+            frames_dropped = self._frames_dropped
+        return EncoderStats(
+            queue_depth=self._in_flight.value,
+            slot_count=self._slot_count,
+            frames_encoded=self._frames_encoded.value,
+            frames_dropped=frames_dropped,
+            encode_secs=self._encode_secs.value,
+        )
+
+    def stop(self, timeout: float = 5) -> None:
+        """Finish every clip that's been sent, then end the encoder process
+        and free the shared memory.
+
+        Args:
+            timeout (float): How long to wait for the process to finish before
+                killing it, in seconds. Default is 5.
+        """
+        with self._lock:
+            if self._process is None:
+                return
+            self._commands.put(("stop",))
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+            self._process = None
+            self._free_slots = None
+
+            self._frames = None
+            self._shared_memory.close()
+            self._shared_memory.unlink()
+            self._shared_memory = None
+
+    def _get_free_slot(self, block: bool) -> Optional[int]:
+        """Take a free frame slot.
+
+        Args:
+            block (bool): If True, wait for a slot for as long as the encoder
+                process is running.
+
+        Returns:
+            int | None: The slot, or None if there isn't one (or the encoder
+            is stopped).
+        """
+        # Read once, since stop can clear it at any time
+        free_slots = self._free_slots
+        if free_slots is None:
+            return None
+
+        while True:
+            try:
+                return free_slots.get(block=block, timeout=SLOT_WAIT_SECS)
+            except queue.Empty:
+                process = self._process
+                if not block or process is None or not process.is_alive():
+                    return None
+
+    def _start(self) -> None:
+        """Start the encoder process and allocate its shared memory, if that
+        hasn't been done yet. Must be called with self._lock held.
+        """
+        if self._process is not None:
+            return
+
+        frame_bytes = int(numpy.prod(FRAME_SHAPE))
+        self._shared_memory = SharedMemory(
+            create=True, size=frame_bytes * self._slot_count
+        )
+        self._frames = numpy.ndarray(
+            (self._slot_count, *FRAME_SHAPE),
+            dtype=numpy.uint8,
+            buffer=self._shared_memory.buf,
+        )
+        self._commands = self._context.Queue()
+        self._free_slots = self._context.Queue()
+        for slot in range(self._slot_count):
+            self._free_slots.put(slot)
+        self._in_flight.value = 0
+
+        self._process = self._context.Process(
+            target=_run_encoder,
+            args=(
+                self._shared_memory.name,
+                self._slot_count,
+                self._commands,
+                self._free_slots,
+                self._in_flight,
+                self._frames_encoded,
+                self._encode_secs,
+            ),
+        )
+        # Don't keep the program open if it quits without calling stop
+        self._process.daemon = True
+        self._process.start()
+
+
+def _run_encoder(
+    shared_memory_name: str,
+    slot_count: int,
+    commands: "multiprocessing.Queue",
+    free_slots: "multiprocessing.Queue",
+    in_flight: "multiprocessing.Value",
+    frames_encoded: "multiprocessing.Value",
+    encode_secs: "multiprocessing.Value",
+) -> None:
+    """Carry out ClipEncoder's commands. Runs in the encoder process.
+
+    Args:
+        shared_memory_name (str): The name of the frame slots' shared memory.
+        slot_count (int): The number of frame slots.
+        commands (multiprocessing.Queue): Commands from ClipEncoder.
+        free_slots (multiprocessing.Queue): Where to return each slot once
+            its frame is written.
+        in_flight (multiprocessing.Value): Frames waiting to be written.
+        frames_encoded (multiprocessing.Value): Frames written so far.
+        encode_secs (multiprocessing.Value): Time spent writing frames so far.
+    """
+    shared_memory = SharedMemory(name=shared_memory_name)
+    frames = numpy.ndarray(
+        (slot_count, *FRAME_SHAPE), dtype=numpy.uint8, buffer=shared_memory.buf
+    )
+    streams: Dict[int, Tuple[cv2.VideoWriter, str]] = {}
+
+    while True:
+        command = commands.get()
+
+        if command[0] == "open":
+            stream_id, path, fps = command[1:]
+            writer = cv2.VideoWriter(
+                path,
+                cv2.VideoWriter_fourcc(*"mp4v"),
+                fps,
+                (COMPARISON_FRAME_WIDTH, COMPARISON_FRAME_HEIGHT),
+            )
+            streams[stream_id] = (writer, path)
+
+        elif command[0] == "frame":
+            stream_id, slot = command[1:]
+            start_time = time.perf_counter()
+            streams[stream_id][0].write(frames[slot])
+            elapsed = time.perf_counter() - start_time
+
+            free_slots.put(slot)
+            with in_flight.get_lock():
+                in_flight.value -= 1
+            with frames_encoded.get_lock():
+                frames_encoded.value += 1
+            with encode_secs.get_lock():
+                encode_secs.value += elapsed
+
+        elif command[0] == "close":
+            stream_id, save_path = command[1:]
+            writer, path = streams.pop(stream_id)
+            writer.release()
+            if save_path is None:
+                pathlib.Path(path).unlink(missing_ok=True)
+            elif save_path != path and pathlib.Path(path).exists():
+                pathlib.Path(path).rename(save_path)
+
+        else:  # "stop"
+            break
+
+    for writer, _ in streams.values():
+        writer.release()
+    del frames
+    shared_memory.close()
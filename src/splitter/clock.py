@@ -0,0 +1,213 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Tell the time and sleep, for real or in a simulation.
+
+Everything the splitter times (capture pacing, split delays, post-split
+pauses, and reset waits) goes through a clock instead of calling
+time.perf_counter and time.sleep directly, and times that leave the splitter
+as timestamps (run history and frame export) are turned into Unix time by the
+clock too (see to_wall_time). The splitter normally uses REAL_CLOCK. Giving it
+a SimulatedClock instead lets a recorded frame stream be replayed through the
+compare threads as fast as the CPU allows: nothing actually sleeps, and the
+same frames and timestamps always give the same results.
+"""
+
+
+import platform
+import threading
+import time
+from typing import Optional, Union
+
+# How long before a deadline to stop sleeping and start spinning (see
+# deadline_timer.wait_until). Timed waits on Windows are only as precise as
+# the system timer (15.6 ms by default).
+if platform.system() == "Windows":
+    SPIN_SECS = 0.016
+else:
+    SPIN_SECS = 0.002
+
+
+class RealClock:
+    """The system's clock.
+
+    Attributes:
+        spin_secs (float): How long before a deadline waits should stop
+            sleeping and start spinning.
+    """
+
+    spin_secs = SPIN_SECS
+
+    def now(self) -> float:
+        """Get the current time.
+
+        Returns:
+            float: The time, as a time.perf_counter() value.
+        """
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep.
+
+        Args:
+            seconds (float): How long to sleep.
+        """
+        time.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        """Sleep until event is set, or until timeout runs out.
+
+        Args:
+            event (threading.Event): The event to wait for.
+            timeout (float | None): The longest to wait, in seconds. If None,
+                wait as long as it takes.
+
+        Returns:
+            bool: True if the event was set.
+        """
+        return event.wait(timeout)
+
+    def to_wall_time(self, clock_time: float) -> float:
+        """Turn a time from this clock into a Unix timestamp.
+
+        Args:
+            clock_time (float): The time, as a now() value.
+
+        Returns:
+            float: The time, as a time.time() value.
+        """
+        return time.time() - (time.perf_counter() - clock_time)
+
+
+class SimulatedClock:
+    """A clock that only moves when it's told to.
+
+    Sleeping and waiting never block. They move the clock forward instead,
+    as if the time had passed, so delays and pauses finish instantly. Whatever
+    replays the frames moves the clock to each frame's timestamp with
+    advance_to before handing it over.
+
+    The clock never goes backwards, and is safe to use from any thread. For
+    reproducible results, only one thread should sleep on it at a time (e.g.
+    by calling the splitter's compare methods directly instead of running
+    its threads).
+
+    Attributes:
+        spin_secs (float): Always 0, since there's nothing to be precise
+            about.
+    """
+
+    spin_secs = 0.0
+
+    def __init__(
+        self, start_time: float = 0.0, wall_start_time: Optional[float] = None
+    ) -> None:
+        """Start the clock.
+
+        Args:
+            start_time (float): The time to start at. Default is 0.
+            wall_start_time (float | None): The Unix timestamp start_time
+                stands for (e.g. when the replayed frames were recorded), used
+                by to_wall_time. If None, use the time the clock is created.
+                Default is None.
+        """
+        self._time = start_time
+        self._lock = threading.Lock()
+        self._wall_offset = (
+            time.time() if wall_start_time is None else wall_start_time
+        ) - start_time
+
+    def now(self) -> float:
+        """Get the current time.
+
+        Returns:
+            float: The time.
+        """
+        with self._lock:
+            return self._time
+
+    def sleep(self, seconds: float) -> None:
+        """Move the clock forward instead of sleeping.
+
+        Args:
+            seconds (float): How long to move it forward.
+        """
+        self.advance(seconds)
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        """Move the clock forward to the end of the timeout, unless event is
+        already set.
+
+        Args:
+            event (threading.Event): The event to wait for.
+            timeout (float | None): How long to move the clock forward. If
+                None, the clock doesn't move.
+
+        Returns:
+            bool: True if the event was set.
+        """
+        if not event.is_set() and timeout is not None:
+            self.advance(timeout)
+        return event.is_set()
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward.
+
+        Args:
+            seconds (float): How far to move it. Negative values are ignored.
+        """
+        with self._lock:
+            self._time += max(seconds, 0)
+
+    def advance_to(self, new_time: float) -> None:
+        """Move the clock forward to a time, if it isn't already past it.
+
+        Args:
+            new_time (float): The time to move it to.
+        """
+        with self._lock:
+            self._time = max(self._time, new_time)
+
+    def to_wall_time(self, clock_time: float) -> float:
+        """Turn a time from this clock into a Unix timestamp, counting from
+        wall_start_time (see __init__).
+
+        Args:
+            clock_time (float): The time, as a now() value.
+
+        Returns:
+            float: The time, as a time.time() value.
+        """
+        return clock_time + self._wall_offset
+
+
+# The clock everything uses unless it's given another one
+REAL_CLOCK = RealClock()
+
+Clock = Union[RealClock, SimulatedClock]
@@ -0,0 +1,132 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Wait for deadlines precisely, and let other threads see how long is left.
+
+Split delays, post-split pauses, and reset waits used to be loops that slept
+10 ms at a time until enough time had passed, so they overshot by up to 10 ms
+(plus however late the thread was woken up) and woke the thread 100 times a
+second. Now each one is a deadline: the thread sleeps on a cancel event until
+it's close to the deadline, then spins for the last moment, so it finishes
+within a fraction of a millisecond and can still be stopped right away by
+setting the event. The time left is worked out from the deadline whenever
+it's read, so nothing has to keep it up to date.
+
+Times are read from a clock (see clock.py), so deadlines can be simulated.
+"""
+
+
+import threading
+from typing import Optional
+
+from splitter.clock import REAL_CLOCK, Clock
+
+
+def wait_until(
+    deadline: float, cancel: threading.Event, clock: Clock = REAL_CLOCK
+) -> bool:
+    """Sleep until deadline, or until cancel is set.
+
+    Args:
+        deadline (float): When to stop waiting, as a clock.now() value.
+        cancel (threading.Event): Stops the wait early when set.
+        clock (Clock): The clock to wait on. Default is REAL_CLOCK.
+
+    Returns:
+        bool: True if the deadline was reached, False if the wait was
+        cancelled.
+    """
+    while True:
+        remaining = deadline - clock.now()
+        if remaining <= 0:
+            return not cancel.is_set()
+        if remaining > clock.spin_secs:
+            if clock.wait(cancel, remaining - clock.spin_secs):
+                return False
+        elif cancel.is_set():
+            return False
+        else:
+            clock.sleep(0)  # Let other threads run while spinning
+
+
+class DeadlineTimer:
+    """A countdown that one thread waits on while others read how long is
+    left.
+    """
+
+    def __init__(self, clock: Clock = REAL_CLOCK) -> None:
+        """Make a timer that isn't running.
+
+        Args:
+            clock (Clock): The clock to count down on. Default is REAL_CLOCK.
+        """
+        self._clock = clock
+        self._deadline = None
+
+    def start(self, duration: float, start_time: Optional[float] = None) -> None:
+        """Start counting down.
+
+        Args:
+            duration (float): How long to count down, in seconds.
+            start_time (float | None): When the countdown started, as a
+                clock.now() value. If None, it starts now. Default is None.
+        """
+        if start_time is None:
+            start_time = self._clock.now()
+        self._deadline = start_time + duration
+
+    def stop(self) -> None:
+        """Stop the countdown, so get_remaining returns None."""
+        self._deadline = None
+
+    def get_remaining(self) -> Optional[float]:
+        """Get how long is left. Safe to call from any thread.
+
+        Returns:
+            float | None: The seconds left (0 once the deadline has passed),
+            or None if the timer isn't running.
+        """
+        deadline = self._deadline
+        if deadline is None:
+            return None
+        return max(deadline - self._clock.now(), 0)
+
+    def wait(self, cancel: threading.Event) -> bool:
+        """Wait for the countdown to finish (see wait_until), then stop it.
+
+        Args:
+            cancel (threading.Event): Stops the wait early when set.
+
+        Returns:
+            bool: True if the countdown finished, False if it was cancelled.
+        """
+        deadline = self._deadline
+        finished = deadline is None or wait_until(deadline, cancel, self._clock)
+        self._deadline = None
+        return finished
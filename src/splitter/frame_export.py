@@ -0,0 +1,291 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Share the latest comparison frame and match percents through a file in
+memory, so other programs on this machine (e.g. an OBS script) can show them
+without capturing the video a second time.
+
+The splitter writes each comparison frame into a memory-mapped file, along
+with the match percents at that moment. Other programs map the same file and
+read from it directly, so nothing is copied or sent between processes, and
+the splitter never waits for them. The file is always the same size, so it
+only has to be mapped once.
+
+Because the reader could look at the file while the splitter is halfway
+through writing it, the header holds a sequence number that's odd while a
+write is in progress, and goes up by 2 with each frame (a seqlock). A reader
+reads the sequence number, copies what it needs, then reads the sequence
+number again. If it was odd, or changed, the copy might be torn, and the
+reader tries again. FrameExportReader does this, and is also a reference for
+writing readers in other languages.
+
+Layout (all numbers little-endian):
+    - Offset 0: EXPORT_MAGIC (8 bytes)
+    - Offset 8: Format version (uint32)
+    - Offset 12: Offset of the frame data (uint32)
+    - Offset 16: Size of the space for frame data, in bytes (uint32)
+    - Offset 24: Sequence number (uint64)
+    - Offset 32: Telemetry (see _TELEMETRY): frame number (uint64), when the
+      frame was captured as a Unix timestamp (float64), frame width, height,
+      and channels (uint32 each; all 0 when there's no video), split image
+      index and loop (int32 each; -1 when there are no split images), then
+      match percent, highest percent, reset match percent, and highest reset
+      percent (float64 each, between 0 and 1; NaN when not comparing).
+    - Frame data: width * height * channels bytes, BGR, row by row.
+"""
+
+
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy
+
+from settings import COMPARISON_FRAME_HEIGHT, COMPARISON_FRAME_WIDTH
+from splitter.clock import REAL_CLOCK, Clock
+
+EXPORT_MAGIC = b"PILGRIMF"
+EXPORT_VERSION = 1
+DEFAULT_EXPORT_PATH = os.path.join(
+    tempfile.gettempdir(), "pilgrim_autosplitter_frame.mmap"
+)
+_HEADER = struct.Struct("<8sIII")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 24
+_TELEMETRY = struct.Struct("<QdIIIiidddd")
+_TELEMETRY_OFFSET = 32
+# Frame data starts on a cache line boundary
+_FRAME_OFFSET = 128
+_FRAME_CAPACITY = COMPARISON_FRAME_WIDTH * COMPARISON_FRAME_HEIGHT * 3
+
+# The names of the telemetry values, in the order they're stored
+TELEMETRY_KEYS = (
+    "frame_number",
+    "captured_at",
+    "width",
+    "height",
+    "channels",
+    "split_index",
+    "loop",
+    "match_percent",
+    "highest_percent",
+    "reset_percent",
+    "highest_reset_percent",
+)
+
+
+class FrameExport:
+    """Write comparison frames and match percents to a memory-mapped file.
+
+    Only one thread (the splitter's capture_thread) should call publish and
+    clear.
+
+    Attributes:
+        path (str): The path of the file.
+    """
+
+    def __init__(self, path: Optional[str] = None, clock: Clock = REAL_CLOCK) -> None:
+        """Create (or overwrite) the file and map it.
+
+        Args:
+            path (str | None): The path of the file. If None, use
+                DEFAULT_EXPORT_PATH. Default is None.
+            clock (Clock): The clock capture times come from (see clock.py).
+                Default is REAL_CLOCK.
+
+        Raises:
+            OSError: The file couldn't be created or mapped.
+        """
+        self.path = DEFAULT_EXPORT_PATH if not path else path
+        self._clock = clock
+        size = _FRAME_OFFSET + _FRAME_CAPACITY
+        with open(self.path, "w+b") as export_file:
+            export_file.truncate(size)
+            self._mmap = mmap.mmap(export_file.fileno(), size)
+        _HEADER.pack_into(
+            self._mmap, 0, EXPORT_MAGIC, EXPORT_VERSION, _FRAME_OFFSET, _FRAME_CAPACITY
+        )
+        self._frame_data = numpy.frombuffer(
+            self._mmap, numpy.uint8, _FRAME_CAPACITY, _FRAME_OFFSET
+        )
+        self._sequence = 0
+        self._frame_number = 0
+        self.clear()
+
+    def publish(
+        self,
+        frame: numpy.ndarray,
+        captured_at: float,
+        split_index: Optional[int],
+        loop: Optional[int],
+        percents: Tuple[Optional[float], ...],
+    ) -> None:
+        """Write a frame and the match percents at the time.
+
+        Frames too big for the file are written without their pixels (width,
+        height, and channels are 0).
+
+        Args:
+            frame (numpy.ndarray): The comparison frame.
+            captured_at (float): When the frame was captured, as a
+                clock.now() value.
+            split_index (int | None): The current split image's index.
+            loop (int | None): The current split image's loop.
+            percents (Tuple[float | None, ...]): The match percent, highest
+                percent, reset match percent, and highest reset percent.
+        """
+        if frame.nbytes > _FRAME_CAPACITY:
+            frame = None
+        self._frame_number += 1
+        self._write(
+            frame,
+            self._clock.to_wall_time(captured_at),
+            split_index,
+            loop,
+            percents,
+        )
+
+    def clear(self) -> None:
+        """Write that there's no video."""
+        self._write(None, 0.0, None, None, (None, None, None, None))
+
+    def close(self) -> None:
+        """Unmap the file. The file itself is left, so readers can still see
+        the last frame."""
+        # The numpy view has to go first, or the map can't be closed
+        self._frame_data = None
+        self._mmap.close()
+
+    def _write(
+        self,
+        frame: Optional[numpy.ndarray],
+        captured_at: float,
+        split_index: Optional[int],
+        loop: Optional[int],
+        percents: Tuple[Optional[float], ...],
+    ) -> None:
+        """Write a frame and telemetry between two sequence number updates.
+
+        Args:
+            frame (numpy.ndarray | None): The frame, or None for no frame.
+            captured_at (float): When the frame was captured, as a Unix
+                timestamp.
+            split_index (int | None): The current split image's index.
+            loop (int | None): The current split image's loop.
+            percents (Tuple[float | None, ...]): See publish.
+        """
+        if frame is None:
+            height = width = channels = 0
+        else:
+            height, width = frame.shape[:2]
+            channels = 1 if frame.ndim == 2 else frame.shape[2]
+
+        # Odd while writing
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._mmap, _SEQUENCE_OFFSET, self._sequence)
+
+        _TELEMETRY.pack_into(
+            self._mmap,
+            _TELEMETRY_OFFSET,
+            self._frame_number,
+            captured_at,
+            width,
+            height,
+            channels,
+            -1 if split_index is None else split_index,
+            -1 if loop is None else loop,
+            *(math.nan if percent is None else percent for percent in percents),
+        )
+        if frame is not None:
+            self._frame_data[: frame.nbytes] = frame.reshape(-1)
+
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._mmap, _SEQUENCE_OFFSET, self._sequence)
+
+
+class FrameExportReader:
+    """Read frames and telemetry written by a FrameExport, in this or another
+    process."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Map the file.
+
+        Args:
+            path (str | None): The path of the file. If None, use
+                DEFAULT_EXPORT_PATH. Default is None.
+
+        Raises:
+            OSError: The file couldn't be opened or mapped.
+            ValueError: The file isn't a frame export this version can read.
+        """
+        with open(DEFAULT_EXPORT_PATH if not path else path, "rb") as export_file:
+            self._mmap = mmap.mmap(export_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._frame_offset, _ = _HEADER.unpack_from(self._mmap)
+        if magic != EXPORT_MAGIC or version != EXPORT_VERSION:
+            self._mmap.close()
+            raise ValueError("Not a frame export this version can read")
+
+    def read(self) -> Tuple[Dict, Optional[numpy.ndarray]]:
+        """Copy the latest frame and telemetry, retrying if the copy was torn
+        by a write.
+
+        Returns:
+            Tuple[Dict, numpy.ndarray | None]: The telemetry (see
+            TELEMETRY_KEYS) and a copy of the frame, or None if there's no
+            video.
+        """
+        while True:
+            sequence = _SEQUENCE.unpack_from(self._mmap, _SEQUENCE_OFFSET)[0]
+            if sequence % 2 == 1:
+                time.sleep(0)
+                continue
+
+            values = _TELEMETRY.unpack_from(self._mmap, _TELEMETRY_OFFSET)
+            telemetry = dict(zip(TELEMETRY_KEYS, values))
+            shape = (telemetry["height"], telemetry["width"], telemetry["channels"])
+            frame = None
+            if shape[0] > 0:
+                frame = numpy.frombuffer(
+                    self._mmap,
+                    numpy.uint8,
+                    shape[0] * shape[1] * shape[2],
+                    self._frame_offset,
+                ).reshape(shape)
+                frame = frame.copy()
+
+            if _SEQUENCE.unpack_from(self._mmap, _SEQUENCE_OFFSET)[0] == sequence:
+                return telemetry, frame
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mmap.close()
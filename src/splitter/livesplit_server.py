@@ -0,0 +1,264 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Send split actions to LiveSplit Server instead of pressing hotkeys.
+
+LiveSplit Server (a LiveSplit component, built in since LiveSplit 1.8) takes
+plain-text commands over TCP, one per line. Sending them directly doesn't
+depend on key injection, on which window has focus, or on a keyboard hook
+hearing the key, and takes a fraction of a millisecond on the same machine.
+
+The connection is kept open between splits. Commands don't get a response, so
+they're written without waiting for one, and the commands for one action are
+written together. If the connection has dropped (e.g. LiveSplit was
+restarted), it's reopened and the commands are sent again, but only if none
+of them had been written to the old connection. Otherwise, LiveSplit may have
+received them, and sending them again could split twice.
+
+If sync_game_time is set, each split also sets LiveSplit's game time to when
+the split actually happened (see ActionDispatcher.dispatch), so the time it
+records doesn't include the time it took to find the match and send the
+command. This only works for runs started by this program, since that's the
+only way to know when the run started, and it replaces whatever else is
+setting game time (e.g. a load remover).
+"""
+
+
+import socket
+from typing import List, Tuple
+
+from splitter.action_dispatcher import SplitAction
+
+DEFAULT_PORT = 16834
+# How long to wait when connecting, and for a command to be written
+CONNECT_TIMEOUT = 1.0
+SEND_TIMEOUT = 1.0
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """Split a "host:port" string, using DEFAULT_PORT if there's no port.
+
+    Args:
+        address (str): The address, e.g. "localhost:16834".
+
+    Raises:
+        ValueError: The port isn't a number.
+
+    Returns:
+        Tuple[str, int]: The host and port.
+    """
+    host, _, port = address.strip().rpartition(":")
+    if not host:
+        return port or "localhost", DEFAULT_PORT
+    return host, int(port)
+
+
+def format_time(seconds: float) -> str:
+    """Format a time the way LiveSplit Server reads it.
+
+    Args:
+        seconds (float): The time, in seconds.
+
+    Returns:
+        str: The time as H:MM:SS.fff.
+    """
+    milliseconds = max(round(seconds * 1000), 0)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{milliseconds / 1000:06.3f}"
+
+
+class LiveSplitServer:
+    """A persistent connection to LiveSplit Server.
+
+    Used by ActionDispatcher (see ActionDispatcher.output), which only calls
+    send from its output thread, so this class isn't thread-safe.
+
+    Attributes:
+        address (Tuple[str, int]): The host and port of the server.
+        sync_game_time (bool): Whether to set game time on each split (see
+            the module docstring).
+    """
+
+    def __init__(self, address: Tuple[str, int], sync_game_time: bool = False):
+        """Set up the connection. It isn't opened until the first send.
+
+        Args:
+            address (Tuple[str, int]): The host and port of the server.
+            sync_game_time (bool): See sync_game_time above. Default is
+                False.
+        """
+        self.address = address
+        self.sync_game_time = sync_game_time
+        self._socket = None
+        # Used for sync_game_time. Times are clock.now() values.
+        self._run_start_time = None
+        self._pause_start_time = None
+        self._time_paused = 0.0
+
+    def send(self, action: str, occurred_at: float) -> bool:
+        """Send the commands for a SplitAction.
+
+        Args:
+            action (str): The SplitAction.
+            occurred_at (float): When the action happened, as a
+                clock.now() value.
+
+        Returns:
+            bool: True if the commands were sent.
+        """
+        return self.send_commands(self._get_commands(action, occurred_at))
+
+    def send_commands(self, commands: List[str]) -> bool:
+        """Send commands in one write, reconnecting once if needed.
+
+        The commands are only sent again on a new connection if none of their
+        bytes were written to the old one (see the module docstring).
+
+        Args:
+            commands (List[str]): The commands, without line endings.
+
+        Returns:
+            bool: True if the commands were sent.
+        """
+        data = "".join(f"{command}\r\n" for command in commands).encode("utf-8")
+        for _ in range(2):
+            if not self._is_connected() and not self._connect():
+                return False
+            bytes_written = self._write(data)
+            if bytes_written == len(data):
+                return True
+            self.close()
+            if bytes_written > 0:
+                return False
+        return False
+
+    def close(self) -> None:
+        """Close the connection, if it's open."""
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+    def _get_commands(self, action: str, occurred_at: float) -> List[str]:
+        """Get the commands for a SplitAction, keeping track of the run for
+        sync_game_time.
+
+        A split starts the timer if it isn't running, like the split hotkey
+        does. A pause split pauses the timer, or resumes it if the last one
+        paused it, like the pause hotkey does.
+
+        Args:
+            action (str): The SplitAction.
+            occurred_at (float): When the action happened, as a
+                clock.now() value.
+
+        Returns:
+            List[str]: The commands.
+        """
+        if action == SplitAction.RESET:
+            self._run_start_time = None
+            self._pause_start_time = None
+            self._time_paused = 0.0
+            return ["reset"]
+
+        if action == SplitAction.PAUSE:
+            if self._pause_start_time is None:
+                self._pause_start_time = occurred_at
+                return ["pause"]
+            self._time_paused += occurred_at - self._pause_start_time
+            self._pause_start_time = None
+            return ["resume"]
+
+        if not self.sync_game_time:
+            return ["startorsplit"]
+        if self._run_start_time is None:
+            self._run_start_time = occurred_at
+            return ["startorsplit", "initgametime"]
+        game_time = occurred_at - self._run_start_time - self._time_paused
+        return [f"setgametime {format_time(game_time)}", "split"]
+
+    def _write(self, data: bytes) -> int:
+        """Write data to the connection, like socket.sendall, but keep track
+        of how much was written if it fails partway.
+
+        Args:
+            data (bytes): The data to write.
+
+        Returns:
+            int: The number of bytes written. Less than len(data) if the write
+            failed.
+        """
+        bytes_written = 0
+        try:
+            while bytes_written < len(data):
+                bytes_written += self._socket.send(data[bytes_written:])
+        except OSError:
+            pass
+        return bytes_written
+
+    def _is_connected(self) -> bool:
+        """Check whether the connection is open, without blocking.
+
+        Returns:
+            bool: False if there's no connection, or the server closed it.
+        """
+        if self._socket is None:
+            return False
+        try:
+            self._socket.setblocking(False)
+            try:
+                # Nothing to read means it's open; an empty read means closed
+                closed = self._socket.recv(1, socket.MSG_PEEK) == b""
+            finally:
+                self._socket.settimeout(SEND_TIMEOUT)
+        except BlockingIOError:
+            return True
+        except OSError:
+            closed = True
+        if closed:
+            self.close()
+        return not closed
+
+    def _connect(self) -> bool:
+        """Open the connection.
+
+        Returns:
+            bool: True if the connection was opened.
+        """
+        self.close()
+        try:
+            self._socket = socket.create_connection(self.address, CONNECT_TIMEOUT)
+        except OSError:
+            return False
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.settimeout(SEND_TIMEOUT)
+        return True
@@ -0,0 +1,572 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Retime recorded runs by running their videos through a split image set.
+
+Each video is played through the same split logic the splitter uses while
+running live: split images are compared one at a time, in order, with their
+loops, delays, post-split pauses, and dummy, pause, and below flags, and the
+reset image is compared alongside them (after its reset wait on the second
+split). Whether an image matches, what kind of split it makes, when the reset
+wait starts, and which split comes next are decided by the same functions
+the splitter uses (see splitter.check_match and the functions after it, and
+SplitDir.get_next_split). Only the timing is handled here, since the
+splitter's compare threads wait out delays and pauses as they happen.
+Every split, pause split, dummy split, and reset is reported with the frame it
+matched on and its time in the video, delay included.
+
+The live splitter only compares as many frames per second as the FPS setting
+allows, and its timing depends on when frames happen to arrive. Here, every
+frame is compared (except those the splitter wouldn't look at, during delays
+and pauses), and times are worked out from frame numbers, so results are frame
+accurate and the same every time. Videos are read as fast as they can be
+decoded, so this usually runs much faster than real time.
+
+Videos are spread across a process pool, one video per process at a time,
+since each run has to be played in order. How many frames per second each
+process got through is reported with its results.
+
+Usage (run from the src directory):
+    python -m splitter.retimer <split image dir> <video> [<video> ...]
+        [-o RESULTS.json] [--workers N]
+"""
+
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+import cv2
+import numpy
+
+import settings
+from settings import COMPARISON_FRAME_HEIGHT, COMPARISON_FRAME_WIDTH
+from splitter.livesplit_server import format_time
+from splitter.run_history import RunEvent
+from splitter.split_dir import SplitDir
+from splitter.splitter import (
+    check_match,
+    get_match_percent,
+    get_split_event,
+    is_last_split,
+    is_second_split,
+)
+
+# Set in each worker process by _init_worker
+_split_images = None
+_reset_image = None
+
+
+class RetimeEvent:
+    """Something that happened in a retimed video.
+
+    Attributes:
+        frame (int): The frame the split image or reset image matched on.
+        index (int): The index of the split image that was current.
+        kind (str): The RunEvent: "split", "pause split", "dummy split", or
+            "reset".
+        loop (int): The loop of the split image that was current.
+        name (str): The name of the image that matched.
+        time (float): When the split or reset happened, in seconds from the
+            start of the video (the matching frame's time plus any delay).
+    """
+
+    def __init__(
+        self, kind: str, name: str, index: int, loop: int, frame: int, time: float
+    ) -> None:
+        self.kind = kind
+        self.name = name
+        self.index = index
+        self.loop = loop
+        self.frame = frame
+        self.time = time
+
+
+class RetimeResult:
+    """The results of retiming one video.
+
+    Attributes:
+        elapsed (float): How long retiming the video took, in seconds.
+        error (str | None): Why the video couldn't be retimed, or None if it
+            was.
+        events (List[RetimeEvent]): Every split and reset, in order.
+        fps (float): The video's frame rate.
+        frame_count (int): How many frames were read.
+        video_path (str): The video.
+    """
+
+    def __init__(
+        self,
+        video_path: str,
+        fps: float,
+        frame_count: int,
+        events: List[RetimeEvent],
+        elapsed: float,
+        error: Optional[str] = None,
+    ) -> None:
+        self.video_path = video_path
+        self.fps = fps
+        self.frame_count = frame_count
+        self.events = events
+        self.elapsed = elapsed
+        self.error = error
+
+    def get_processing_fps(self) -> float:
+        """Get how many frames per second were read and compared.
+
+        Returns:
+            float: The frames per second, on the one process that retimed
+            this video.
+        """
+        return self.frame_count / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Get the results as a JSON serializable dict.
+
+        Returns:
+            dict: The results.
+        """
+        return {
+            "video": self.video_path,
+            "fps": self.fps,
+            "frames": self.frame_count,
+            "processing_fps": round(self.get_processing_fps(), 1),
+            "events": [vars(event) for event in self.events],
+            "error": self.error,
+        }
+
+
+class RunSimulator:
+    """Step through a video's frames the way the splitter's compare threads
+    would, and record what they would do.
+
+    Each compare thread's waits (delays, post-split pauses, and the reset
+    wait) are kept as the video time they end at, so nothing ever actually
+    waits, and frames aren't even decoded when neither thread would look at
+    them.
+
+    Attributes:
+        events (List[RetimeEvent]): Every split and reset so far.
+    """
+
+    def __init__(
+        self,
+        split_images: List[SplitDir._SplitImage],
+        reset_image: Optional[SplitDir._SplitImage],
+    ) -> None:
+        """Start at the first loop of the first split image.
+
+        Args:
+            split_images (List[SplitDir._SplitImage]): The split images, in
+                order.
+            reset_image (SplitDir._SplitImage | None): The reset image, if
+                there is one.
+        """
+        self.events = []
+        self._split_images = split_images
+        self._reset_image = reset_image
+        self._start_run()
+
+    def step(self, frame_index: int, frame_time: float, read_frame: Callable) -> None:
+        """Handle one frame of the video.
+
+        Args:
+            frame_index (int): The frame's number.
+            frame_time (float): The frame's time in the video, in seconds.
+            read_frame (Callable[[], numpy.ndarray]): Decode the frame and
+                resize it to comparison size. Only called if the frame is
+                compared.
+        """
+        # Delays that have run out by now happened before this frame
+        if self._pending_reset is not None and self._pending_reset[1] <= frame_time:
+            self._do_reset()
+        if self._pending_split is not None and self._pending_split[1] <= frame_time:
+            self._do_split()
+
+        compare_reset = self._is_comparing_reset(frame_time)
+        compare_split = self._is_comparing_split(frame_time)
+        if not compare_reset and not compare_split:
+            return
+
+        frame = read_frame()
+        # The reset image takes precedence (see Splitter._reset)
+        if compare_reset and self._compare_with_reset_image(frame):
+            self._pending_reset = (
+                frame_index,
+                frame_time + self._reset_image.delay_duration,
+            )
+            self._pending_split = None
+            self._split_resumes_at = None
+            if self._reset_image.delay_duration == 0:
+                self._do_reset()
+            return
+
+        if compare_split and self._compare_with_split_image(frame):
+            split_image = self._split_images[self._index]
+            self._pending_split = (
+                frame_index,
+                frame_time + split_image.delay_duration,
+            )
+            self._split_resumes_at = None
+            if split_image.delay_duration == 0:
+                self._do_split()
+
+    def finish(self) -> None:
+        """Handle the end of the video.
+
+        A split or reset whose match was found, but whose delay hadn't run out
+        when the video ended, would still have happened, so it's recorded.
+        """
+        if self._pending_reset is not None:
+            self._do_reset()
+        elif self._pending_split is not None:
+            self._do_split()
+
+    def _start_run(self) -> None:
+        """Go back to the first split image, and restart both threads."""
+        self._index = 0
+        self._loop = 1
+        self._above_split_threshold = False
+        self._above_reset_threshold = False
+        # When _look_for_split and _look_for_reset start comparing. None means
+        # they've stopped (or, for _look_for_reset, that it's waiting for the
+        # first split to end)
+        self._split_resumes_at = 0.0 if len(self._split_images) > 0 else None
+        self._reset_resumes_at = None
+        # (frame index, time) of a match that's waiting out its delay
+        self._pending_split = None
+        self._pending_reset = None
+
+    def _is_comparing_split(self, frame_time: float) -> bool:
+        """Check whether _look_for_split would compare a frame.
+
+        Args:
+            frame_time (float): The frame's time.
+
+        Returns:
+            bool: True if it would.
+        """
+        return (
+            self._pending_split is None
+            and self._pending_reset is None
+            and self._split_resumes_at is not None
+            and frame_time >= self._split_resumes_at
+        )
+
+    def _is_comparing_reset(self, frame_time: float) -> bool:
+        """Check whether _look_for_reset would compare a frame.
+
+        Args:
+            frame_time (float): The frame's time.
+
+        Returns:
+            bool: True if it would.
+        """
+        return (
+            self._reset_image is not None
+            and self._pending_reset is None
+            and self._reset_resumes_at is not None
+            and frame_time >= self._reset_resumes_at
+        )
+
+    def _compare_with_split_image(self, frame: numpy.ndarray) -> bool:
+        """Compare a frame with the current split image (see
+        splitter.check_match).
+
+        Args:
+            frame (numpy.ndarray): The frame.
+
+        Returns:
+            bool: True if it's a match.
+        """
+        split_image = self._split_images[self._index]
+        match_found, self._above_split_threshold = check_match(
+            get_match_percent(frame, split_image),
+            split_image,
+            self._above_split_threshold,
+        )
+        return match_found
+
+    def _compare_with_reset_image(self, frame: numpy.ndarray) -> bool:
+        """Compare a frame with the reset image (see splitter.check_match).
+
+        Args:
+            frame (numpy.ndarray): The frame.
+
+        Returns:
+            bool: True if it's a match.
+        """
+        match_found, self._above_reset_threshold = check_match(
+            get_match_percent(frame, self._reset_image),
+            self._reset_image,
+            self._above_reset_threshold,
+        )
+        return match_found
+
+    def _do_split(self) -> None:
+        """Record the pending split, then go to the next split image, like
+        Splitter._split and ui_controller._request_next_split.
+
+        After the last split, wait for the reset image, or if there isn't one,
+        start a new run right away (like headless._end_run).
+        """
+        frame_index, split_time = self._pending_split
+        self._pending_split = None
+        split_image = self._split_images[self._index]
+        self.events.append(
+            RetimeEvent(
+                get_split_event(split_image),
+                split_image.name,
+                self._index,
+                self._loop,
+                frame_index,
+                split_time,
+            )
+        )
+
+        if is_last_split(
+            split_image, self._index, self._loop, len(self._split_images) - 1
+        ):
+            if self._reset_image is None:
+                self._start_run()
+                self._split_resumes_at = split_time
+            else:
+                self._split_resumes_at = None
+            return
+
+        self._index, self._loop = SplitDir.get_next_split(
+            self._split_images, self._index, self._loop
+        )
+        self._above_split_threshold = False
+        self._split_resumes_at = split_time + split_image.pause_duration
+
+        # The reset wait starts as soon as the second split is reached (see
+        # Splitter._handle_compare_reset_special_cases)
+        if self._reset_image is not None and is_second_split(
+            self._split_images, self._index, self._loop
+        ):
+            self._reset_resumes_at = split_time + self._reset_image.reset_wait_duration
+
+    def _do_reset(self) -> None:
+        """Record the pending reset, then go back to the first split image,
+        like Splitter._reset and ui_controller._request_reset_splits.
+        """
+        frame_index, reset_time = self._pending_reset
+        self.events.append(
+            RetimeEvent(
+                RunEvent.RESET,
+                self._reset_image.name,
+                self._index,
+                self._loop,
+                frame_index,
+                reset_time,
+            )
+        )
+        self._start_run()
+        self._split_resumes_at = reset_time
+
+
+def retime_video(
+    video_path: str,
+    split_images: List[SplitDir._SplitImage],
+    reset_image: Optional[SplitDir._SplitImage],
+) -> RetimeResult:
+    """Retime one video.
+
+    Frames are resized the same way the splitter's capture_thread resizes
+    them. Frames that aren't compared are skipped with grab, which doesn't
+    convert them to images, so they cost less than frames that are.
+
+    Args:
+        video_path (str): The video.
+        split_images (List[SplitDir._SplitImage]): The split images.
+        reset_image (SplitDir._SplitImage | None): The reset image, if there
+            is one.
+
+    Raises:
+        OSError: The video couldn't be opened.
+
+    Returns:
+        RetimeResult: The results.
+    """
+    start_time = time.perf_counter()
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise OSError(f"Couldn't open {video_path}")
+    fps = capture.get(cv2.CAP_PROP_FPS) or 60.0
+
+    def read_frame() -> numpy.ndarray:
+        _, frame = capture.retrieve()
+        return cv2.resize(
+            frame,
+            (COMPARISON_FRAME_WIDTH, COMPARISON_FRAME_HEIGHT),
+            interpolation=cv2.INTER_LINEAR,
+        )
+
+    simulator = RunSimulator(split_images, reset_image)
+    frame_index = 0
+    while capture.grab():
+        simulator.step(frame_index, frame_index / fps, read_frame)
+        frame_index += 1
+    simulator.finish()
+    capture.release()
+
+    return RetimeResult(
+        video_path,
+        fps,
+        frame_index,
+        simulator.events,
+        time.perf_counter() - start_time,
+    )
+
+
+def retime_videos(
+    dir_path: str, video_paths: List[str], workers: Optional[int] = None
+) -> List[RetimeResult]:
+    """Retime videos against a split image directory on a process pool.
+
+    A video that can't be retimed (e.g. it can't be opened) doesn't stop the
+    others; its result just has an error (see RetimeResult.error).
+
+    Args:
+        dir_path (str): The split image directory.
+        video_paths (List[str]): The videos.
+        workers (int | None): How many processes to use. If None, use one per
+            core (but no more than there are videos). Default is None.
+
+    Returns:
+        List[RetimeResult]: The results, in the same order as video_paths.
+    """
+    splits = SplitDir(dir_path, make_pixmaps=False)
+    splits.wait_for_loading()
+
+    workers = min(workers or os.cpu_count() or 1, max(len(video_paths), 1))
+    with ProcessPoolExecutor(
+        workers,
+        initializer=_init_worker,
+        initargs=(splits.list, splits.reset_image),
+    ) as executor:
+        return list(executor.map(_retime_video, video_paths))
+
+
+def _init_worker(
+    split_images: List[SplitDir._SplitImage],
+    reset_image: Optional[SplitDir._SplitImage],
+) -> None:
+    """Store the split images in a worker process.
+
+    Args:
+        split_images (List[SplitDir._SplitImage]): The split images.
+        reset_image (SplitDir._SplitImage | None): The reset image.
+    """
+    global _split_images, _reset_image
+    _split_images = split_images
+    _reset_image = reset_image
+
+
+def _retime_video(video_path: str) -> RetimeResult:
+    """Retime one video in a worker process (see retime_video).
+
+    Args:
+        video_path (str): The video.
+
+    Returns:
+        RetimeResult: The results, or a result with only an error if the video
+        couldn't be read.
+    """
+    start_time = time.perf_counter()
+    try:
+        return retime_video(video_path, _split_images, _reset_image)
+    except OSError as error:
+        elapsed = time.perf_counter() - start_time
+        return RetimeResult(video_path, 0.0, 0, [], elapsed, error=str(error))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Retime videos from the command line.
+
+    Args:
+        argv (List[str] | None): Command line arguments. If None, use
+            sys.argv. Default is None.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m splitter.retimer",
+        description="Retime recorded runs with a split image directory.",
+    )
+    parser.add_argument("dir", help="split image directory")
+    parser.add_argument("videos", nargs="+", help="recorded videos of runs")
+    parser.add_argument(
+        "-o", "--output", help="also write the results to this JSON file"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="processes to use (default: one per core)"
+    )
+    args = parser.parse_args(argv)
+
+    # Default thresholds, delays, etc. are read from settings
+    settings.set_program_vals()
+    start_time = time.perf_counter()
+    results = retime_videos(args.dir, args.videos, args.workers)
+    elapsed = time.perf_counter() - start_time
+
+    for result in results:
+        if result.error is not None:
+            print(f"{result.video_path}: failed ({result.error})")
+            continue
+        print(
+            f"{result.video_path}: {result.frame_count} frames at "
+            f"{result.fps:g} fps, {result.get_processing_fps():.0f} frames per "
+            "second"
+        )
+        for event in result.events:
+            print(
+                f"  {format_time(event.time)}  (frame {event.frame})  "
+                f"{event.kind}: {event.name}"
+            )
+    retimed = [result for result in results if result.error is None]
+    total_frames = sum(result.frame_count for result in retimed)
+    process_fps = 0.0
+    if len(retimed) > 0:
+        process_fps = sum(result.get_processing_fps() for result in retimed)
+        process_fps /= len(retimed)
+    print(
+        f"{total_frames} frames in {elapsed:.1f} s ({total_frames / elapsed:.0f} "
+        f"frames per second, {process_fps:.0f} per process)"
+    )
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump([result.to_dict() for result in results], output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Keep a history of every split and reset in a SQLite database.
+
+Each split records when it happened, which split image it was, the match
+percent that triggered it, the highest match percent, the threshold, and the
+delay and pause. That's enough to answer questions like "how close did split
+X come to not matching over my last 50 runs" (see get_margin_percentile).
+
+The compare threads only put a tuple on a queue (see RunHistory.record). A
+writer thread takes the events off the queue and inserts them in batches,
+one transaction per batch, so the compare threads never touch the disk.
+
+Events are grouped into runs: a run starts with a split on the first loop of
+the first split image (or the first split after a reset), and ends with a
+reset.
+
+The database can be queried from the command line (run from the src
+directory):
+    python -m splitter.run_history <database> <split name> [--runs N]
+        [--percentile P]
+"""
+
+
+import argparse
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import List, Optional
+
+import numpy
+
+from splitter.clock import REAL_CLOCK, Clock
+
+DEFAULT_HISTORY_PATH = "~/.pilgrim_autosplitter/run_history.sqlite3"
+HISTORY_VERSION = 1
+
+# The longest to wait for more events before writing a batch, in seconds
+BATCH_INTERVAL = 0.5
+# The most events written in one batch
+BATCH_SIZE = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    split_dir TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs (id),
+    occurred_at REAL NOT NULL,
+    event TEXT NOT NULL,
+    split_index INTEGER,
+    split_name TEXT,
+    loop INTEGER,
+    match_percent REAL,
+    highest_percent REAL,
+    threshold REAL,
+    delay REAL,
+    pause REAL
+);
+CREATE INDEX IF NOT EXISTS events_by_split_name
+    ON events (split_name, occurred_at);
+CREATE INDEX IF NOT EXISTS events_by_date ON events (occurred_at);
+CREATE INDEX IF NOT EXISTS events_by_run ON events (run_id);
+"""
+
+
+class RunEvent:
+    """The kinds of events recorded. Plain strings, like SplitAction."""
+
+    SPLIT = "split"
+    PAUSE_SPLIT = "pause split"
+    DUMMY_SPLIT = "dummy split"
+    RESET = "reset"
+
+
+def open_history(path: str) -> sqlite3.Connection:
+    """Open a history database, creating it (and its directory) if needed.
+
+    Args:
+        path (str): The path to the database. "~" is expanded.
+
+    Returns:
+        sqlite3.Connection: The connection.
+    """
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript(_SCHEMA)
+    connection.execute(f"PRAGMA user_version = {HISTORY_VERSION}")
+    return connection
+
+
+def get_match_margins(
+    connection: sqlite3.Connection, split_name: str, runs: int = 50
+) -> List[float]:
+    """Get how far above its threshold a split image's match percent got, in
+    the most recent runs it was split in.
+
+    Args:
+        connection (sqlite3.Connection): The history database.
+        split_name (str): The split image's name (filename without
+            extension).
+        runs (int): How many of the most recent runs to look at. Default is
+            50.
+
+    Returns:
+        List[float]: The highest percent minus the threshold for each split,
+        most recent first.
+    """
+    rows = connection.execute(
+        """
+        SELECT highest_percent - threshold FROM events
+        WHERE split_name = ? AND event != ? AND highest_percent IS NOT NULL
+            AND threshold IS NOT NULL
+            AND run_id IN (
+                SELECT DISTINCT run_id FROM events WHERE split_name = ?
+                ORDER BY run_id DESC LIMIT ?
+            )
+        ORDER BY occurred_at DESC
+        """,
+        (split_name, RunEvent.RESET, split_name, runs),
+    )
+    return [row[0] for row in rows]
+
+
+def get_margin_percentile(
+    connection: sqlite3.Connection,
+    split_name: str,
+    percentile: float,
+    runs: int = 50,
+) -> Optional[float]:
+    """Get a percentile of a split image's match margins (see
+    get_match_margins).
+
+    Args:
+        connection (sqlite3.Connection): The history database.
+        split_name (str): The split image's name.
+        percentile (float): The percentile, from 0 to 100.
+        runs (int): How many of the most recent runs to look at. Default is
+            50.
+
+    Returns:
+        float | None: The percentile, or None if the split image has never
+        split.
+    """
+    margins = get_match_margins(connection, split_name, runs)
+    if len(margins) == 0:
+        return None
+    return float(numpy.percentile(margins, percentile))
+
+
+class RunHistory:
+    """Record split events to a history database on a writer thread.
+
+    Attributes:
+        error (str | None): Why the database couldn't be opened or written,
+            if it couldn't. Events are dropped from then on.
+        path (str): The path to the database.
+    """
+
+    def __init__(self, path: Optional[str] = None, clock: Clock = REAL_CLOCK) -> None:
+        """Set up the history. The writer thread (and the database) are
+        started on the first event.
+
+        Args:
+            path (str | None): The path to the database. If None, use
+                DEFAULT_HISTORY_PATH. Default is None.
+            clock (Clock): The clock event times come from (see clock.py).
+                Default is REAL_CLOCK.
+        """
+        self.path = DEFAULT_HISTORY_PATH if not path else path
+        self.error = None
+        self._events = queue.SimpleQueue()
+        self._start_lock = threading.Lock()
+        self._writer_thread = threading.Thread(target=self._write_events)
+        self._writer_thread.daemon = True
+        # Used to turn event times into Unix timestamps
+        self._clock = clock
+        self._run_id = None
+        # Set by close, or when the writer thread fails. Events recorded
+        # after that are dropped, since the writer thread can't be started
+        # again
+        self._closed = False
+
+    def record(
+        self,
+        event: str,
+        occurred_at: float,
+        split_dir: str,
+        split_index: Optional[int],
+        split_name: Optional[str],
+        loop: Optional[int],
+        match_percent: Optional[float],
+        highest_percent: Optional[float],
+        threshold: Optional[float],
+        delay: Optional[float] = None,
+        pause: Optional[float] = None,
+    ) -> None:
+        """Queue an event to be written. Returns right away.
+
+        Does nothing if close has been called, or if the database couldn't
+        be opened or written (see error).
+
+        Args:
+            event (str): A RunEvent.
+            occurred_at (float): When it happened, as a clock.now() value.
+            split_dir (str): The split image directory.
+            split_index (int | None): The split image's index.
+            split_name (str | None): The split (or reset) image's name.
+            loop (int | None): The split image's loop.
+            match_percent (float | None): The match percent that triggered
+                the event.
+            highest_percent (float | None): The highest match percent before
+                the event.
+            threshold (float | None): The image's threshold.
+            delay (float | None): The image's delay, in seconds. Default is
+                None.
+            pause (float | None): The image's pause, in seconds. Default is
+                None.
+        """
+        with self._start_lock:
+            if self._closed:
+                return
+            # Converted now, while the clock's offset from Unix time is
+            # current (it can drift before the writer thread gets to it)
+            self._events.put(
+                (
+                    event,
+                    self._clock.to_wall_time(occurred_at),
+                    split_dir,
+                    split_index,
+                    split_name,
+                    loop,
+                    match_percent,
+                    highest_percent,
+                    threshold,
+                    delay,
+                    pause,
+                )
+            )
+            if not self._writer_thread.is_alive():
+                self._writer_thread.start()
+
+    def close(self, timeout: float = 2) -> None:
+        """Write any events still queued, then stop the writer thread.
+
+        Args:
+            timeout (float): The longest to wait, in seconds. Default is 2.
+        """
+        with self._start_lock:
+            self._closed = True
+        if self._writer_thread.is_alive():
+            self._events.put(None)
+            self._writer_thread.join(timeout)
+
+    def _write_events(self) -> None:
+        """Write events in batches until close is called.
+
+        Waits for an event, then up to BATCH_INTERVAL for more, and writes
+        them all in one transaction. If the database can't be opened or
+        written, stops and drops every event from then on (see _fail).
+        """
+        try:
+            connection = open_history(self.path)
+        except (sqlite3.Error, OSError) as error:
+            self._fail(error)
+            return
+
+        try:
+            while True:
+                batch = [self._events.get()]
+                deadline = time.perf_counter() + BATCH_INTERVAL
+                while batch[-1] is not None and len(batch) < BATCH_SIZE:
+                    try:
+                        batch.append(
+                            self._events.get(
+                                timeout=max(deadline - time.perf_counter(), 0)
+                            )
+                        )
+                    except queue.Empty:
+                        break
+
+                try:
+                    with connection:
+                        for event in batch:
+                            if event is not None:
+                                self._insert_event(connection, event)
+                except sqlite3.Error as error:
+                    self._fail(error)
+                    return
+                if batch[-1] is None:
+                    return
+        finally:
+            connection.close()
+
+    def _fail(self, error: Exception) -> None:
+        """Stop recording after the database couldn't be opened or written,
+        and say why.
+
+        The writer thread is about to exit, so record has to stop putting
+        events on the queue (and trying to start the thread again).
+
+        Args:
+            error (Exception): What went wrong.
+        """
+        with self._start_lock:
+            self._closed = True
+            self.error = str(error)
+        print(f"Couldn't write run history to {self.path}: {error}", file=sys.stderr)
+
+    def _insert_event(self, connection: sqlite3.Connection, event: tuple) -> None:
+        """Insert an event, starting or ending a run if needed.
+
+        Args:
+            connection (sqlite3.Connection): The history database.
+            event (tuple): The event's values, in the order record takes them
+                (with occurred_at as a Unix timestamp).
+        """
+        kind, occurred_at, split_dir, split_index, _, loop, *_ = event
+
+        starts_run = kind != RunEvent.RESET and (
+            self._run_id is None or (split_index == 0 and loop == 1)
+        )
+        if starts_run:
+            self._run_id = connection.execute(
+                "INSERT INTO runs (started_at, split_dir) VALUES (?, ?)",
+                (occurred_at, split_dir),
+            ).lastrowid
+
+        connection.execute(
+            """
+            INSERT INTO events (
+                run_id, occurred_at, event, split_index, split_name, loop,
+                match_percent, highest_percent, threshold, delay, pause
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (self._run_id, occurred_at, kind, *event[3:]),
+        )
+        if kind == RunEvent.RESET:
+            self._run_id = None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print a split image's match margins from the command line.
+
+    Args:
+        argv (List[str] | None): Command line arguments. If None, use
+            sys.argv. Default is None.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m splitter.run_history",
+        description="Show how close a split image came to not matching.",
+    )
+    parser.add_argument("database", help="run history database")
+    parser.add_argument("split_name", help="split image name, without extension")
+    parser.add_argument(
+        "--runs", type=int, default=50, help="recent runs to look at (default: 50)"
+    )
+    parser.add_argument(
+        "--percentile",
+        type=float,
+        default=5,
+        help="percentile of the margins to show (default: 5, i.e. the margin "
+        "95%% of splits beat)",
+    )
+    args = parser.parse_args(argv)
+
+    connection = open_history(args.database)
+    margins = get_match_margins(connection, args.split_name, args.runs)
+    if len(margins) == 0:
+        print(f"No splits recorded for {args.split_name}")
+        return
+    percentile = get_margin_percentile(
+        connection, args.split_name, args.percentile, args.runs
+    )
+    print(
+        f"{args.split_name}: {len(margins)} splits, margin min "
+        f"{min(margins):.2%}, p{args.percentile:g} {percentile:.2%}, "
+        f"max {max(margins):.2%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
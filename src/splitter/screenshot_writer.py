@@ -0,0 +1,177 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Write screenshots on a background thread, numbered like split images.
+
+Encoding a full-resolution PNG takes tens of milliseconds, so it's done on
+ScreenshotWriter's thread instead of the UI thread. Each screenshot is named
+with the lowest number not already starting a .png filename in its directory
+(000_screenshot.png, 001_screenshot.png, ...), the same way split images are
+numbered, so it can be renamed into a split image. The numbers in use
+are found with one scan of the directory, which is only repeated when the
+directory changes.
+"""
+
+
+import os
+import re
+import threading
+from queue import SimpleQueue
+from typing import List, Set, Tuple
+
+import cv2
+import numpy
+
+# The number at the start of a numbered .png filename
+_NUMBERED_PNG = re.compile(r"(\d+).*\.png\Z")
+
+
+class FileNumberIndex:
+    """Find the lowest number not yet used at the start of a .png filename in
+    a directory.
+
+    Numbers handed out are remembered until the directory has been rescanned
+    after their file exists, so screenshots taken faster than they're written
+    don't get the same number.
+    """
+
+    def __init__(self) -> None:
+        """Make an empty index. Directories are scanned when first used."""
+        self._lock = threading.Lock()
+        # Directory path -> (its modified time when scanned, numbers in use)
+        self._scans = {}
+        # Directory path -> numbers handed out since the last scan
+        self._reserved = {}
+
+    def allocate(self, dir_path: str) -> str:
+        """Reserve the lowest unused number in a directory.
+
+        Args:
+            dir_path (str): The directory.
+
+        Returns:
+            str: The number, with leading zeros to make it at least 3 digits.
+        """
+        with self._lock:
+            used = self._get_used_numbers(dir_path)
+            reserved = self._reserved.setdefault(dir_path, set())
+            number = 0
+            while number in used or number in reserved:
+                number += 1
+            reserved.add(number)
+        return f"{number:03d}"
+
+    def _get_used_numbers(self, dir_path: str) -> Set[int]:
+        """Get the numbers used in a directory, scanning it if it's new or has
+        changed since it was last scanned.
+
+        Args:
+            dir_path (str): The directory.
+
+        Returns:
+            Set[int]: The numbers at the start of its .png filenames.
+        """
+        try:
+            modified_time = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return set()
+        scan = self._scans.get(dir_path)
+        if scan is not None and scan[0] == modified_time:
+            return scan[1]
+
+        used = set()
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                match = _NUMBERED_PNG.match(entry.name)
+                if match is not None:
+                    used.add(int(match.group(1)))
+        self._scans[dir_path] = (modified_time, used)
+        # Reservations whose files now exist are covered by the scan
+        self._reserved[dir_path] = self._reserved.get(dir_path, set()) - used
+        return used
+
+
+class ScreenshotWriter:
+    """Encode and write screenshots on a background thread.
+
+    The UI calls save, then checks get_results each poll to tell the user how
+    it went, since the result isn't known until the file is written.
+    """
+
+    def __init__(self) -> None:
+        """Set up the writer. The thread is started the first time a
+        screenshot is saved."""
+        self._file_numbers = FileNumberIndex()
+        self._screenshot_queue = SimpleQueue()
+        self._results = SimpleQueue()
+        self._start_lock = threading.Lock()
+        self._writer_thread = threading.Thread(target=self._write_screenshots)
+        self._writer_thread.daemon = True
+
+    def save(self, dir_path: str, frame: numpy.ndarray) -> str:
+        """Queue a screenshot to be written.
+
+        Args:
+            dir_path (str): The directory to write it to.
+            frame (numpy.ndarray): The frame. Must not be changed afterwards,
+                since it isn't copied.
+
+        Returns:
+            str: The path the screenshot will be written to.
+        """
+        file_number = self._file_numbers.allocate(dir_path)
+        screenshot_path = f"{dir_path}/{file_number}_screenshot.png"
+        self._screenshot_queue.put((screenshot_path, frame))
+        with self._start_lock:
+            if not self._writer_thread.is_alive():
+                self._writer_thread.start()
+        return screenshot_path
+
+    def get_results(self) -> List[Tuple[str, bool]]:
+        """Get the screenshots finished since the last call.
+
+        Returns:
+            List[Tuple[str, bool]]: Each screenshot's path, and whether it was
+            written.
+        """
+        results = []
+        while not self._results.empty():
+            results.append(self._results.get())
+        return results
+
+    def _write_screenshots(self) -> None:
+        """Write each queued screenshot (cv2 releases the GIL while it
+        encodes)."""
+        while True:
+            screenshot_path, frame = self._screenshot_queue.get()
+            try:
+                written = cv2.imwrite(screenshot_path, frame)
+            except cv2.error:
+                written = False
+            self._results.put((screenshot_path, bool(written)))
@@ -0,0 +1,380 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Read and write split packs, single files holding a whole split image set.
+
+A split pack holds every split image in a directory (and the reset image, if
+there is one) after it's been preprocessed by SplitDir._SplitImage: the
+original image, the comparison-sized template, the mask, a thumbnail at the
+size the UI shows it, and the settings read from the filename. Loading a pack takes one sequential read, instead of one
+read and one decode per image, which matters for big split sets, slow disks,
+and network shares.
+
+The manifest also lists the name, size, and last modified time of every image
+the pack was made from (see get_source_listing). A pack is only used while
+that listing still matches the directory, so renaming, adding, deleting, or
+editing an image makes the splitter fall back to the loose images. A pack in a
+directory with no loose images is always used, so a pack can be shared on its
+own.
+
+Layout (all integers little-endian):
+    - PACK_MAGIC (8 bytes)
+    - Format version (uint32)
+    - Manifest length in bytes (uint32)
+    - Manifest (UTF-8 JSON), zero-padded to a multiple of PACK_ALIGNMENT
+    - Array data. Each array starts at a multiple of PACK_ALIGNMENT, and its
+      offset (relative to the start of the array data), shape, and dtype are
+      listed in the manifest.
+
+Packs can be made from a directory, and turned back into a directory, from the
+command line (run from the src directory):
+    python -m splitter.split_pack pack <split image dir> [-o <pack path>]
+    python -m splitter.split_pack unpack <pack path> <output dir>
+"""
+
+
+import argparse
+import glob
+import json
+import os
+import pathlib
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy
+
+PACK_MAGIC = b"PILGRIMP"
+PACK_VERSION = 1
+PACK_EXTENSION = ".splitpack"
+PACK_ALIGNMENT = 64
+_HEADER = struct.Struct("<8sII")
+
+# The _SplitImage attributes stored in each manifest entry
+METADATA_KEYS = (
+    "name",
+    "stripped_name",
+    "last_modified",
+    "max_dist",
+    "below_flag",
+    "dummy_flag",
+    "pause_flag",
+    "reset_flag",
+    "delay_duration",
+    "delay_is_default",
+    "pause_duration",
+    "pause_is_default",
+    "reset_wait_duration",
+    "threshold",
+    "threshold_is_default",
+    "loops",
+    "loops_is_default",
+)
+
+
+class SplitPackError(Exception):
+    """Raised when a file isn't a split pack this version can read."""
+
+
+def write_pack(
+    pack_path: str,
+    entries: List[Tuple[Dict, Dict[str, Optional[numpy.ndarray]]]],
+    sources: Optional[List[List]] = None,
+) -> None:
+    """Write a split pack.
+
+    Args:
+        pack_path (str): Where to write the pack. Overwritten if it exists.
+        entries (List[Tuple[Dict, Dict[str, numpy.ndarray | None]]]): One
+            (metadata, arrays) pair per image, in order. metadata must be JSON
+            serializable. Arrays that are None (e.g. an image with no mask)
+            are recorded as null in the manifest.
+        sources (List[List] | None): The listing of the images the pack was
+            made from (see get_source_listing). If None, the pack is never
+            considered up to date with a directory. Default is None.
+    """
+    manifest = {"version": PACK_VERSION, "sources": sources, "images": []}
+    blobs = []
+    offset = 0
+    for metadata, arrays in entries:
+        array_info = {}
+        for key, array in arrays.items():
+            if array is None:
+                array_info[key] = None
+                continue
+            array = numpy.ascontiguousarray(array)
+            array_info[key] = {
+                "offset": offset,
+                "shape": list(array.shape),
+                "dtype": array.dtype.str,
+            }
+            blobs.append((offset, array))
+            offset = _align(offset + array.nbytes)
+        manifest["images"].append(dict(metadata, arrays=array_info))
+
+    manifest_bytes = json.dumps(manifest).encode("utf-8")
+    data_start = _align(_HEADER.size + len(manifest_bytes))
+
+    # Write to a temporary file first so a pack that's being loaded is never
+    # left half-written
+    temp_path = f"{pack_path}.tmp"
+    with open(temp_path, "wb") as pack_file:
+        pack_file.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(manifest_bytes)))
+        pack_file.write(manifest_bytes)
+        pack_file.write(bytes(data_start - _HEADER.size - len(manifest_bytes)))
+        for array_offset, array in blobs:
+            pack_file.seek(data_start + array_offset)
+            pack_file.write(array.tobytes())
+    os.replace(temp_path, pack_path)
+
+
+def read_pack(
+    pack_path: str,
+) -> List[Tuple[Dict, Dict[str, Optional[numpy.ndarray]]]]:
+    """Read a split pack with a single sequential read.
+
+    The returned arrays are read-only views into the bytes that were read, so
+    no array data is copied. The file isn't memory-mapped, because a mapped
+    file can't be replaced on Windows while it's open, and users should be
+    able to rebuild a pack while the program is running.
+
+    Args:
+        pack_path (str): The path to the pack.
+
+    Raises:
+        SplitPackError: The file is not a split pack, or its version is not
+            supported.
+
+    Returns:
+        List[Tuple[Dict, Dict[str, numpy.ndarray | None]]]: One (metadata,
+        arrays) pair per image, in the order they were written.
+    """
+    with open(pack_path, "rb") as pack_file:
+        data = pack_file.read()
+
+    manifest_length = _check_header(pack_path, data)
+    manifest_end = _HEADER.size + manifest_length
+    manifest = json.loads(data[_HEADER.size : manifest_end].decode("utf-8"))
+    data_start = _align(manifest_end)
+
+    entries = []
+    for metadata in manifest["images"]:
+        array_info = metadata.pop("arrays")
+        arrays = {}
+        for key, info in array_info.items():
+            if info is None:
+                arrays[key] = None
+                continue
+            dtype = numpy.dtype(info["dtype"])
+            count = int(numpy.prod(info["shape"]))
+            arrays[key] = numpy.frombuffer(
+                data, dtype=dtype, count=count, offset=data_start + info["offset"]
+            ).reshape(info["shape"])
+        entries.append((metadata, arrays))
+    return entries
+
+
+def read_sources(pack_path: str) -> Optional[List[List]]:
+    """Read the listing of the images a split pack was made from.
+
+    Only the header and manifest are read, so this is cheap enough to call
+    every time a split image directory is loaded.
+
+    Args:
+        pack_path (str): The path to the pack.
+
+    Raises:
+        SplitPackError: The file is not a split pack, or its version is not
+            supported.
+
+    Returns:
+        List[List] | None: The listing stored when the pack was made (see
+        get_source_listing), or None if the pack doesn't have one.
+    """
+    with open(pack_path, "rb") as pack_file:
+        header = pack_file.read(_HEADER.size)
+        manifest_length = _check_header(pack_path, header)
+        manifest_bytes = pack_file.read(manifest_length)
+    manifest = json.loads(manifest_bytes.decode("utf-8"))
+    return manifest.get("sources")
+
+
+def get_source_listing(image_paths: List[str]) -> List[List]:
+    """Describe a set of split images well enough to tell if any changed.
+
+    Settings are read from filenames, and renaming a file doesn't change its
+    last modified time, so the name is part of the listing along with the size
+    and last modified time.
+
+    Args:
+        image_paths (List[str]): The paths of the split images (and the reset
+            image, if there is one).
+
+    Returns:
+        List[List]: One [file name, size in bytes, last modified time in
+        nanoseconds] entry per image, sorted by file name. Uses lists instead
+        of tuples so it compares equal to a listing read back from JSON.
+    """
+    listing = []
+    for path in image_paths:
+        stat = os.stat(path)
+        listing.append([pathlib.Path(path).name, stat.st_size, stat.st_mtime_ns])
+    return sorted(listing)
+
+
+def pack_dir(dir_path: str, pack_path: Optional[str] = None) -> str:
+    """Make a split pack from a directory of split images.
+
+    Args:
+        dir_path (str): The split image directory.
+        pack_path (str | None): Where to write the pack. If None, the pack is
+            written inside dir_path and named after it. Default is None.
+
+    Returns:
+        str: The path to the pack.
+    """
+    # Imported here, since split_dir imports this module
+    from splitter.split_dir import SplitDir
+
+    if pack_path is None:
+        dir_name = pathlib.Path(dir_path).resolve().name
+        pack_path = str(pathlib.Path(dir_path) / f"{dir_name}{PACK_EXTENSION}")
+
+    # Same listing SplitDir uses, so the sources compare equal
+    image_paths = sorted(glob.glob(f"{dir_path}/*.png"))
+    entries = []
+    for image_path in image_paths:
+        split_image = SplitDir._SplitImage(image_path, make_pixmap=False)
+        metadata = {key: getattr(split_image, key) for key in METADATA_KEYS}
+        metadata["file_name"] = pathlib.Path(image_path).name
+        arrays = {
+            "raw_image": split_image._raw_image,
+            "image": split_image.image,
+            "mask": split_image.mask,
+            "thumbnail": split_image.get_thumbnail(),
+        }
+        entries.append((metadata, arrays))
+
+    write_pack(pack_path, entries, get_source_listing(image_paths))
+    return pack_path
+
+
+def unpack(pack_path: str, dir_path: str) -> List[str]:
+    """Turn a split pack back into a directory of split images.
+
+    Each image is written under its original filename (so the settings in the
+    name are kept) and given its original last modified time.
+
+    Args:
+        pack_path (str): The path to the pack.
+        dir_path (str): The directory to write the images to. Created if it
+            doesn't exist.
+
+    Returns:
+        List[str]: The paths of the images that were written.
+    """
+    pathlib.Path(dir_path).mkdir(parents=True, exist_ok=True)
+    image_paths = []
+    for metadata, arrays in read_pack(pack_path):
+        image_path = str(pathlib.Path(dir_path) / metadata["file_name"])
+        cv2.imwrite(image_path, arrays["raw_image"])
+        os.utime(image_path, (metadata["last_modified"], metadata["last_modified"]))
+        image_paths.append(image_path)
+    return image_paths
+
+
+def _check_header(pack_path: str, data: bytes) -> int:
+    """Make sure data starts with a split pack header this version can read.
+
+    Args:
+        pack_path (str): The path to the pack, for error messages.
+        data (bytes): The start of the file (at least the header).
+
+    Raises:
+        SplitPackError: The file is not a split pack, or its version is not
+            supported.
+
+    Returns:
+        int: The length of the manifest in bytes.
+    """
+    if len(data) < _HEADER.size:
+        raise SplitPackError(f"{pack_path} is not a split pack")
+    magic, version, manifest_length = _HEADER.unpack_from(data)
+    if magic != PACK_MAGIC:
+        raise SplitPackError(f"{pack_path} is not a split pack")
+    if version != PACK_VERSION:
+        raise SplitPackError(f"{pack_path} has unsupported version {version}")
+    return manifest_length
+
+
+def _align(offset: int) -> int:
+    """Round offset up to the next multiple of PACK_ALIGNMENT.
+
+    Args:
+        offset (int): The offset to align.
+
+    Returns:
+        int: The aligned offset.
+    """
+    return -(-offset // PACK_ALIGNMENT) * PACK_ALIGNMENT
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Pack or unpack split images from the command line.
+
+    Args:
+        argv (List[str] | None): Command line arguments. If None, use
+            sys.argv. Default is None.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m splitter.split_pack",
+        description="Convert split image directories to split packs and back.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = subparsers.add_parser("pack", help="make a pack from a directory")
+    pack_parser.add_argument("dir", help="split image directory")
+    pack_parser.add_argument(
+        "-o", "--output", help=f"pack path (default: <dir>/<dir name>{PACK_EXTENSION})"
+    )
+
+    unpack_parser = subparsers.add_parser("unpack", help="make a directory from a pack")
+    unpack_parser.add_argument("pack", help="split pack path")
+    unpack_parser.add_argument("dir", help="output directory")
+
+    args = parser.parse_args(argv)
+    if args.command == "pack":
+        pack_path = pack_dir(args.dir, args.output)
+        print(f"Wrote {pack_path}")
+    else:
+        image_paths = unpack(args.pack, args.dir)
+        print(f"Wrote {len(image_paths)} images to {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
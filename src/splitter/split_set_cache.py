@@ -0,0 +1,244 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Keep several split image directories loaded so they can be switched
+between instantly.
+"""
+
+
+import pathlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import settings
+from splitter.split_dir import SplitDir
+
+# The most split image directories remembered in RECENT_IMAGE_DIRS
+MAX_RECENT_SPLIT_SETS = 10
+
+
+class SplitSetCache:
+    """Hold a SplitDir for each recently used split image directory.
+
+    Loaded directories are kept in least-recently-used order. When the memory
+    they use goes over the SPLIT_SET_MEMORY_MB setting, the least recently
+    used directories are dropped until it doesn't (the directory in use is
+    never dropped, even if it's over the budget by itself).
+
+    Switching to a directory that's already loaded is just a dictionary
+    lookup, so the splitter can change split sets without reloading anything
+    and without restarting its threads.
+    """
+
+    def __init__(self, make_pixmaps: bool = True) -> None:
+        """Set up an empty cache.
+
+        Args:
+            make_pixmaps (bool): Passed to each SplitDir (see
+                SplitDir.make_pixmaps). Default is True.
+        """
+        self._make_pixmaps = make_pixmaps
+        # Maps directory paths to SplitDirs, least recently used first
+        self._split_dirs = OrderedDict()
+        self._lock = threading.Lock()
+        self._preload_thread = threading.Thread(target=self._preload)
+
+    ##################
+    #                #
+    # Public Methods #
+    #                #
+    ##################
+
+    def get(self, dir_path: str, reload: bool = False) -> SplitDir:
+        """Get the SplitDir for a directory, loading it if it isn't loaded.
+
+        The directory becomes the most recently used directory, and is added
+        to RECENT_IMAGE_DIRS.
+
+        If the cache makes pixmaps, this must be called from the GUI thread,
+        since that's where pixmaps for preloaded directories are made.
+
+        Args:
+            dir_path (str): The split image directory.
+            reload (bool): If True and the directory is already loaded, read
+                it again so images changed on disk are picked up (unchanged
+                images are reused, see SplitDir.reset_split_images). Default
+                is False.
+
+        Returns:
+            SplitDir: The directory's split images.
+        """
+        with self._lock:
+            split_dir = self._split_dirs.pop(dir_path, None)
+        if split_dir is None:
+            split_dir = SplitDir(dir_path, make_pixmaps=self._make_pixmaps)
+        else:
+            if self._make_pixmaps and not split_dir.make_pixmaps:
+                # Preloaded without pixmaps (see _preload), so make them here
+                split_dir.make_pixmaps = True
+                split_dir.resize_images()
+            if reload:
+                split_dir.reset_split_images()
+
+        with self._lock:
+            self._split_dirs[dir_path] = split_dir
+            self._evict()
+
+        add_recent_dir(dir_path)
+        return split_dir
+
+    def get_loaded(self) -> List[SplitDir]:
+        """Get every SplitDir that's currently loaded.
+
+        Useful for applying setting changes (default threshold, aspect ratio,
+        etc.) to every loaded directory, not just the one in use.
+
+        Returns:
+            List[SplitDir]: The loaded SplitDirs, least recently used first.
+        """
+        with self._lock:
+            return list(self._split_dirs.values())
+
+    def preload(self, dir_paths: List[str]) -> None:
+        """Load directories on a background thread until the memory budget is
+        used up.
+
+        Directories that are already loaded are skipped. Preloaded directories
+        count as less recently used than any directory already loaded, so
+        preloading never pushes out the directory in use.
+
+        QPixmaps can only be made safely on the GUI thread, so preloaded
+        directories are loaded without them. Their pixmaps are made by get
+        when they're first used.
+
+        Args:
+            dir_paths (List[str]): The directories to load, most important
+                first.
+        """
+        if self._preload_thread.is_alive():
+            return
+        self._preload_thread = threading.Thread(target=self._preload, args=(dir_paths,))
+        self._preload_thread.daemon = True
+        self._preload_thread.start()
+
+    ###################
+    #                 #
+    # Private Methods #
+    #                 #
+    ###################
+
+    def _preload(self, dir_paths: List[str]) -> None:
+        """Load each directory in dir_paths, stopping once the memory budget is
+        used up (see preload).
+
+        Args:
+            dir_paths (List[str]): The directories to load, most important
+                first.
+        """
+        for dir_path in dir_paths:
+            with self._lock:
+                if dir_path in self._split_dirs:
+                    continue
+
+            split_dir = SplitDir(dir_path, make_pixmaps=False)
+            split_dir.wait_for_loading()
+
+            with self._lock:
+                if dir_path in self._split_dirs:
+                    continue  # Loaded by get while we were loading it
+                self._split_dirs[dir_path] = split_dir
+                self._split_dirs.move_to_end(dir_path, last=False)
+                self._evict()
+                if dir_path not in self._split_dirs:
+                    return  # Over budget, so no point loading any more
+
+    def _evict(self) -> None:
+        """Drop least recently used directories until the loaded directories
+        fit in the memory budget.
+
+        Must be called with self._lock held.
+        """
+        budget = settings.get_int("SPLIT_SET_MEMORY_MB") * 1024 * 1024
+        usage = sum(
+            split_dir.get_memory_usage() for split_dir in self._split_dirs.values()
+        )
+        while usage > budget and len(self._split_dirs) > 1:
+            _, split_dir = self._split_dirs.popitem(last=False)
+            split_dir.stop_loading()
+            usage -= split_dir.get_memory_usage()
+
+
+def get_recent_dirs() -> List[str]:
+    """Get the recently used split image directories that still exist.
+
+    Returns:
+        List[str]: The directories, in the order they were first used.
+    """
+    home_dir = settings.get_home_dir()
+    recent_dirs = []
+    for dir_path in settings.get_str("RECENT_IMAGE_DIRS").split("\n"):
+        # Only use dirs within the user's home dir (see set_program_vals)
+        if dir_path.startswith(home_dir) and pathlib.Path(dir_path).is_dir():
+            recent_dirs.append(dir_path)
+    return recent_dirs
+
+
+def add_recent_dir(dir_path: str) -> None:
+    """Add a directory to RECENT_IMAGE_DIRS, if it isn't already there.
+
+    New directories go at the end, so cycling through the list (see
+    get_next_recent_dir) always visits directories in the same order. If
+    there are too many directories, the oldest one is forgotten.
+
+    Args:
+        dir_path (str): The split image directory.
+    """
+    recent_dirs = get_recent_dirs()
+    if dir_path in recent_dirs:
+        return
+    recent_dirs = (recent_dirs + [dir_path])[-MAX_RECENT_SPLIT_SETS:]
+    settings.set_value("RECENT_IMAGE_DIRS", "\n".join(recent_dirs))
+
+
+def get_next_recent_dir(dir_path: str) -> Optional[str]:
+    """Get the recent split image directory after dir_path.
+
+    Args:
+        dir_path (str): The current split image directory.
+
+    Returns:
+        str | None: The next directory (wrapping around to the first), or
+        None if there are no other recent directories.
+    """
+    recent_dirs = get_recent_dirs()
+    if dir_path not in recent_dirs:
+        return recent_dirs[0] if len(recent_dirs) > 0 else None
+    if len(recent_dirs) < 2:
+        return None
+    return recent_dirs[(recent_dirs.index(dir_path) + 1) % len(recent_dirs)]
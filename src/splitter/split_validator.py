@@ -0,0 +1,221 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Find split images that are similar enough to trigger each other.
+
+If two split images in a directory look alike, the later one can split as
+soon as the earlier one's screen comes up, and the splitter fires early in
+the middle of a run. SplitDir runs find_similar_pairs on every directory it
+loads, so this can be pointed out before the run starts.
+
+Comparing every image with every other image one at a time takes N² calls to
+cv2.norm, which is far too slow for big split sets (500 images is 125,000
+comparisons). Instead, every image's distance to every other image is worked
+out at once with matrix products (see get_similarity_matrix). Those are done
+in float32, so pairs that come out within CONFIRM_MARGIN of their threshold
+are checked again with splitter.get_match_percent, and the similarities
+reported are exactly the ones the splitter would see.
+"""
+
+
+from typing import List
+
+import numpy
+
+# How many values (pixels times channels) of each image go into each matrix
+# product. Keeps memory use to a few MB per image at a time, however many
+# images there are
+CHUNK_SIZE = 16384
+# How far (as a match percent) below a pair's threshold its similarity can be
+# and still get checked with get_match_percent, to allow for float32 rounding
+CONFIRM_MARGIN = 0.01
+
+
+class SimilarPair:
+    """Two split images that are similar enough to trigger each other.
+
+    Attributes:
+        first (SplitDir._SplitImage): The image that comes first in the
+            directory.
+        second (SplitDir._SplitImage): The image that comes second.
+        similarity (float): The higher of the two images' match percents with
+            each other.
+        threshold (float): The stricter (higher) of the two images'
+            thresholds.
+    """
+
+    def __init__(self, first, second, similarity: float, threshold: float) -> None:
+        """Initialize a pair.
+
+        Args:
+            first (SplitDir._SplitImage): The image that comes first in the
+                directory.
+            second (SplitDir._SplitImage): The image that comes second.
+            similarity (float): The higher of the two images' match percents
+                with each other.
+            threshold (float): The stricter (higher) of the two images'
+                thresholds.
+        """
+        self.first = first
+        self.second = second
+        self.similarity = similarity
+        self.threshold = threshold
+
+    def describe(self) -> str:
+        """Describe the pair for the user.
+
+        Returns:
+            str: The images' names, similarity, and threshold.
+        """
+        return (
+            f"{self.first.name} and {self.second.name}: "
+            f"{self.similarity:.1%} alike (threshold {self.threshold:.1%})"
+        )
+
+
+def find_similar_pairs(images: List) -> List[SimilarPair]:
+    """Find every pair of images whose similarity meets the stricter of their
+    thresholds.
+
+    A pair's similarity is the higher of its two match percents: first's
+    template compared with second's image, and second's template compared
+    with first's image. (They differ when an image has a mask.)
+
+    Args:
+        images (List[SplitDir._SplitImage]): The images to check, in order.
+
+    Returns:
+        List[SimilarPair]: The similar pairs, most similar first.
+    """
+    # Imported here, since splitter imports split_dir, which imports this
+    # module
+    from splitter.splitter import get_match_percent
+
+    if len(images) < 2:
+        return []
+
+    similarity = get_similarity_matrix(images)
+    similarity = numpy.maximum(similarity, similarity.T)
+    thresholds = numpy.array([image.threshold for image in images])
+    pair_thresholds = numpy.maximum(thresholds[:, None], thresholds[None, :])
+
+    pairs = []
+    candidates = numpy.argwhere(
+        numpy.triu(similarity >= pair_thresholds - CONFIRM_MARGIN, k=1)
+    )
+    for first_index, second_index in candidates:
+        first, second = images[first_index], images[second_index]
+        pair_similarity = max(
+            get_match_percent(second.image, first),
+            get_match_percent(first.image, second),
+        )
+        threshold = pair_thresholds[first_index, second_index]
+        if pair_similarity >= threshold:
+            pairs.append(SimilarPair(first, second, pair_similarity, threshold))
+
+    pairs.sort(key=lambda pair: pair.similarity, reverse=True)
+    return pairs
+
+
+def get_similarity_matrix(images: List) -> numpy.ndarray:
+    """Get the match percent of every image's template with every image.
+
+    The masked squared distance between template i (image x_i, mask w_i) and
+    image x_j is sum(w_i * (x_i - x_j)²), which expands to
+    sum(w_i * x_i²) - 2 * sum(w_i * x_i * x_j) + sum(w_i * x_j²). Each of those
+    terms is a matrix product (or a row sum) over every image at once, so the
+    whole matrix takes a couple of matrix products per CHUNK_SIZE values
+    instead of N² calls to cv2.norm. Images without a mask (most of them)
+    skip the last product, since for them the last term is just x_j's squared
+    norm. Distances are normalized the same way as in
+    splitter.get_match_percent.
+
+    Args:
+        images (List[SplitDir._SplitImage]): The images.
+
+    Returns:
+        numpy.ndarray: An N x N array whose [i, j] entry is the match percent
+        of image i's template with image j (up to float32 rounding).
+    """
+    count = len(images)
+    if count == 0:
+        return numpy.zeros((0, 0))
+
+    masked = [index for index, image in enumerate(images) if image.mask is not None]
+    flat_images = [image.image.reshape(-1) for image in images]
+    # Masks have one value per pixel, so repeat them for each channel
+    flat_masks = {
+        index: numpy.repeat(images[index].mask.reshape(-1) > 0, 3) for index in masked
+    }
+
+    self_terms = numpy.zeros(count)
+    cross_terms = numpy.zeros((count, count))
+    squared_norms = numpy.zeros(count)
+    masked_terms = numpy.zeros((len(masked), count))
+    mask_sizes = numpy.full(count, float(flat_images[0].size))
+
+    for start in range(0, flat_images[0].size, CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        # Centering the values on 0 doesn't change any distances, but keeps
+        # the sums smaller, so float32 loses less precision
+        pixels = numpy.stack([image[start:stop] for image in flat_images]).astype(
+            numpy.float32
+        )
+        pixels -= 128
+        squared = pixels * pixels
+        weighted = pixels
+        if len(masked) > 0:
+            weights = numpy.stack(
+                [flat_masks[index][start:stop] for index in masked]
+            ).astype(numpy.float32)
+            weighted = pixels.copy()
+            weighted[masked] *= weights
+            masked_terms += weights @ squared.T
+            self_terms[masked] += (weighted[masked] * pixels[masked]).sum(
+                axis=1, dtype=numpy.float64
+            )
+
+        cross_terms += weighted @ pixels.T
+        squared_norms += squared.sum(axis=1, dtype=numpy.float64)
+
+    # Without a mask, sum(w_i * x_i²) and sum(w_i * x_j²) are just squared
+    # norms
+    unmasked = numpy.ones(count, bool)
+    unmasked[masked] = False
+    self_terms[unmasked] = squared_norms[unmasked]
+    other_terms = numpy.tile(squared_norms, (count, 1))
+    if len(masked) > 0:
+        other_terms[masked] = masked_terms
+        mask_sizes[masked] = [flat_masks[index].sum() for index in masked]
+
+    distances = numpy.sqrt(
+        numpy.maximum(self_terms[:, None] - 2 * cross_terms + other_terms, 0)
+    )
+    max_dists = numpy.sqrt(mask_sizes) * 255
+    return 1 - distances / numpy.maximum(max_dists, 1)[:, None]
@@ -29,20 +29,189 @@
 """Capture video and compare it to a template image."""
 
 from datetime import datetime
-import pathlib
+import math
 import platform
 from queue import Full, Queue
 import threading
-import time
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 import cv2
 import numpy
-from PyQt5.QtGui import QImage, QPixmap
 
 import settings
 from settings import COMPARISON_FRAME_WIDTH, COMPARISON_FRAME_HEIGHT
+from splitter.action_dispatcher import ActionDispatcher, SplitAction
+from splitter.clip_buffer import JPEG_QUALITY, ClipWriter, FrameRing, PendingClip
+from splitter.clip_encoder import ClipEncoder
+from splitter.clock import REAL_CLOCK, Clock
+from splitter.deadline_timer import DeadlineTimer, wait_until
+from splitter.frame_export import DEFAULT_EXPORT_PATH, FrameExport
+from splitter.run_history import RunEvent, RunHistory
 from splitter.split_dir import SplitDir
+from splitter.split_set_cache import SplitSetCache, get_recent_dirs
+
+# How far the offset between the backend's frame timestamps and the clock can
+# creep up each frame (see _get_capture_time)
+CAPTURE_CLOCK_DRIFT = 0.0001
+
+
+def get_match_percent(
+    curr_frame: numpy.ndarray, template: SplitDir._SplitImage
+) -> float:
+    """Get the percent likelihood that two images are the same.
+
+    I do this by calculating the Euclidean distance between the two images.
+    Euclidean distance is calculated by summing the squares of the value
+    differences of each pixel in each channel when comparing two images of
+    the same size, then taking the square root of that sum. For more
+    information, see, e.g., https://en.wikipedia.org/wiki/Euclidean_distance.
+
+    Fortunately, cv2.norm provides an easy way to do this by passing in
+    normType=cv2.NORM_L2. In images with transparency, a mask must be
+    supplied also which tells cv2.norm which pixels matter and which should
+    be ignored.
+
+    To generate a match value between 0 and 1, you need to normalize the
+    result. This can be done by dividing the result by the largest possible
+    Euclidean distance for the given image. Details on this are provided in
+    split_dir.py's documentation.
+
+    This is a module-level function so tools that run video through split
+    images outside of a Splitter (e.g. threshold_tuner.py) get exactly the
+    same match percents.
+
+    Args:
+        curr_frame (numpy.ndarray): The current comparison frame from the
+            video feed.
+        template (SplitDir._SplitImage): The template image to compare
+            against. Only its image, mask, and max_dist are used.
+
+    Returns:
+        float: The percent likelihood that the template image and the frame
+            are the same image, expressed as a float between 0 and 1.
+    """
+    euclidean_dist = cv2.norm(
+        src1=template.image,
+        src2=curr_frame,
+        normType=cv2.NORM_L2,
+        mask=template.mask,
+    )
+    return 1 - euclidean_dist / template.max_dist
+
+
+# The functions below decide when split and reset images match, what kind of
+# split they make, and when the reset image starts being compared. Splitter
+# and retimer.py both use them, so a retimed run makes the same decisions the
+# splitter would make live.
+
+
+def check_match(
+    match_percent: float, image: SplitDir._SplitImage, above_threshold: bool
+) -> Tuple[bool, bool]:
+    """Check if a split or reset image matches, given its match percent with
+    the latest frame.
+
+    The image matches as soon as its threshold is met, unless it's a {b}
+    image. Then it matches once the match percent falls back beneath the
+    threshold, after having met it.
+
+    Args:
+        match_percent (float): The image's match percent with the frame.
+        image (SplitDir._SplitImage): The split or reset image.
+        above_threshold (bool): Whether the threshold has previously been met
+            (used to execute {b} flags).
+
+    Returns:
+        Tuple[bool, bool]: match_found and above_threshold, respectively (see
+            Splitter._compare_with_split_image).
+    """
+    if match_percent >= image.threshold:
+        # {b} image -- show that the threshold was met, but no "match" yet
+        if image.below_flag:
+            return False, True
+        return True, True
+
+    # {b} image -- we are below the threshold now and the threshold has
+    # previously been met. It's a match
+    elif above_threshold:
+        return True, True
+
+    return False, False
+
+
+def get_split_event(split_image: SplitDir._SplitImage) -> str:
+    """Get the kind of split a split image makes when it matches.
+
+    Args:
+        split_image (SplitDir._SplitImage): The split image.
+
+    Returns:
+        str: RunEvent.PAUSE_SPLIT, RunEvent.DUMMY_SPLIT, or RunEvent.SPLIT.
+    """
+    if split_image.pause_flag:
+        return RunEvent.PAUSE_SPLIT
+    elif split_image.dummy_flag:
+        return RunEvent.DUMMY_SPLIT
+    return RunEvent.SPLIT
+
+
+def is_last_split(
+    split_image: SplitDir._SplitImage, index: int, loop: int, last_index: int
+) -> bool:
+    """Check if a split is the last one in the run.
+
+    Args:
+        split_image (SplitDir._SplitImage): The split image.
+        index (int): The split image's index.
+        loop (int): The split image's current loop.
+        last_index (int): The index of the last split image.
+
+    Returns:
+        bool: True if it's the last loop of the last split image.
+    """
+    return index == last_index and loop == split_image.loops
+
+
+def is_second_split(
+    split_images: List[SplitDir._SplitImage], index: int, loop: int
+) -> bool:
+    """Check if a split is the second one in the run, which is when the reset
+    image's reset_wait_duration starts.
+
+    Args:
+        split_images (List[SplitDir._SplitImage]): The split images. Must not
+            be empty.
+        index (int): The current split image's index.
+        loop (int): The current split image's current loop.
+
+    Returns:
+        bool: True if it's the second loop of the first split image, or the
+        first loop of the second split image if the first only has one loop.
+    """
+    if split_images[0].loops == 1:
+        return index == 1 and loop == 1
+    return index == 0 and loop == 2
+
+
+class Change:
+    """Bit flags for the kinds of splitter state ui_controller displays.
+
+    Splitter sets these as its threads change the state, and ui_controller
+    collects them once per poll with Splitter.take_changes, so it only updates
+    the widgets showing state that actually changed. They're plain ints, not
+    an enum.IntFlag, because they're combined and checked several times per
+    frame, and IntFlag operations are slow.
+    """
+
+    NONE = 0
+    FRAME = 1  # ui_frame
+    MATCH = 2  # match_percent, highest_percent, and their reset versions
+    COUNTDOWN = 4  # split_delay_remaining, reset_delay_remaining, etc.
+    RESULT = 8  # result_text
+    ALL = FRAME | MATCH | COUNTDOWN | RESULT
+    # normal_, pause_, dummy_, or reset_split_action was set. Not displayed,
+    # so not part of ALL; used by wait_for_changes callers like headless.py
+    ACTION = 16
 
 
 class Splitter:
@@ -51,9 +220,12 @@ class Splitter:
     This class makes use of four threads:
     - capture_thread: Captures video frame-by-frame and feeds it in three
         dedicated queues to the other three threads for processing.
-    - record_thread: When recording is enabled (see ui_controller), writes each
-        frame to an .mp4 file. Saves this file on each normal and pause split
-        action.
+    - record_thread: When recording is enabled (see ui_controller), sends each
+        frame to clip_encoder to be written to an .mp4 file. Saves this file
+        on each normal and pause split action. Alternatively, keeps the last
+        few seconds of frames in memory and, on each normal and pause split
+        action, saves only the frames around the split (see
+        _record_around_split).
     - compare_split_thread: Compares each frame to the current split image.
         If a match is found, performs a split action.
     - compare_reset_thread: Compares each frame to the reset image, if it
@@ -61,20 +233,37 @@ class Splitter:
 
     ui_controller is constantly accessing the public attributes of this class,
     whether or not the threads are active, which is why several of these
-    attributes are set to None when their threads go down.
+    attributes are set to None when their threads go down. The countdowns
+    (split_delay_remaining, reset_delay_remaining, and suspend_remaining) are
+    worked out from their deadlines whenever they're read. Changes to the
+    attributes ui_controller displays are also recorded (see take_changes), so
+    it doesn't have to redraw the ones that haven't changed.
 
     Attributes:
+        action_dispatcher (ActionDispatcher): Presses the hotkey for each
+            split, pause, and reset action the moment it's decided on, without
+            waiting for ui_controller to notice the action flags.
+        capture_frame (numpy.ndarray | None): The most recent frame, at the
+            capture source's resolution (e.g. for screenshots). Like ui_frame,
+            each frame is a new array that isn't changed after it's assigned.
+            None if the video is down.
         capture_thread (threading.Thread): Thread instance that reads and
             resizes images from a cv2.VideoCapture instance.
-        changing_splits (bool): Flag set by ui_controller before telling
-            self.splits to go to a new split image.
+        clip_encoder (ClipEncoder): Encodes recordings in a separate process.
+        clock (Clock): Every time the splitter reads and every sleep it takes
+            (capture pacing, delays, pauses, and reset waits) goes through
+            this clock (see clock.py). Frame capture times are clock.now()
+            values.
         comparison_frame (numpy.ndarray): Numpy array used to generate a
             comparison with a split image.
-        delay_remaining (float): The amount of time left (in seconds) until a
-            planned split occurs.
         dummy_split_action (bool): When True, tells ui_controller to perform a
             dummy split action.
-        frame_pixmap (QPixmap): QPixmap used to show video feed on UI.
+        frame_export (FrameExport | None): Shares each comparison frame and
+            the match percents with other programs through a memory-mapped
+            file, or None if FRAME_EXPORT_ENABLED isn't set (see
+            update_frame_export).
+        frame_generation (int): Counts the frames captured, so ui_controller
+            can tell when ui_frame is a new frame.
         highest_percent (float): The highest match percent so far between
             a frame and a split image.
         highest_reset_percent (float): The highest match percent so far between
@@ -86,32 +275,72 @@ class Splitter:
             check if splitter_thread is active.
         match_reset_percent (float): The most recent match percent between a
             frame and the reset image, if it exists.
+        record_frames_dropped (int): The number of frames capture_thread
+            couldn't give record_thread while recording, because record_thread
+            was falling behind.
         normal_split_action (bool): When True, tells ui_controller to perform a
             normal split action.
         pause_split_action (bool): When True, tells ui_controller to perform a
             pause split action.
+        preview_paused (bool): Set by ui_controller when the video preview
+            isn't being shown, so ui_frame doesn't need to be made.
         reset_split_action (bool): When True, tells ui_controller to perform a
             reset action.
+        run_history (RunHistory | None): Records each split and reset to a
+            database, or None if RUN_HISTORY_ENABLED isn't set (see
+            update_run_history).
+        split_sets (SplitSetCache): Recently used split image directories,
+            kept loaded so self.splits can be switched between them without
+            reloading.
         splits (SplitDir): The directory of split images currently in use.
-        suspend_remaining (float): The amount of time left (in seconds) before
-            the end of a pause after a split.
-        waiting_for_split_change (bool): Indicates to ui_controller that
-            _look_for_split received its changing_splits request and is waiting
-            for the new split.
+        ui_frame (numpy.ndarray | None): The most recent frame, sized to be
+            shown on the UI. Each frame is a new array that isn't changed
+            after it's assigned here, so the UI can show it without copying.
+            None if the video is down or the UI is in minimal view.
     """
 
-    def __init__(self) -> None:
-        """Set all flags and values needed to run the threads."""
+    def __init__(self, make_pixmaps: bool = True, clock: Clock = REAL_CLOCK) -> None:
+        """Set all flags and values needed to run the threads.
+
+        Args:
+            make_pixmaps (bool): Whether split images get QPixmaps to show in
+                the UI. Pass False to run without a UI (and without PyQt5).
+                Default is True.
+            clock (Clock): See clock above. Pass a SimulatedClock to replay
+                recorded frames faster than real time. Default is REAL_CLOCK.
+        """
+        self.clock = clock
+
+        # Everything counts as changed until ui_controller first checks
+        self._changes = Change.ALL
+        self._changes_lock = threading.Lock()
+        # Notified when a change wait_for_changes is waiting for happens
+        self._changes_condition = threading.Condition(self._changes_lock)
+        self._awaited_changes = Change.NONE
+
         # capture_thread
         self.capture_thread = threading.Thread(target=self._capture)
         self._capture_thread_finished = False
+        self.capture_frame = None
         self.comparison_frame = None
-        self.frame_pixmap = None
+        self.ui_frame = None
+        self.frame_generation = 0
+        self.preview_paused = False
         self._cap = None
         # This number works on my machine. Your mileage may vary.
         self._fps_adjust_factor = self._default_fps_adjust_factor = 1.22
         self._most_recent_fps = settings.get_int("FPS")
         self._interval = self._get_interval()
+        # Used to turn the backend's frame timestamps into self.clock values
+        # (see _get_capture_time)
+        self._last_pos_msec = 0.0
+        self._capture_clock_offset = None
+        # Records each split and reset, if enabled (see _split and _reset)
+        self.run_history = None
+        self.update_run_history()
+        # Shares each comparison frame with other programs, if enabled
+        self.frame_export = None
+        self.update_frame_export()
 
         # record_thread
         self._record_queue = Queue(10)  # Number doesn't matter, should be small
@@ -120,28 +349,57 @@ class Splitter:
         self.save_recording = False
         self.continue_recording = False
         self.recording_enabled = False
+        self.record_frames_dropped = 0
+        # Set by capture_thread while recording is enabled, so record_thread
+        # can sleep until then (see _record)
+        self._record_wakeup = threading.Event()
+        self.clip_encoder = ClipEncoder()
+        # Used when only recording frames around each split. These persist
+        # between record_thread restarts, so no frames are lost on a split.
+        self._frame_ring = FrameRing()
+        self._pending_clips = []
+        self._clip_writer = ClipWriter(
+            self.clip_encoder, on_clip_saved=self._on_clip_saved
+        )
         self.result_text = None
 
+        # compare_split_thread and compare_reset_thread press hotkeys through
+        # this (ui_controller sets its press_key)
+        self.action_dispatcher = ActionDispatcher(clock=self.clock)
+
         # compare_split_thread
         self._compare_split_queue = Queue(10)
         self.compare_split_thread = threading.Thread(target=self._compare_split)
-        self._compare_split_thread_finished = False
-        self.splits = SplitDir()
+        # Set to stop the thread, which also cuts short any delay or pause
+        self._compare_split_thread_finished = threading.Event()
+        self.split_sets = SplitSetCache(make_pixmaps=make_pixmaps)
+        self.splits = self.split_sets.get(settings.get_str("LAST_IMAGE_DIR"))
+        self.split_sets.preload(get_recent_dirs())
         self.match_percent = None
         self.highest_percent = None
-        self.split_delay_remaining = None
-        self.reset_delay_remaining = None
-        self.suspend_remaining = None
+        self._split_delay_timer = DeadlineTimer(self.clock)
+        self._suspend_timer = DeadlineTimer(self.clock)
+        # When the frame that matched the split image was captured, and the
+        # match percents at the time (for self.run_history)
+        self._split_match_time = None
+        self._split_match_percents = (None, None)
         self.pause_split_action = False
         self.dummy_split_action = False
         self.normal_split_action = False
-        self.changing_splits = False
-        self.waiting_for_split_change = False
+        # Notified when the split image changes (see change_splits), when
+        # _look_for_split pauses for a split change, and when a compare thread
+        # is killed, so the compare threads never have to poll for these
+        self._split_change = threading.Condition()
+        self._changing_splits = False
+        self._waiting_for_split_change = False
 
         # compare_reset_thread
         self._compare_reset_queue = Queue(10)
         self.compare_reset_thread = threading.Thread(target=self._compare_reset)
-        self._compare_reset_thread_finished = False
+        self._compare_reset_thread_finished = threading.Event()
+        self._reset_delay_timer = DeadlineTimer(self.clock)
+        self._reset_match_time = None
+        self._reset_match_percents = (None, None)
         self.match_reset_percent = None
         self.highest_reset_percent = None
         self.reset_split_action = False
@@ -152,6 +410,108 @@ class Splitter:
     #                #
     ##################
 
+    def take_changes(self) -> int:
+        """Get the changes since the last call, and forget them.
+
+        Returns:
+            int: The Change flags for each kind of state that has changed, or
+            Change.NONE if nothing has.
+        """
+        with self._changes_lock:
+            changes = self._changes
+            self._changes = Change.NONE
+        return changes
+
+    def wait_for_changes(self, changes: int, timeout: float) -> int:
+        """Block until one of the given changes happens, or until timeout.
+
+        Lets a caller that only cares about some changes (e.g. headless.py,
+        which only cares about Change.ACTION and Change.RESULT) sleep until
+        they happen, instead of polling. Other changes don't wake it up, and
+        are left for take_changes.
+
+        Args:
+            changes (int): The Change flags to wait for.
+            timeout (float): The longest to wait, in seconds.
+
+        Returns:
+            int: The Change flags out of changes that happened (and are now
+            forgotten), or Change.NONE if none did before timeout.
+        """
+        with self._changes_condition:
+            self._awaited_changes = changes
+            self._changes_condition.wait_for(lambda: self._changes & changes, timeout)
+            self._awaited_changes = Change.NONE
+            happened = self._changes & changes
+            self._changes &= ~changes
+        return happened
+
+    def update_run_history(self) -> None:
+        """Start or stop recording to self.run_history, or switch databases,
+        to match the settings.
+
+        Call this when the RUN_HISTORY_ENABLED or RUN_HISTORY_PATH settings
+        change. Events already sent to the old history are still written.
+        """
+        old_history = self.run_history
+        new_history = None
+        if settings.get_bool("RUN_HISTORY_ENABLED"):
+            new_history = RunHistory(settings.get_str("RUN_HISTORY_PATH"), self.clock)
+            if old_history is not None and old_history.path == new_history.path:
+                return
+
+        self.run_history = new_history
+        if old_history is not None:
+            old_history.close()
+
+    def update_frame_export(self) -> None:
+        """Start or stop sharing frames through self.frame_export, or switch
+        files, to match the settings.
+
+        Call this when the FRAME_EXPORT_ENABLED or FRAME_EXPORT_PATH settings
+        change. The old file isn't cleared or unmapped here, since
+        capture_thread may be writing to it (see _capture). It's unmapped
+        once nothing refers to it.
+        """
+        new_export = None
+        if settings.get_bool("FRAME_EXPORT_ENABLED"):
+            path = settings.get_str("FRAME_EXPORT_PATH") or DEFAULT_EXPORT_PATH
+            if self.frame_export is not None and self.frame_export.path == path:
+                return
+            try:
+                new_export = FrameExport(path, self.clock)
+            except OSError:
+                pass
+        self.frame_export = new_export
+
+    def close_run_history(self) -> None:
+        """Write any events still waiting to be recorded to self.run_history
+        (if there is one), and stop its writer thread. Call before quitting.
+        """
+        if self.run_history is not None:
+            self.run_history.close()
+
+    @property
+    def split_delay_remaining(self) -> Optional[float]:
+        """float | None: The time left (in seconds) until a delayed split
+        happens, or None if no split is being delayed.
+        """
+        return self._split_delay_timer.get_remaining()
+
+    @property
+    def reset_delay_remaining(self) -> Optional[float]:
+        """float | None: The time left (in seconds) until a delayed reset
+        happens, or None if no reset is being delayed.
+        """
+        return self._reset_delay_timer.get_remaining()
+
+    @property
+    def suspend_remaining(self) -> Optional[float]:
+        """float | None: The time left (in seconds) before the end of the
+        pause after a split, or None if the splitter isn't pausing.
+        """
+        return self._suspend_timer.get_remaining()
+
     def restart(self) -> None:
         """Start capture_thread and try to start the other threads, killing all
         other instances of those threads first.
@@ -165,6 +525,46 @@ class Splitter:
             if self.splits.reset_image is not None:
                 self.restart_compare_reset_thread()
 
+    def change_splits(self, change: Callable[[], None]) -> None:
+        """Change the split image or split set, even while compare_split_thread
+        is comparing frames.
+
+        If _look_for_split is running (self.match_percent isn't None), it has
+        to be paused while the split image changes, then start over with the
+        new split image. I ask it to pause and wake it up (it's usually waiting
+        for the next frame), then wait on self._split_change until it says it
+        has paused, it returns on its own (e.g. it just found a match), or its
+        thread dies. Only then is the change made, so there's no way for the
+        change to happen mid-comparison, and it's acknowledged right away
+        instead of on the next frame.
+
+        compare_reset_thread is notified of every change, since it waits for
+        the split image to change before it starts comparing.
+
+        Args:
+            change (Callable[[], None]): Changes the split image or set (e.g.
+                self.splits.next_split_image).
+        """
+        with self._split_change:
+            if self.match_percent is not None:
+                self._changing_splits = True
+                try:
+                    self._compare_split_queue.put_nowait(None)
+                except Full:
+                    pass  # There are already frames waiting, so it's awake
+
+                # The timeout is only there to notice if the thread dies
+                while (
+                    not self._waiting_for_split_change
+                    and self.match_percent is not None
+                    and self.compare_split_thread.is_alive()
+                ):
+                    self._split_change.wait(0.1)
+
+            change()
+            self._changing_splits = False
+            self._split_change.notify_all()
+
     def safe_exit_all_threads(self) -> None:
         """Safely kill capture_thread.
 
@@ -193,7 +593,7 @@ class Splitter:
         self.safe_exit_compare_split_thread()
 
         self._compare_split_queue = Queue(10)  # Clear queue
-        self._compare_split_thread_finished = False
+        self._compare_split_thread_finished.clear()
 
         # Re-instantiate and start thread
         self.compare_split_thread = threading.Thread(target=self._compare_split)
@@ -207,7 +607,7 @@ class Splitter:
         self.safe_exit_compare_reset_thread()
 
         self._compare_reset_queue = Queue(10)  # Clear queue
-        self._compare_reset_thread_finished = False
+        self._compare_reset_thread_finished.clear()
 
         # Re-instantiate and start thread
         self.compare_reset_thread = threading.Thread(target=self._compare_reset)
@@ -222,6 +622,7 @@ class Splitter:
         """
         if self.record_thread.is_alive():
             self._record_thread_finished = True
+            self._record_wakeup.set()
             try:
                 self._record_queue.put_nowait(None)
             except Full:
@@ -235,7 +636,9 @@ class Splitter:
         loop.
         """
         if self.compare_split_thread.is_alive():
-            self._compare_split_thread_finished = True
+            self._compare_split_thread_finished.set()
+            with self._split_change:
+                self._split_change.notify_all()
             try:
                 self._compare_split_queue.put_nowait(None)
             except Full:
@@ -249,7 +652,9 @@ class Splitter:
         loop.
         """
         if self.compare_reset_thread.is_alive():
-            self._compare_reset_thread_finished = True
+            self._compare_reset_thread_finished.set()
+            with self._split_change:
+                self._split_change.notify_all()
             try:
                 self._compare_reset_queue.put_nowait(None)
             except Full:
@@ -322,6 +727,8 @@ class Splitter:
         self.safe_exit_all_threads()
 
         self._cap = self._open_capture()
+        self._last_pos_msec = 0.0
+        self._capture_clock_offset = None
         self._capture_thread_finished = False
         self.capture_thread = threading.Thread(target=self._capture)
         self.capture_thread.daemon = True
@@ -363,7 +770,7 @@ class Splitter:
         CPU power when making comparisons in _compare, and saves users space
         because they don't have to store dozens of massive image files. The
         ui_frame, on the other hand, is designed to be the size the user
-        chooses, so it is resized accordingly and converted into a QPixmap.
+        chooses, so it is resized accordingly.
 
         The choices of cv2.INTER_LINEAR and cv2.INTER_NEAREST are deliberate.
         cv2.INTER_NEAREST provides the fastest method, by far, for downscaling
@@ -379,7 +786,7 @@ class Splitter:
         is set to True.
         """
         frames_this_second = 0
-        start_time = frame_counter_start_time = time.perf_counter()
+        start_time = frame_counter_start_time = self.clock.now()
 
         while not self._capture_thread_finished:
 
@@ -396,6 +803,8 @@ class Splitter:
             if frame is None:  # Video feed is down, kill the thread
                 self._capture_thread_finished = True
                 break
+            captured_at = self._get_capture_time(self.clock.now())
+            self.capture_frame = frame
 
             if settings.get_str("ASPECT_RATIO") == "4:3 (320x240)":
                 self.comparison_frame = cv2.resize(
@@ -405,7 +814,7 @@ class Splitter:
                 )
                 # Don't need to generate a separate ui_frame -- the
                 # comparison_frame is already the right size
-                if settings.get_bool("SHOW_MIN_VIEW"):
+                if settings.get_bool("SHOW_MIN_VIEW") or self.preview_paused:
                     ui_frame = None
                 else:
                     ui_frame = self.comparison_frame
@@ -416,8 +825,9 @@ class Splitter:
                     (COMPARISON_FRAME_WIDTH, COMPARISON_FRAME_HEIGHT),
                     interpolation=cv2.INTER_LINEAR,
                 )
-                # Generate ui_frame (if not in min view)
-                if settings.get_bool("SHOW_MIN_VIEW"):
+                # Generate ui_frame (if not in min view and the preview is
+                # being shown)
+                if settings.get_bool("SHOW_MIN_VIEW") or self.preview_paused:
                     ui_frame = None
                 else:
                     ui_frame = cv2.resize(
@@ -429,48 +839,120 @@ class Splitter:
                         interpolation=cv2.INTER_NEAREST,
                     )
 
-            # Convert ui_frame to pixmap
-            self.frame_pixmap = self._frame_to_pixmap(ui_frame)
+            # Expose ui_frame to the UI (no need to tell the UI if there
+            # wasn't a frame before, and there isn't one now)
+            if ui_frame is not None or self.ui_frame is not None:
+                self.ui_frame = ui_frame
+                self.frame_generation += 1
+                self._mark_changed(Change.FRAME)
 
-            # Place comparison frame in recording / comparison queues
+            # Place comparison frame in recording / comparison queues. The
+            # compare threads also get its capture time, so splits can be
+            # timed from when the frame was captured, not when it was compared
             for queue in [
-                self._record_queue,
                 self._compare_reset_queue,
                 self._compare_split_queue,
             ]:
                 try:
-                    queue.put_nowait(self.comparison_frame)
+                    queue.put_nowait((self.comparison_frame, captured_at))
                 except Full:
                     pass
 
+            # Read once, since update_frame_export can replace it at any time
+            frame_export = self.frame_export
+            if frame_export is not None:
+                self._publish_frame(frame_export, captured_at)
+
+            # The record queue is always full when nothing is being recorded,
+            # so only count frames dropped while recording
+            recording = self.recording_enabled and settings.get_bool("RECORD_CLIPS")
+            if recording:
+                self._record_wakeup.set()
+            try:
+                self._record_queue.put_nowait(self.comparison_frame)
+            except Full:
+                if recording:
+                    self.record_frames_dropped += 1
+
         self._cap.release()
 
         # Setting these to None tells ui_controller the capture isn't active
+        self.capture_frame = None
         self.comparison_frame = None
-        self.frame_pixmap = None
+        self.ui_frame = None
+        self._mark_changed(Change.FRAME)
+        frame_export = self.frame_export
+        if frame_export is not None:
+            frame_export.clear()
 
         # Kill all other splitter threads if capture goes down
         self.safe_exit_record_thread()
         self.safe_exit_compare_split_thread()
         self.safe_exit_compare_reset_thread()
 
-    def _frame_to_pixmap(self, frame: Optional[numpy.ndarray]) -> QPixmap:
-        """Generate a QPixmap instance from a 3-channel image stored as a numpy
-        array.
+        # No more frames are coming, so write clips that are still waiting for
+        # post-split frames with the frames they have
+        self._flush_pending_clips()
+
+    def _publish_frame(self, frame_export: FrameExport, captured_at: float) -> None:
+        """Write self.comparison_frame and the current match percents to
+        self.frame_export.
+
+        Args:
+            frame_export (FrameExport): self.frame_export, as read by
+                _capture.
+            captured_at (float): When the frame was captured, as a
+                self.clock value.
+        """
+        frame_export.publish(
+            self.comparison_frame,
+            captured_at,
+            self.splits.current_image_index,
+            self.splits.current_loop,
+            (
+                self.match_percent,
+                self.highest_percent,
+                self.match_reset_percent,
+                self.highest_reset_percent,
+            ),
+        )
+
+    def _get_capture_time(self, read_time: float) -> float:
+        """Estimate when the frame that was just read was captured.
+
+        If the backend timestamps its frames (CAP_PROP_POS_MSEC is positive
+        and goes up with each frame), the timestamp is mapped onto
+        self.clock. The offset between the two clocks is the smallest
+        one seen so far -- that is, from the frame that was read the soonest
+        after it was captured -- so frames that sat in the backend's buffer
+        get an earlier time than when they were read. The offset is allowed
+        to creep up by CAPTURE_CLOCK_DRIFT each frame, in case the clocks
+        drift apart.
+
+        Otherwise (most webcams and capture cards on most backends), the
+        frame is assumed to have been captured when read returned.
 
         Args:
-            frame (numpy.ndarray): The source image.
+            read_time (float): When self._cap.read returned, as a self.clock
+                value.
 
         Returns:
-            QPixmap: The converted image. Returns a plain QPixmap instance is
-                frame is None.
+            float: The capture time, as a self.clock value. Never
+            later than read_time.
         """
-        if frame is None:
-            return QPixmap()
-
-        # Use Format_BGR888 because images generated with cv2 are in BGR format
-        frame_img = QImage(frame, frame.shape[1], frame.shape[0], QImage.Format_BGR888)
-        return QPixmap.fromImage(frame_img)
+        pos_msec = self._cap.get(cv2.CAP_PROP_POS_MSEC)
+        if pos_msec <= self._last_pos_msec:
+            # No timestamps, or the stream started over
+            self._last_pos_msec = pos_msec
+            self._capture_clock_offset = None
+            return read_time
+        self._last_pos_msec = pos_msec
+
+        offset = read_time - pos_msec / 1000
+        if self._capture_clock_offset is not None:
+            offset = min(offset, self._capture_clock_offset + CAPTURE_CLOCK_DRIFT)
+        self._capture_clock_offset = offset
+        return min(pos_msec / 1000 + offset, read_time)
 
     def _get_interval(self) -> float:
         """Return the amount of time loops in this class should sleep before
@@ -488,22 +970,22 @@ class Splitter:
         self, frames_this_second: int, frame_counter_start_time: float
     ) -> Tuple[int, float]:
         """Watch _capture's actual FPS count and adjusts self._interval as
-        needed to reach the target framerate. This is needed since using
-        time.sleep, as this method does, always introduces a little bit of
-        drag, but the amount of drag depends on the machine and on the FPS
-        setting the user chooses.
+        needed to reach the target framerate. This is needed since sleeping,
+        as this method does, always introduces a little bit of drag, but the
+        amount of drag depends on the machine and on the FPS setting the user
+        chooses.
 
         Args:
             frames_this_second (int): The amount of frames processed this
                 second so far.
             frame_counter_start_time (float): The exact time, measured by
-                time.perf_counter(), the current second started.
+                self.clock, the current second started.
 
         Returns:
             Tuple[int, float]: The updated frames_this_second and
                 frame_counter_start_time values.
         """
-        if time.perf_counter() - frame_counter_start_time >= 1:
+        if self.clock.now() - frame_counter_start_time >= 1:
 
             # print(frames_this_second)  # For debug
             fps = settings.get_int("FPS")
@@ -521,7 +1003,7 @@ class Splitter:
             # Get new interval and restart the counter
             self._interval = self._get_interval()
             frames_this_second = 0
-            frame_counter_start_time = time.perf_counter()
+            frame_counter_start_time = self.clock.now()
 
         else:
             frames_this_second += 1
@@ -537,10 +1019,10 @@ class Splitter:
         Returns:
             float: The current time after sleeping.
         """
-        current_time = time.perf_counter()
+        current_time = self.clock.now()
         if current_time - start_time < self._interval:
-            time.sleep(self._interval - (current_time - start_time))
-        return time.perf_counter()
+            self.clock.sleep(self._interval - (current_time - start_time))
+        return self.clock.now()
 
     #################################
     #                               #
@@ -549,24 +1031,60 @@ class Splitter:
     #################################
 
     def _record(self) -> None:
-        """Record and save clips of each completed split."""
-        # Wait for recording to become enabled
-        while not (self.recording_enabled and settings.get_bool("RECORD_CLIPS")):
-            time.sleep(0.01)
-            if self._record_thread_finished:
-                return
+        """Record and save clips of each completed split.
+
+        When RECORD_MODE is "around split", use _record_around_split;
+        otherwise, use _record_whole_split. Either method returns early if the
+        recording settings change, in which case recording starts over with
+        the new settings.
+        """
+        while not self._record_thread_finished:
+
+            # Get the encoder process ready before the first frame is sent
+            if settings.get_bool("RECORD_CLIPS"):
+                self.clip_encoder.start()
+
+            # Wait for recording to become enabled. Keep feeding clips that
+            # are waiting for post-split frames in the meantime, since
+            # recording is disabled right after the last split. Otherwise,
+            # sleep until capture_thread sees that recording is enabled (or
+            # safe_exit_record_thread is called).
+            while not (self.recording_enabled and settings.get_bool("RECORD_CLIPS")):
+                if self._record_thread_finished:
+                    return
+                if len(self._pending_clips) > 0:
+                    frame = self._record_queue.get()
+                    if frame is not None:
+                        self._feed_pending_clips(frame)
+                else:
+                    self._record_wakeup.wait()
+                    self._record_wakeup.clear()
+
+            if settings.get_str("RECORD_MODE") == "around split":
+                self._record_around_split()
+            else:
+                self._record_whole_split()
+
+    def _record_whole_split(self) -> None:
+        """Send every frame to self.clip_encoder, then keep the clip if the
+        split was completed, or delete it otherwise.
+
+        Frames are dropped, not queued, if the encoder falls behind, so this
+        thread always keeps up with capture_thread.
+
+        Returns early (deleting the clip) if recording is disabled or the
+        recording settings change.
+        """
+        # Clips from "around split" mode won't get any more frames
+        self._flush_pending_clips()
 
         fps = settings.get_int("FPS")
-        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
         recordings_dir = settings.get_str("LAST_RECORD_DIR")
         timestamp = datetime.now().strftime("%Y_%m_%d-%H_%M_%S")
         output_path = f"{recordings_dir}/{timestamp}.mp4"
-        output = cv2.VideoWriter(
-            output_path,
-            fourcc,
-            fps,
-            (COMPARISON_FRAME_WIDTH, COMPARISON_FRAME_HEIGHT),
-        )
+        stream_id = self.clip_encoder.open_stream(output_path, fps)
+        frames_dropped = 0
+        queue_frames_dropped = self.record_frames_dropped
 
         # Get rid of (potentially very old) images
         self._record_queue = Queue(10)
@@ -577,75 +1095,183 @@ class Splitter:
             # Delete + restart recording if:
             # Recording isn't enabled anymore
             # FPS has changed (messes with saving)
-            # Output path has changed
+            # Output path or recording mode has changed
             if (
                 not (self.recording_enabled and settings.get_bool("RECORD_CLIPS"))
                 or fps != settings.get_int("FPS")
                 or recordings_dir != settings.get_str("LAST_RECORD_DIR")
+                or settings.get_str("RECORD_MODE") == "around split"
             ):
-                self._delete_video(output_path)
-                return self._record()
+                self.clip_encoder.close_stream(stream_id)
+                return
 
             # Save the frame
             frame = self._record_queue.get()
-            if frame is not None:
-                output.write(frame)
+            if frame is not None and not self.clip_encoder.write(stream_id, frame):
+                frames_dropped += 1
 
         # Broken loop caused by normal or pause split / split hotkey on
         # non-dummy split (end recording, don't delete)
         if self.save_recording:
             self.save_recording = False
-            self._rename_video(output_path)
-            self.result_text = "Split recording saved!"
+            # Name the clip now, not when it was opened, so it's named after
+            # the split that was actually completed (e.g. not a dummy split)
+            save_path = f"{recordings_dir}/{self._get_clip_name(timestamp)}"
+            self.clip_encoder.close_stream(stream_id, save_path=save_path)
+            frames_dropped += self.record_frames_dropped - queue_frames_dropped
+            self.result_text = self._get_saved_text(frames_dropped)
+            self._mark_changed(Change.RESULT)
 
         # Broken loop caused by any other split image change, program closing,
         # or anything else (end recording, delete video) except dummy split
         else:
-            self._delete_video(output_path)
+            self.clip_encoder.close_stream(stream_id)
+
+    def _record_around_split(self) -> None:
+        """Keep the last RECORD_PRE_SPLIT_SECS of frames in memory and, when a
+        split is completed, save those frames plus the next
+        RECORD_POST_SPLIT_SECS of frames as a clip.
+
+        Nothing is encoded or written to disk until a split happens, and the
+        memory used is bounded by the size of self._frame_ring (frames are
+        JPEG-compressed if RECORD_COMPRESS_FRAMES is set). The clip is written
+        by self._clip_writer once its post-split frames are collected (see
+        _feed_pending_clips), so this thread never waits on the disk.
+
+        Returns early if recording is disabled or the recording settings
+        change.
+        """
+        fps = settings.get_int("FPS")
+        recordings_dir = settings.get_str("LAST_RECORD_DIR")
+        pre_split_secs = settings.get_float("RECORD_PRE_SPLIT_SECS")
+        post_split_secs = settings.get_float("RECORD_POST_SPLIT_SECS")
+        compress_frames = settings.get_bool("RECORD_COMPRESS_FRAMES")
+        self._frame_ring.configure(
+            max_frames=math.ceil(pre_split_secs * fps),
+            jpeg_quality=JPEG_QUALITY if compress_frames else 0,
+        )
+
+        # Get rid of (potentially very old) images
+        self._record_queue = Queue(10)
+
+        while not self._record_thread_finished:
+
+            # Restart recording if it isn't enabled anymore or any recording
+            # settings have changed
+            if (
+                not (self.recording_enabled and settings.get_bool("RECORD_CLIPS"))
+                or fps != settings.get_int("FPS")
+                or recordings_dir != settings.get_str("LAST_RECORD_DIR")
+                or settings.get_str("RECORD_MODE") != "around split"
+                or pre_split_secs != settings.get_float("RECORD_PRE_SPLIT_SECS")
+                or post_split_secs != settings.get_float("RECORD_POST_SPLIT_SECS")
+                or compress_frames != settings.get_bool("RECORD_COMPRESS_FRAMES")
+            ):
+                return
+
+            frame = self._record_queue.get()
+            if frame is not None:
+                self._frame_ring.append(frame)
+                self._feed_pending_clips(frame)
+
+        # Broken loop caused by normal or pause split / split hotkey on
+        # non-dummy split (save the frames around the split). Otherwise,
+        # there's nothing to delete, since nothing has been written.
+        if self.save_recording:
+            self.save_recording = False
+            timestamp = datetime.now().strftime("%Y_%m_%d-%H_%M_%S")
+            clip = PendingClip(
+                path=f"{recordings_dir}/{self._get_clip_name(timestamp)}",
+                fps=fps,
+                frames=self._frame_ring.snapshot(),
+                frames_left=math.ceil(post_split_secs * fps),
+            )
+            if clip.frames_left == 0:
+                self._clip_writer.write(clip)
+            else:
+                self._pending_clips.append(clip)
+
+    def _feed_pending_clips(self, frame: numpy.ndarray) -> None:
+        """Add a frame to each clip still collecting post-split frames, and
+        send clips that are complete to self._clip_writer.
 
-    def _delete_video(self, video_path: str) -> None:
-        """Delete the video file at video_path.
+        Args:
+            frame (numpy.ndarray): The frame to add.
+        """
+        if len(self._pending_clips) == 0:
+            return
+
+        encoded_frame = self._frame_ring.encode(frame)
+        for clip in list(self._pending_clips):
+            clip.frames.append(encoded_frame)
+            clip.frames_left -= 1
+            if clip.frames_left <= 0:
+                self._pending_clips.remove(clip)
+                self._clip_writer.write(clip)
+
+    def _flush_pending_clips(self) -> None:
+        """Send every clip still collecting post-split frames to
+        self._clip_writer as-is.
+        """
+        while len(self._pending_clips) > 0:
+            self._clip_writer.write(self._pending_clips.pop(0))
 
-        No error is thrown if the video file doesn't exist.
+    def _on_clip_saved(self, clip_path: str) -> None:
+        """Tell ui_controller a clip was saved by self._clip_writer.
 
         Args:
-            video_path (str): Path to the video.
+            clip_path (str): The path to the clip.
         """
-        video = pathlib.Path(video_path)
-        video.unlink(missing_ok=True)
+        self.result_text = self._get_saved_text(0)
+        self._mark_changed(Change.RESULT)
+
+    def _get_saved_text(self, frames_dropped: int) -> str:
+        """Get the result_text shown when a clip is saved.
 
-    def _rename_video(self, current_path: str) -> None:
-        """Place simplified name of split image into the recording name.
+        Includes how long clip_encoder takes to encode a frame and how many of
+        its slots are waiting to be encoded, so users can tell when recording
+        is close to falling behind (which is when frames start being dropped).
+
+        Args:
+            frames_dropped (int): The number of frames dropped from the clip.
+
+        Returns:
+            str: The text.
+        """
+        stats = self.clip_encoder.get_stats()
+        encoder_text = (
+            f"{stats.mean_encode_ms:.1f} ms/frame to encode, "
+            f"{stats.queue_depth}/{stats.slot_count} frames queued"
+        )
+        if frames_dropped > 0:
+            return (
+                f"Split recording saved! ({frames_dropped} frames dropped, "
+                f"{encoder_text})"
+            )
+        return f"Split recording saved! ({encoder_text})"
 
-        We don't put the simplified name into output_path in the first instance
-        because it might not be the name of the actual last split (e.g. if
-        dummy splits are used). The idea is for the clip name to be the same as
-        the name of the actual split name.
+    def _get_clip_name(self, timestamp: str) -> str:
+        """Get the filename of a clip of the current split.
 
         Args:
-            output_path (str): The current name of the video.
+            timestamp (str): When the clip was started.
+
+        Returns:
+            str: The clip's filename, made from the current split's simplified
+            name, its loop (if it loops), and the timestamp.
         """
         # Get simplified name of current split
         current_index = self.splits.current_image_index
         current_split_image = self.splits.list[current_index]
         stripped_name = current_split_image.stripped_name
 
-        # Get timestamp from temporary video name
-        video = pathlib.Path(current_path)
-        timestamp = video.stem
-
         # Get loop and total loops of current split
         loop = self.splits.current_loop
         total_loops = current_split_image.loops
 
-        # Get new video name
         if total_loops == 1:
-            new_name = f"{stripped_name}-{timestamp}.mp4"
-        else:
-            new_name = f"{stripped_name}-loop_{loop}-{timestamp}.mp4"
-
-        # Rename video
-        video.rename(pathlib.Path(video.parent, new_name))
+            return f"{stripped_name}-{timestamp}.mp4"
+        return f"{stripped_name}-loop_{loop}-{timestamp}.mp4"
 
     ########################################
     #                                      #
@@ -663,11 +1289,11 @@ class Splitter:
     def _look_for_split(self) -> bool:
         """Compare each frame from _capture with the current split image.
 
-        The block beginning with "if self.changing_split" is used to let the
-        ui_controller pause and restart this method without killing the thread.
-        Changing the split image while this method is running is probably
-        thread-safe, but it can lead to odd side effects if the flags at the
-        top aren't reset.
+        The block beginning with "if self._changing_splits" is used to let
+        change_splits pause and restart this method without killing the
+        thread. Changing the split image while this method is running is
+        probably thread-safe, but it can lead to odd side effects if the flags
+        at the top aren't reset.
 
         The following flags are used to determine when to return a value:
             match_found: False until one of three conditions is met--
@@ -686,33 +1312,44 @@ class Splitter:
         match_found = False
         self.match_percent = 0
         self.highest_percent = 0
+        self._mark_changed(Change.MATCH)
         self._compare_split_queue = Queue(10)  # Get rid of old images
 
-        while not self._compare_split_thread_finished:
+        while not self._compare_split_thread_finished.is_set():
 
-            # Restart if the current split image is changed mid-run
-            if self.changing_splits:
-                self.waiting_for_split_change = True
-                while self.changing_splits:
-                    time.sleep(0.005)
-                self.waiting_for_split_change = False
+            # Restart if the current split image is changed mid-run. Tell
+            # change_splits I've paused, then sleep until it's done
+            if self._changing_splits:
+                with self._split_change:
+                    self._waiting_for_split_change = True
+                    self._split_change.notify_all()
+                    self._split_change.wait_for(lambda: not self._changing_splits)
+                    self._waiting_for_split_change = False
                 return self._look_for_split()
 
             # Get current image
-            frame = self._compare_split_queue.get()
-            if frame is None:
+            item = self._compare_split_queue.get()
+            if item is None:
                 continue
+            frame, captured_at = item
 
             # Check image against split image
             match_found, above_split_threshold = self._compare_with_split_image(
                 frame, above_split_threshold
             )
             if match_found:
+                self._split_match_time = captured_at
+                self._split_match_percents = (self.match_percent, self.highest_percent)
                 break
 
         # Tell the ui_controller not to display match percents
         self.match_percent = None
         self.highest_percent = None
+        self._mark_changed(Change.MATCH)
+
+        # In case change_splits is waiting for this method to pause
+        with self._split_change:
+            self._split_change.notify_all()
 
         return match_found
 
@@ -743,49 +1380,19 @@ class Splitter:
         )
         if self.match_percent > self.highest_percent:
             self.highest_percent = self.match_percent
+        self._mark_changed(Change.MATCH)
 
-        # Image match is above threshold
-        if (
-            self.match_percent
-            >= self.splits.list[self.splits.current_image_index].threshold
-        ):
-
-            # {b} image -- show that the threshold was met, but no "match" yet
-            if self.splits.list[self.splits.current_image_index].below_flag:
-                return False, True
-
-            # Not a {b} image -- match found
-            else:
-                return True, True
-
-        # {b} image -- we are below the threshold now and the threshold has
-        # previously been met. It's a match
-        elif above_split_threshold:
-            return True, True
-
-        # Threshold never met
-        return False, False
+        return check_match(
+            self.match_percent,
+            self.splits.list[self.splits.current_image_index],
+            above_split_threshold,
+        )
 
     def _get_match_percent(
         self, curr_frame: numpy.ndarray, template: SplitDir._SplitImage
     ) -> float:
-        """Get the percent likelihood that two images are the same.
-
-        I do this by calculating the Euclidean distance between the two images.
-        Euclidean distance is calculated by summing the squares of the value
-        differences of each pixel in each channel when comparing two images of
-        the same size, then taking the square root of that sum. For more
-        information, see, e.g., https://en.wikipedia.org/wiki/Euclidean_distance.
-
-        Fortunately, cv2.norm provides an easy way to do this by passing in
-        normType=cv2.NORM_L2. In images with transparency, a mask must be
-        supplied also which tells cv2.norm which pixels matter and which should
-        be ignored.
-
-        To generate a match value between 0 and 1, you need to normalize the
-        result. This can be done by dividing the result by the largest possible
-        Euclidean distance for the given image. Details on this are provided in
-        split_dir.py's documentation.
+        """Get the percent likelihood that two images are the same (see
+        get_match_percent).
 
         Args:
             frame (numpy.ndarray): The current comparison frame from the video
@@ -794,23 +1401,24 @@ class Splitter:
                 against.
 
         Returns:
-            float: The percent likelihood that the template image and the frame
-                are the same image, expressed as a float between 0 and 1.
+            float: The match percent, between 0 and 1.
         """
-        euclidean_dist = cv2.norm(
-            src1=template.image,
-            src2=curr_frame,
-            normType=cv2.NORM_L2,
-            mask=template.mask,
-        )
-        return 1 - euclidean_dist / template.max_dist
+        return get_match_percent(curr_frame, template)
 
     def _split(self) -> bool:
         """Handle the events immediately before, during, and after a split.
 
-        The various flags set by this method are read by ui_controller, which
-        references them to update the UI and send hotkey presses. Flags for
-        _record are also set.
+        The hotkey for the split is pressed by self.action_dispatcher as soon
+        as the split is decided on. The various flags set by this method are
+        read by ui_controller, which references them to update the UI and move
+        to the next split image. Flags for _record are also set.
+
+        The split happens when the matching frame was captured (plus its
+        delay, if it has one), not when it was compared. The delay counts down
+        from the capture time, and the dispatcher is told when the split
+        happened, so the time spent queueing and comparing the frame doesn't
+        add to the split's time, and the latency it reports covers the whole
+        pipeline.
 
         Returns:
             bool: True if the thread wasn't killed / if this isn't the last
@@ -822,30 +1430,22 @@ class Splitter:
         loop = self.splits.current_loop
         index = self.splits.current_image_index
         split_image = self.splits.list[index]
+        split_time = self._split_match_time
 
-        # Handle delay
+        # Handle delay. The deadline is set once, so if the user changes
+        # default delay in settings during this method, the delay remaining
+        # for this split doesn't change. Killing the thread ends the wait
+        # right away. The same thing is done in the pause_duration block below.
         if split_image.delay_duration > 0:
-            # Save total_delay because if the user changes default delay in
-            # settings during this method, we don't want the delay remaining
-            # for this split to change
-            self.split_delay_remaining = total_delay = split_image.delay_duration
-            start_time = time.perf_counter()
-
-            # Poll periodically, both to update self.split_delay_remaining,
-            # which is read by ui_controller, and also to allow the user to
-            # kill the thread. The same thing is done in the suspend_duration
-            # block below.
-            while (
-                time.perf_counter() - start_time < total_delay
-                and not self._compare_split_thread_finished
-            ):
-                self.split_delay_remaining = total_delay - (
-                    time.perf_counter() - start_time
-                )
-                time.sleep(0.01)
-            self.split_delay_remaining = None
+            self._split_delay_timer.start(split_image.delay_duration, split_time)
+            split_time += split_image.delay_duration
+            self._mark_changed(Change.COUNTDOWN)
+            delay_finished = self._split_delay_timer.wait(
+                self._compare_split_thread_finished
+            )
+            self._mark_changed(Change.COUNTDOWN)
 
-            if self._compare_split_thread_finished:
+            if not delay_finished:
                 return False
 
         # Set split flag
@@ -853,13 +1453,16 @@ class Splitter:
         self.dummy_split_action = False
         self.normal_split_action = False
 
+        event = get_split_event(split_image)
+
         # Pause split; make sure recording is saved
-        if split_image.pause_flag:
+        if event == RunEvent.PAUSE_SPLIT:
             self.save_recording = True
             self.pause_split_action = True
+            self.action_dispatcher.dispatch(SplitAction.PAUSE, split_time)
 
         # Dummy split; make sure recording doesn't stop
-        elif split_image.dummy_flag:
+        elif event == RunEvent.DUMMY_SPLIT:
             self.continue_recording = True
             self.dummy_split_action = True
 
@@ -867,9 +1470,27 @@ class Splitter:
         else:
             self.save_recording = True
             self.normal_split_action = True
+            self.action_dispatcher.dispatch(SplitAction.SPLIT, split_time)
+        self._mark_changed(Change.ACTION)
+
+        # Read once, since update_run_history can replace it at any time
+        run_history = self.run_history
+        if run_history is not None:
+            run_history.record(
+                event,
+                split_time,
+                self.splits.dir_path,
+                index,
+                split_image.name,
+                loop,
+                *self._split_match_percents,
+                split_image.threshold,
+                split_image.delay_duration,
+                split_image.pause_duration,
+            )
 
         # Don't pause splitter after very last split, just exit
-        if index == len(self.splits.list) - 1 and loop == split_image.loops:
+        if is_last_split(split_image, index, loop, self.splits.get_last_index()):
 
             # Wait for main thread to kill record_thread before returning.
             # Do this, because if this thread exits before ui_controller calls
@@ -878,30 +1499,22 @@ class Splitter:
             # The quick and dirty workaround is to prevent this thread from
             # exiting if recordings are active AND a save or continue flag has
             # been set. Once record_thread exits, those flags, if previously
-            # set, will have been unset, terminating this loop.
+            # set, will have been unset, terminating this loop. (join returns
+            # as soon as record_thread exits; the timeout is for the continue
+            # flag, which ui_controller unsets without killing the thread.)
             while self.record_thread.is_alive() and (
                 self.save_recording or self.continue_recording
             ):
-                time.sleep(0.01)
+                self.record_thread.join(0.05)
 
             return False
 
         # Handle post-split pause
         elif split_image.pause_duration > 0:
-            # Save total_suspend because if the user changes default suspend in
-            # settings during this method, we don't want the suspend remaining
-            # for this split to change
-            self.suspend_remaining = total_suspend = split_image.pause_duration
-            start_time = time.perf_counter()
-            while (
-                time.perf_counter() - start_time < total_suspend
-                and not self._compare_split_thread_finished
-            ):
-                self.suspend_remaining = total_suspend - (
-                    time.perf_counter() - start_time
-                )
-                time.sleep(0.01)
-            self.suspend_remaining = None
+            self._suspend_timer.start(split_image.pause_duration)
+            self._mark_changed(Change.COUNTDOWN)
+            self._suspend_timer.wait(self._compare_split_thread_finished)
+            self._mark_changed(Change.COUNTDOWN)
 
         return True
 
@@ -935,6 +1548,7 @@ class Splitter:
         # Don't display match percents yet
         self.match_reset_percent = None
         self.highest_reset_percent = None
+        self._mark_changed(Change.MATCH)
 
         # Handle special cases (first + second splits)
         if not self._handle_compare_reset_special_cases():
@@ -943,41 +1557,54 @@ class Splitter:
         # Start displaying match percents
         self.match_reset_percent = 0
         self.highest_reset_percent = 0
+        self._mark_changed(Change.MATCH)
         self._compare_reset_queue = Queue(10)  # Get rid of old images
         above_reset_threshold = False
         match_found = False
 
         # Start comparing video with reset image
-        while not self._compare_reset_thread_finished:
+        while not self._compare_reset_thread_finished.is_set():
 
             # Restart method if we're back to first split and loop
-            # (e.g. if user hit back button)
-            if self.splits.current_image_index == 0 and self.splits.current_loop == 1:
+            # (e.g. if user hit back button), or if the split set was switched
+            # to one without a reset image
+            if (
+                self.splits.current_image_index == 0 and self.splits.current_loop == 1
+            ) or self.splits.reset_image is None:
                 return self._look_for_reset()
 
             # Get current image
-            frame = self._compare_reset_queue.get()
-            if frame is None:
+            item = self._compare_reset_queue.get()
+            if item is None:
                 continue
+            frame, captured_at = item
 
             # Check image against reset image
             match_found, above_reset_threshold = self._compare_with_reset_image(
                 frame, above_reset_threshold
             )
             if match_found:
+                self._reset_match_time = captured_at
+                self._reset_match_percents = (
+                    self.match_reset_percent,
+                    self.highest_reset_percent,
+                )
                 break
 
         # Tell ui_controller not to display match percents
         self.match_reset_percent = None
         self.highest_reset_percent = None
+        self._mark_changed(Change.MATCH)
 
         return match_found
 
     def _handle_compare_reset_special_cases(self) -> bool:
         """Handle special cases for compare_reset (first and second splits).
 
-        Wait while on the first split (no comparisons). On the second split,
-        we wait reset_wait_duration before beginning comparisons.
+        Wait while on the first split (no comparisons), and while the current
+        split set has no reset image (see ui_controller._request_split_set). On
+        the second split, we wait reset_wait_duration before beginning
+        comparisons.
 
         One benefit of handling this before we set the match_percents to 0 in
         compare_reset is that the match percents don't flicker on, then off,
@@ -987,44 +1614,41 @@ class Splitter:
         Returns:
             bool: True if the thread has been killed externally, False otherwise.
         """
-        # Don't look for reset image on first split
-        while (
-            self.splits.current_image_index == 0
-            and self.splits.current_loop == 1
-            and not self._compare_reset_thread_finished
-        ):
-            time.sleep(0.01)
-
-        # Get no. of loops of first split
-        try:
-            first_split_loop_count = self.splits.list[0].loops
+        # Don't look for reset image on first split, or if there isn't one.
+        # Sleep until change_splits or safe_exit_compare_reset_thread says
+        # something changed (checking every second anyway, in case the split
+        # images are changed some other way)
+        with self._split_change:
+            while (
+                self.splits.current_image_index == 0
+                and self.splits.current_loop == 1
+                or self.splits.reset_image is None
+            ) and not self._compare_reset_thread_finished.is_set():
+                self._split_change.wait(1)
 
         # If there is no first split, kill thread
-        except IndexError:
+        if len(self.splits.list) == 0:
             return False
 
-        # Set conditions for current split being the second split
-        if first_split_loop_count == 1:
-            is_second_split = (
-                self.splits.current_image_index == 1 and self.splits.current_loop == 1
-            )
-        else:
-            is_second_split = (
-                self.splits.current_image_index == 0 and self.splits.current_loop == 2
-            )
-
         # Wait reset image's reset_wait_duration if this is the second split
-        if is_second_split:
+        # (or until the thread is killed)
+        if (
+            is_second_split(
+                self.splits.list,
+                self.splits.current_image_index,
+                self.splits.current_loop,
+            )
+            and self.splits.reset_image is not None
+        ):
             reset_wait = self.splits.reset_image.reset_wait_duration
-            start_time = time.perf_counter()
-            while (
-                time.perf_counter() - start_time < reset_wait
-                and not self._compare_reset_thread_finished
-            ):
-                time.sleep(0.01)
+            wait_until(
+                self.clock.now() + reset_wait,
+                self._compare_reset_thread_finished,
+                self.clock,
+            )
 
         # Return True if thread should continue (ie it's not finished)
-        return not self._compare_reset_thread_finished
+        return not self._compare_reset_thread_finished.is_set()
 
     def _compare_with_reset_image(
         self, frame: numpy.ndarray, above_reset_threshold: bool
@@ -1048,61 +1672,79 @@ class Splitter:
                 wait until frames fall below the matching threshold before
                 returning true for match_found (this is a {b} flag scenario).
         """
-        # See _compare_with_split_image for comments -- logic is basically same
-        self.match_reset_percent = self._get_match_percent(
-            frame, self.splits.reset_image
-        )
+        # Keep a reference, since the split set can be switched mid-method
+        reset_image = self.splits.reset_image
+        if reset_image is None:
+            return False, False
+
+        self.match_reset_percent = self._get_match_percent(frame, reset_image)
         if self.match_reset_percent > self.highest_reset_percent:
             self.highest_reset_percent = self.match_reset_percent
+        self._mark_changed(Change.MATCH)
 
-        if self.match_reset_percent >= self.splits.reset_image.threshold:
-            if self.splits.reset_image.below_flag:
-                return False, True
-            else:
-                return True, False
-
-        elif above_reset_threshold:
-            return True, True
-
-        return False, False
+        return check_match(self.match_reset_percent, reset_image, above_reset_threshold)
 
     def _reset(self) -> None:
         """Handle the events immediately before, during, and after a reset.
 
-        The various flags set by this method are read by ui_controller, which
-        references them to update the UI and send hotkey presses.
+        The reset hotkey is pressed by self.action_dispatcher. The various
+        flags set by this method are read by ui_controller, which references
+        them to update the UI and reset the split images. Like in _split, the
+        reset is timed from when the matching frame was captured.
         """
         # Kill compare_split_thread so that if there's a split currently
         # delaying, the reset image takes precedence
         self.safe_exit_compare_split_thread()
 
-        # Handle delay
+        # Handle delay (see _split)
         reset_image = self.splits.reset_image
+        reset_time = self._reset_match_time
         if reset_image.delay_duration > 0:
-            # Save total_delay because if the user changes default delay in
-            # settings during this method, we don't want the delay remaining
-            # to actually change until we're done here
-            total_delay = reset_image.delay_duration
-            self.reset_delay_remaining = total_delay
-            start_time = time.perf_counter()
-
-            # Poll periodically, both to update self.reset_delay_remaining,
-            # which is read by ui_controller, and also to allow the user to
-            # kill the thread. The same thing is done in the suspend_duration
-            # block below.
-            while (
-                time.perf_counter() - start_time < total_delay
-                and not self._compare_reset_thread_finished
-            ):
-                self.reset_delay_remaining = total_delay - (
-                    time.perf_counter() - start_time
-                )
-                time.sleep(0.01)
-            self.reset_delay_remaining = None
+            self._reset_delay_timer.start(reset_image.delay_duration, reset_time)
+            reset_time += reset_image.delay_duration
+            self._mark_changed(Change.COUNTDOWN)
+            delay_finished = self._reset_delay_timer.wait(
+                self._compare_reset_thread_finished
+            )
+            self._mark_changed(Change.COUNTDOWN)
 
             # Cancel reset if killing thread early
-            if self._compare_reset_thread_finished:
+            if not delay_finished:
                 return
 
         # Handle reset
         self.reset_split_action = True
+        self.action_dispatcher.dispatch(SplitAction.RESET, reset_time)
+        self._mark_changed(Change.ACTION)
+
+        # Read once, since update_run_history can replace it at any time
+        run_history = self.run_history
+        if run_history is not None:
+            run_history.record(
+                RunEvent.RESET,
+                reset_time,
+                self.splits.dir_path,
+                self.splits.current_image_index,
+                reset_image.name,
+                self.splits.current_loop,
+                *self._reset_match_percents,
+                reset_image.threshold,
+                reset_image.delay_duration,
+            )
+
+    ##########################
+    #                        #
+    # Private Helper Methods #
+    #                        #
+    ##########################
+
+    def _mark_changed(self, change: int) -> None:
+        """Record that some state ui_controller displays has changed.
+
+        Args:
+            change (int): The Change flag for the kind of state that changed.
+        """
+        with self._changes_lock:
+            self._changes |= change
+            if change & self._awaited_changes:
+                self._changes_condition.notify_all()
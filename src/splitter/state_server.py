@@ -0,0 +1,422 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Share the splitter's state with other programs on this machine.
+
+Overlays and other tools can connect to a StateServer over TCP and get a
+stream of JSON objects, one per line:
+    - {"type": "state", ...}: The current split image, loop, match percents,
+      and countdowns (see get_splitter_state). Sent when a client connects,
+      then whenever the state changes, at most STATE_SERVER_RATE_HZ times per
+      second.
+    - {"type": "event", "event": ..., "split_name": ..., "time": ...}: A split
+      action (see post_event), sent at the next update. time is a Unix
+      timestamp.
+    - {"type": "error", "message": ...}: A command wasn't understood.
+
+Clients can send commands the same way, either as JSON
+({"command": "split"}) or as a bare word ("split"). The commands are in
+COMMANDS, and are carried out by whatever owns the server (see get_commands),
+the same way as the matching hotkeys.
+
+Everything happens on the server's own thread: the state is read from the
+splitter (without locking anything), turned into JSON once per update, and
+written to every client without blocking. A client that isn't keeping up
+only gets the newest state when it's ready for more, instead of every state
+it missed, and is disconnected if its unsent events pile up past
+MAX_CLIENT_BUFFER bytes. Nothing here ever makes the splitter's threads wait.
+"""
+
+
+import json
+import queue
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+# The commands clients can send
+COMMANDS = ("split", "undo", "skip", "reset", "pause")
+
+# Only accept connections from this machine
+HOST = "127.0.0.1"
+
+# Unsent bytes (per client) allowed before a client is disconnected
+MAX_CLIENT_BUFFER = 1024 * 1024
+
+# Longest command line accepted from a client, in bytes
+MAX_COMMAND_LENGTH = 1024
+
+
+def get_splitter_state(splitter) -> Dict:
+    """Read the state clients are sent from a Splitter.
+
+    Safe to call from any thread. The values are read one at a time without
+    locking, so they can be a frame apart, which doesn't matter for display.
+
+    Args:
+        splitter (Splitter): The splitter.
+
+    Returns:
+        Dict: The state. Percents are between 0 and 1, and times are in
+        seconds. Values that don't apply right now (e.g. match_percent when
+        splits aren't being compared) are None.
+    """
+    splits = splitter.splits
+    split_list = splits.list
+    split_index = splits.current_image_index
+    split_image = None
+    if split_index is not None and split_index < len(split_list):
+        split_image = split_list[split_index]
+    reset_image = splits.reset_image
+
+    return {
+        "type": "state",
+        "split_dir": splits.dir_path,
+        "split_count": len(split_list),
+        "split_index": split_index,
+        "split_name": None if split_image is None else split_image.name,
+        "loop": splits.current_loop,
+        "loops": None if split_image is None else split_image.loops,
+        "match_percent": _round(splitter.match_percent),
+        "highest_percent": _round(splitter.highest_percent),
+        "threshold": None if split_image is None else split_image.threshold,
+        "reset_percent": _round(splitter.match_reset_percent),
+        "highest_reset_percent": _round(splitter.highest_reset_percent),
+        "reset_threshold": None if reset_image is None else reset_image.threshold,
+        "split_delay_remaining": _round(splitter.split_delay_remaining),
+        "suspend_remaining": _round(splitter.suspend_remaining),
+        "reset_delay_remaining": _round(splitter.reset_delay_remaining),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    """Round a value sent to clients, so tiny changes aren't sent as new
+    states.
+
+    Args:
+        value (float | None): The value.
+
+    Returns:
+        float | None: The value to 4 decimal places, or None.
+    """
+    return None if value is None else round(value, 4)
+
+
+class StateServer:
+    """Send state and events to local clients, and take commands from them.
+
+    Attributes:
+        port (int): The port the server listens on.
+        rate_hz (float): The most updates sent per second.
+    """
+
+    def __init__(
+        self, get_state: Callable[[], Dict], port: int, rate_hz: float
+    ) -> None:
+        """Set up the server. It isn't started until start is called.
+
+        Args:
+            get_state (Callable[[], Dict]): Returns the current state (e.g.
+                get_splitter_state). Called on the server's thread.
+            port (int): The port to listen on.
+            rate_hz (float): The most updates sent per second.
+        """
+        self.port = port
+        self.rate_hz = rate_hz
+        self._get_state = get_state
+        self._events = deque()
+        self._commands = queue.SimpleQueue()
+        self._listener = None
+        self._selector = None
+        self._clients = {}
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._serve)
+
+    def start(self) -> bool:
+        """Start listening for clients on a new thread.
+
+        Returns:
+            bool: True if the server started, False if the port couldn't be
+            used (e.g. it's taken by another program).
+        """
+        try:
+            self._listener = socket.create_server((HOST, self.port))
+        except OSError:
+            return False
+        self._listener.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 1) -> None:
+        """Disconnect every client and stop listening.
+
+        Args:
+            timeout (float): The longest to wait for the thread, in seconds.
+                Default is 1.
+        """
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def post_event(self, event: str, split_name: Optional[str] = None) -> None:
+        """Send an event to every client at the next update.
+
+        Returns right away, so it's safe to call from any thread.
+
+        Args:
+            event (str): What happened, e.g. "split" or "reset".
+            split_name (str | None): The split image it happened on, if any.
+                Default is None.
+        """
+        self._events.append((event, split_name, time.time()))
+
+    def get_commands(self) -> List[str]:
+        """Get the commands sent by clients since the last call.
+
+        Returns:
+            List[str]: The commands (each one is in COMMANDS), oldest first.
+        """
+        commands = []
+        while not self._commands.empty():
+            commands.append(self._commands.get())
+        return commands
+
+    def get_client_count(self) -> int:
+        """Get how many clients are connected.
+
+        Returns:
+            int: The number of clients.
+        """
+        return len(self._clients)
+
+    def _serve(self) -> None:
+        """Accept clients, read their commands, and send them updates until
+        stop is called."""
+        interval = 1 / max(self.rate_hz, 0.1)
+        next_update = time.perf_counter()
+        last_state = None
+        try:
+            while not self._stop_event.is_set():
+                for key, mask in self._selector.select(
+                    max(next_update - time.perf_counter(), 0)
+                ):
+                    if key.fileobj is self._listener:
+                        self._accept()
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        self._read(key.fileobj)
+                    if mask & selectors.EVENT_WRITE:
+                        self._write(key.fileobj)
+
+                if time.perf_counter() < next_update:
+                    continue
+                next_update += interval
+                # Don't try to catch up on updates missed while the thread
+                # wasn't running
+                next_update = max(next_update, time.perf_counter())
+
+                state = self._get_state()
+                if state != last_state:
+                    last_state = state
+                    state_line = self._encode(state)
+                    for client in self._clients.values():
+                        # Replaces any state the client hasn't been sent yet
+                        client.state_line = state_line
+
+                event_lines = []
+                while self._events:
+                    event, split_name, happened_at = self._events.popleft()
+                    event_lines.append(
+                        self._encode(
+                            {
+                                "type": "event",
+                                "event": event,
+                                "split_name": split_name,
+                                "time": happened_at,
+                            }
+                        )
+                    )
+                for client_socket, client in list(self._clients.items()):
+                    client.out_buffer += b"".join(event_lines)
+                    self._write(client_socket)
+        finally:
+            for client_socket in list(self._clients):
+                self._disconnect(client_socket)
+            self._selector.close()
+            self._listener.close()
+
+    def _accept(self) -> None:
+        """Accept a new client, and send it the current state."""
+        try:
+            client_socket, _ = self._listener.accept()
+        except OSError:
+            return
+        client_socket.setblocking(False)
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = _Client()
+        client.state_line = self._encode(self._get_state())
+        self._clients[client_socket] = client
+        self._selector.register(client_socket, selectors.EVENT_READ)
+
+    def _read(self, client_socket: socket.socket) -> None:
+        """Read a client's commands.
+
+        Args:
+            client_socket (socket.socket): The client's socket.
+        """
+        client = self._clients[client_socket]
+        try:
+            data = client_socket.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._disconnect(client_socket)
+            return
+
+        client.in_buffer += data
+        *lines, client.in_buffer = client.in_buffer.split(b"\n")
+        if len(client.in_buffer) > MAX_COMMAND_LENGTH:
+            self._disconnect(client_socket)
+            return
+        for line in lines:
+            command = self._parse_command(line)
+            if command in COMMANDS:
+                self._commands.put(command)
+            elif command is not None:
+                client.out_buffer += self._encode(
+                    {"type": "error", "message": f"Unknown command: {command}"}
+                )
+
+    def _write(self, client_socket: socket.socket) -> None:
+        """Send a client as much of its unsent data as it can take.
+
+        If all of its events have been sent, its latest state is sent too.
+        Otherwise, the state waits, and may be replaced by a newer one before
+        it's sent.
+
+        Args:
+            client_socket (socket.socket): The client's socket.
+        """
+        client = self._clients.get(client_socket)
+        if client is None:
+            return
+        if not client.out_buffer and client.state_line is not None:
+            client.out_buffer += client.state_line
+            client.state_line = None
+
+        if client.out_buffer:
+            try:
+                sent = client_socket.send(client.out_buffer)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                self._disconnect(client_socket)
+                return
+            del client.out_buffer[:sent]
+
+        if len(client.out_buffer) > MAX_CLIENT_BUFFER:
+            self._disconnect(client_socket)
+            return
+        # Only ask to be told when the client can take more if there's more
+        # to send
+        events = selectors.EVENT_READ
+        if client.out_buffer or client.state_line is not None:
+            events |= selectors.EVENT_WRITE
+        self._selector.modify(client_socket, events)
+
+    def _disconnect(self, client_socket: socket.socket) -> None:
+        """Forget a client and close its socket.
+
+        Args:
+            client_socket (socket.socket): The client's socket.
+        """
+        self._clients.pop(client_socket, None)
+        try:
+            self._selector.unregister(client_socket)
+        except (KeyError, ValueError):
+            pass
+        client_socket.close()
+
+    def _parse_command(self, line: bytes) -> Optional[str]:
+        """Get the command from a line sent by a client.
+
+        Args:
+            line (bytes): The line, as JSON or a bare word.
+
+        Returns:
+            str | None: The command (which might not be valid), or None if the
+            line is blank.
+        """
+        text = line.decode("utf-8", errors="replace").strip()
+        if not text:
+            return None
+        if text.startswith("{"):
+            try:
+                return str(json.loads(text).get("command"))
+            except (ValueError, AttributeError):
+                return text
+        return text.lower()
+
+    def _encode(self, message: Dict) -> bytes:
+        """Turn a message into a line of JSON.
+
+        Args:
+            message (Dict): The message.
+
+        Returns:
+            bytes: The line, ending in a newline.
+        """
+        return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class _Client:
+    """What StateServer keeps track of for each client.
+
+    Attributes:
+        in_buffer (bytes): Data read that isn't a whole line yet.
+        out_buffer (bytearray): Data waiting to be sent.
+        state_line (bytes | None): The newest state, waiting until out_buffer
+            is empty to be sent, or None if it's been sent.
+    """
+
+    def __init__(self) -> None:
+        self.in_buffer = b""
+        self.out_buffer = bytearray()
+        self.state_line = None
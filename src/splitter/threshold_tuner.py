@@ -0,0 +1,494 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Suggest split image thresholds by running a recorded video through them.
+
+Every frame of the video is compared with every split image (and the reset
+image, if there is one), the same way the splitter compares them (see
+splitter.get_match_percent), giving each image a match percent curve over the
+whole video. The video is cut into chunks by time, which are compared on
+separate processes, so this runs on every core. Seeking in most videos (e.g.
+H.264 from OBS) only lands near the requested frame, so each chunk starts
+reading a little early and keeps the frames whose decoded timestamps fall
+inside it. That way no frame is compared twice or skipped, and each frame's
+time comes from the video rather than its index.
+
+Each image's threshold is then suggested from its curve: the highest match
+(where the image should split) is compared with the highest match anywhere
+else in the video (which should never split), and the threshold goes halfway
+between them. Images whose two highs are within twice the safety margin of
+each other are flagged, since no threshold separates them reliably. Every
+image is compared with the whole video, not only the part where the splitter
+would be looking for it, so an image that also matches earlier in the run
+(or that's looped) is flagged even if it would split fine in practice. The
+report shows where each high is, so these can be checked by eye.
+
+Results are written to the output directory:
+    - curves.npz: The curves (one row per image), the time of each frame
+      (in seconds), the image names, and their current and suggested
+      thresholds.
+    - report.html: A plot of each curve, with the current and suggested
+      thresholds, that can be opened in any browser.
+
+Usage (run from the src directory):
+    python -m splitter.threshold_tuner <video> <split image dir> [-o DIR]
+        [--workers N] [--margin M] [--window SECS]
+"""
+
+
+import argparse
+import html
+import math
+import os
+import types
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy
+
+from settings import COMPARISON_FRAME_HEIGHT, COMPARISON_FRAME_WIDTH
+from splitter.split_dir import SplitDir
+from splitter.splitter import get_match_percent
+
+# How much room (as a match percent) to leave between a threshold and the
+# matches on either side of it
+DEFAULT_MARGIN = 0.02
+# How far (in seconds) from an image's best match other frames are still
+# counted as part of that match
+DEFAULT_WINDOW_SECS = 2.0
+# Chunks per worker, so workers that finish early can take more work
+CHUNKS_PER_WORKER = 4
+# How far (in seconds) before a chunk to seek at first. Doubled until the
+# seek lands before the chunk
+SEEK_BACK_SECS = 1.0
+# The most points plotted per curve in the report
+PLOT_POINTS = 2000
+
+# Set in each worker process by _init_worker
+_templates = None
+
+
+class Suggestion:
+    """A suggested threshold for one image.
+
+    Attributes:
+        background (float): The highest match percent outside the window
+            around the peak.
+        name (str): The image's filename, without extension.
+        ok (bool): Whether the peak and background are far enough apart to
+            separate reliably.
+        peak (float): The highest match percent.
+        peak_time (float): When the peak happened, in seconds.
+        threshold (float): The suggested threshold.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: float,
+        peak: float,
+        peak_time: float,
+        background: float,
+        ok: bool,
+    ) -> None:
+        """Initialize a suggestion.
+
+        Args:
+            name (str): The image's filename, without extension.
+            threshold (float): The suggested threshold.
+            peak (float): The highest match percent.
+            peak_time (float): When the peak happened, in seconds.
+            background (float): The highest match percent outside the window
+                around the peak.
+            ok (bool): Whether the peak and background are far enough apart
+                to separate reliably.
+        """
+        self.name = name
+        self.threshold = threshold
+        self.peak = peak
+        self.peak_time = peak_time
+        self.background = background
+        self.ok = ok
+
+
+def load_images(dir_path: str) -> List[SplitDir._SplitImage]:
+    """Load the split images (and reset image) in a directory.
+
+    Args:
+        dir_path (str): The split image directory.
+
+    Returns:
+        List[SplitDir._SplitImage]: The split images, then the reset image if
+        there is one.
+    """
+    splits = SplitDir(dir_path, make_pixmaps=False)
+    splits.wait_for_loading()
+    images = list(splits.list)
+    if splits.reset_image is not None:
+        images.append(splits.reset_image)
+    return images
+
+
+def compute_curves(
+    video_path: str, images: List[SplitDir._SplitImage], workers: Optional[int] = None
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Get the match percent of every frame of a video with every image.
+
+    Args:
+        video_path (str): The video.
+        images (List[SplitDir._SplitImage]): The images.
+        workers (int | None): How many processes to use. If None, use one per
+            core. Default is None.
+
+    Raises:
+        OSError: The video couldn't be opened, or no frames could be read
+            from it.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: The match percents (one row per
+        image, one column per frame) and the time of each frame, in seconds.
+    """
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise OSError(f"Couldn't open {video_path}")
+    frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = capture.get(cv2.CAP_PROP_FPS) or 60.0
+    capture.release()
+
+    workers = workers or os.cpu_count() or 1
+    if frame_count <= 0:
+        # The frame count isn't known, so read the whole video in one go
+        boundaries = []
+    else:
+        # The frame count is only an estimate in many videos, so the last
+        # chunk reads to the end. Boundaries go halfway between frames, so
+        # small timestamp errors don't move a frame into the wrong chunk
+        chunk_size = math.ceil(frame_count / (workers * CHUNKS_PER_WORKER))
+        boundaries = [
+            (start - 0.5) / fps for start in range(chunk_size, frame_count, chunk_size)
+        ]
+    chunks = list(zip([0.0] + boundaries, boundaries + [None]))
+
+    # Only send the workers what get_match_percent uses
+    templates = [(image.image, image.mask, image.max_dist) for image in images]
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(templates,)
+    ) as executor:
+        results = executor.map(
+            _compute_chunk,
+            [video_path] * len(chunks),
+            [start for start, _ in chunks],
+            [stop for _, stop in chunks],
+        )
+        curves, times = zip(*results)
+    times = numpy.concatenate(times)
+    if times.size == 0:
+        raise OSError(f"Couldn't read any frames from {video_path}")
+    return numpy.concatenate(curves, axis=1), times
+
+
+def suggest_threshold(
+    name: str,
+    curve: numpy.ndarray,
+    times: numpy.ndarray,
+    margin: float = DEFAULT_MARGIN,
+    window_secs: float = DEFAULT_WINDOW_SECS,
+) -> Suggestion:
+    """Suggest a threshold for an image from its match percent curve (see
+    the module docstring).
+
+    Args:
+        name (str): The image's name.
+        curve (numpy.ndarray): The image's match percent for each frame.
+        times (numpy.ndarray): The time of each frame, in seconds.
+        margin (float): The room to leave on either side of the threshold.
+            Default is DEFAULT_MARGIN.
+        window_secs (float): How far from the peak frames still count as
+            part of it. Default is DEFAULT_WINDOW_SECS.
+
+    Returns:
+        Suggestion: The suggestion.
+    """
+    peak_index = int(numpy.argmax(curve))
+    peak = float(curve[peak_index])
+    peak_time = float(times[peak_index])
+    outside = curve[numpy.abs(times - peak_time) > window_secs]
+    background = float(outside.max()) if outside.size > 0 else 0.0
+
+    ok = peak - background >= 2 * margin
+    if ok:
+        threshold = (peak + background) / 2
+    else:
+        threshold = peak - margin
+    return Suggestion(name, round(threshold, 3), peak, peak_time, background, ok)
+
+
+def write_report(
+    out_dir: str,
+    images: List[SplitDir._SplitImage],
+    curves: numpy.ndarray,
+    times: numpy.ndarray,
+    suggestions: List[Suggestion],
+) -> None:
+    """Write curves.npz and report.html (see the module docstring).
+
+    Args:
+        out_dir (str): The directory to write to. Created if it doesn't
+            exist.
+        images (List[SplitDir._SplitImage]): The images.
+        curves (numpy.ndarray): Their match percent curves.
+        times (numpy.ndarray): The time of each frame, in seconds.
+        suggestions (List[Suggestion]): The suggested thresholds.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    numpy.savez_compressed(
+        os.path.join(out_dir, "curves.npz"),
+        curves=curves,
+        times=times,
+        names=numpy.array([image.name for image in images]),
+        thresholds=numpy.array([image.threshold for image in images]),
+        suggested_thresholds=numpy.array([s.threshold for s in suggestions]),
+    )
+
+    duration = float(times[-1]) if times.size > 0 else 0.0
+    sections = []
+    for image, curve, suggestion in zip(images, curves, suggestions):
+        status = "ok" if suggestion.ok else "check this image"
+        sections.append(
+            f"<h2>{html.escape(image.name)}</h2>"
+            f"<p>Current threshold {image.threshold:.3f}, suggested "
+            f"({suggestion.threshold:.3f}). Best match {suggestion.peak:.3f} at "
+            f"{suggestion.peak_time:.2f} s, best match elsewhere "
+            f"{suggestion.background:.3f} ({status}).</p>"
+            + _plot(curve, duration, image.threshold, suggestion.threshold)
+        )
+    with open(os.path.join(out_dir, "report.html"), "w", encoding="utf-8") as report:
+        report.write(
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            "<title>Threshold report</title><style>body{font-family:sans-serif}"
+            "svg{background:#f8f8f8}</style></head><body>"
+            "<h1>Threshold report</h1><p>Blue: match percent. Gray: current "
+            "threshold. Green: suggested threshold.</p>"
+            + "".join(sections)
+            + "</body></html>"
+        )
+
+
+def _plot(
+    curve: numpy.ndarray, duration: float, threshold: float, suggested: float
+) -> str:
+    """Draw a match percent curve as an SVG.
+
+    Long curves are shrunk to PLOT_POINTS points, keeping the highest match
+    percent in each stretch, so no peaks are lost.
+
+    Args:
+        curve (numpy.ndarray): The curve.
+        duration (float): The video's length, in seconds.
+        threshold (float): The current threshold.
+        suggested (float): The suggested threshold.
+
+    Returns:
+        str: The SVG.
+    """
+    width, height = 1000, 200
+    points = curve
+    if points.size > PLOT_POINTS:
+        stretch = math.ceil(points.size / PLOT_POINTS)
+        padded = numpy.pad(
+            points, (0, -points.size % stretch), constant_values=points.min()
+        )
+        points = padded.reshape(-1, stretch).max(axis=1)
+
+    x_values = numpy.linspace(0, width, max(points.size, 2))
+    y_values = height - numpy.clip(points, 0, 1) * height
+    polyline = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(x_values, y_values))
+    threshold_y = height - threshold * height
+    suggested_y = height - suggested * height
+    return (
+        f"<svg width='{width}' height='{height + 20}'>"
+        f"<line x1='0' x2='{width}' y1='{threshold_y:.1f}' y2='{threshold_y:.1f}' "
+        "stroke='gray' stroke-dasharray='4'/>"
+        f"<line x1='0' x2='{width}' y1='{suggested_y:.1f}' y2='{suggested_y:.1f}' "
+        "stroke='green'/>"
+        f"<polyline points='{polyline}' fill='none' stroke='steelblue'/>"
+        f"<text x='0' y='{height + 15}' font-size='12'>0 s</text>"
+        f"<text x='{width}' y='{height + 15}' font-size='12' text-anchor='end'>"
+        f"{duration:.1f} s</text></svg>"
+    )
+
+
+def _init_worker(templates: List[Tuple]) -> None:
+    """Store the images' arrays in a worker process.
+
+    Args:
+        templates (List[Tuple]): Each image's image, mask, and max_dist.
+    """
+    global _templates
+    _templates = [
+        types.SimpleNamespace(image=image, mask=mask, max_dist=max_dist)
+        for image, mask, max_dist in templates
+    ]
+
+
+def _compute_chunk(
+    video_path: str, start: float, stop: Optional[float]
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Get the match percents for a chunk of a video, in a worker process.
+
+    Only frames whose decoded timestamps are in [start, stop) are compared
+    (see the module docstring). Frames are resized the same way the
+    splitter's capture_thread resizes them.
+
+    Args:
+        video_path (str): The video.
+        start (float): When the chunk starts, in seconds.
+        stop (float | None): When the chunk stops, in seconds, or None to
+            read to the end.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: The match percents (one row per
+        image, one column per frame) and the time of each frame, in seconds.
+    """
+    capture = _open_before(video_path, start)
+
+    columns = []
+    times = []
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frame_time = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        if frame_time < start:
+            continue
+        if stop is not None and frame_time >= stop:
+            break
+        frame = cv2.resize(
+            frame,
+            (COMPARISON_FRAME_WIDTH, COMPARISON_FRAME_HEIGHT),
+            interpolation=cv2.INTER_LINEAR,
+        )
+        columns.append([get_match_percent(frame, template) for template in _templates])
+        times.append(frame_time)
+    capture.release()
+
+    if len(columns) == 0:
+        return numpy.zeros((len(_templates), 0), numpy.float32), numpy.zeros(0)
+    return numpy.array(columns, numpy.float32).T, numpy.array(times)
+
+
+def _open_before(video_path: str, start: float) -> cv2.VideoCapture:
+    """Open a video, ready to read a frame from before a time.
+
+    Seeks are only approximate in most videos, so this seeks SEEK_BACK_SECS
+    early and checks where the seek landed by reading a frame, seeking
+    further back each time it lands too late. The frame that was read is
+    before start, so it's not needed.
+
+    Args:
+        video_path (str): The video.
+        start (float): The time, in seconds.
+
+    Returns:
+        cv2.VideoCapture: The video.
+    """
+    back_secs = SEEK_BACK_SECS
+    while True:
+        capture = cv2.VideoCapture(video_path)
+        target = start - back_secs
+        if target <= 0:
+            return capture
+        capture.set(cv2.CAP_PROP_POS_MSEC, target * 1000)
+        # If there's no frame to read, the seek went past the end of the
+        # video (its frame count was too high), so the chunk is empty
+        if not capture.grab() or capture.get(cv2.CAP_PROP_POS_MSEC) / 1000 < start:
+            return capture
+        capture.release()
+        back_secs *= 2
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Suggest thresholds from the command line.
+
+    Args:
+        argv (List[str] | None): Command line arguments. If None, use
+            sys.argv. Default is None.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m splitter.threshold_tuner",
+        description="Suggest split image thresholds from a recorded video.",
+    )
+    parser.add_argument("video", help="recorded video of a run")
+    parser.add_argument("dir", help="split image directory")
+    parser.add_argument(
+        "-o", "--output", default="threshold_report", help="output directory"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="processes to use (default: one per core)"
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=DEFAULT_MARGIN,
+        help=f"room to leave around each threshold (default: {DEFAULT_MARGIN})",
+    )
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=DEFAULT_WINDOW_SECS,
+        help="seconds around each image's best match that count as part of it "
+        f"(default: {DEFAULT_WINDOW_SECS})",
+    )
+    args = parser.parse_args(argv)
+
+    images = load_images(args.dir)
+    if len(images) == 0:
+        parser.error(f"No split images in {args.dir}")
+    try:
+        curves, times = compute_curves(args.video, images, args.workers)
+    except OSError as error:
+        parser.error(str(error))
+    suggestions = [
+        suggest_threshold(image.name, curve, times, args.margin, args.window)
+        for image, curve in zip(images, curves)
+    ]
+    write_report(args.output, images, curves, times, suggestions)
+
+    for image, suggestion in zip(images, suggestions):
+        flag = "" if suggestion.ok else "  <- check this image"
+        print(
+            f"{image.name}: ({image.threshold:.3f}) -> ({suggestion.threshold:.3f})"
+            f"{flag}"
+        )
+    print(f"Wrote {curves.shape[1]} frames of results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Time each phase of startup, to find out what makes the program slow to open.
+
+The timeline is off unless STARTUP_TIMELINE_ENV_VAR is set to a non-empty
+value (or pilgrim_autosplitter.py is run with --startup-timeline). When it's
+on, each phase is printed as soon as it ends, with the time since this module
+was imported and how long the phase took, e.g.:
+    [startup]   412.0 ms  (+105.3 ms)  import UI
+
+This module is imported before anything else, so its import time is as close
+to the program's start as Python allows.
+"""
+
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+# Set this environment variable to a non-empty value to print the timeline
+STARTUP_TIMELINE_ENV_VAR = "PILGRIM_AUTOSPLITTER_STARTUP_TIMELINE"
+
+
+class StartupTimeline:
+    """Record how long each phase of startup takes.
+
+    Phases can be recorded from any thread (e.g. the update check, which runs
+    in the background).
+
+    Attributes:
+        enabled (bool): Whether phases are recorded and printed. If False,
+            every method returns right away.
+        phases (List[Tuple[str, float, float]]): The name, start time, and end
+            time of each phase, relative to start_time, in seconds, in the
+            order they ended.
+        start_time (float): The time.perf_counter value that phase times are
+            relative to.
+    """
+
+    def __init__(self, enabled: bool, start_time: Optional[float] = None) -> None:
+        """Start the timeline.
+
+        Args:
+            enabled (bool): Whether to record phases.
+            start_time (float | None): The time.perf_counter value phase times
+                are relative to. If None, use the current time. Default is
+                None.
+        """
+        self.enabled = enabled
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self.phases: List[Tuple[str, float, float]] = []
+        self._lock = threading.Lock()
+        # When the last step recorded with mark ended
+        self._last_mark_time = self.start_time
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the code in a with block as a phase.
+
+        Args:
+            name (str): The name of the phase, e.g. "import PyQt5".
+
+        Yields:
+            None: Nothing; the phase ends when the with block exits.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, phase_start, time.perf_counter())
+
+    def mark(self, name: str) -> None:
+        """Record everything since the last call to mark (or since the
+        timeline started) as a phase.
+
+        This makes it easy to time a series of steps without wrapping each one
+        in a with block. Phases recorded with the phase method don't count as
+        marks, so they can run on other threads without splitting up the main
+        thread's steps.
+
+        Args:
+            name (str): The name of the step that just finished.
+        """
+        if not self.enabled:
+            return
+
+        phase_end = time.perf_counter()
+        with self._lock:
+            phase_start = self._last_mark_time
+            self._last_mark_time = phase_end
+        self._add(name, phase_start, phase_end)
+
+    def get_elapsed(self, name: str) -> Optional[float]:
+        """Get the time from start_time to the end of a phase.
+
+        Args:
+            name (str): The name of the phase.
+
+        Returns:
+            float | None: The time, in seconds, or None if no phase with that
+            name has ended.
+        """
+        with self._lock:
+            for phase_name, _, phase_end in self.phases:
+                if phase_name == name:
+                    return phase_end
+        return None
+
+    def _add(self, name: str, phase_start: float, phase_end: float) -> None:
+        """Record a phase and print it.
+
+        Args:
+            name (str): The name of the phase.
+            phase_start (float): The time.perf_counter value when it started.
+            phase_end (float): The time.perf_counter value when it ended.
+        """
+        phase = (name, phase_start - self.start_time, phase_end - self.start_time)
+        with self._lock:
+            self.phases.append(phase)
+        print(
+            f"[startup] {phase[2] * 1000:9.1f} ms  "
+            f"(+{(phase[2] - phase[1]) * 1000:.1f} ms)  {name}",
+            flush=True,
+        )
+
+
+# The timeline used by pilgrim_autosplitter.py and the UI
+timeline = StartupTimeline(enabled=bool(os.environ.get(STARTUP_TIMELINE_ENV_VAR)))
@@ -32,7 +32,6 @@ input to the UI and the splitter.
 
 
 import datetime
-import glob
 import os
 import platform
 import subprocess
@@ -42,18 +41,42 @@ import webbrowser
 from pathlib import Path
 from threading import Lock, Thread
 
-import cv2
 from PyQt5.QtCore import QRect, Qt, QTimer
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtWidgets import QAbstractButton, QApplication, QFileDialog
+from PyQt5.QtWidgets import QAbstractButton, QApplication, QFileDialog, QWidget
 
 import settings
-from splitter.splitter import Splitter
-from ui.ui_keyboard_controller import UIKeyboardController
+from splitter.action_dispatcher import SplitAction
+from splitter.screenshot_writer import ScreenshotWriter
+from splitter.split_set_cache import get_next_recent_dir
+from splitter.splitter import Change, Splitter
+from splitter.state_server import StateServer, get_splitter_state
+from startup_timeline import timeline
+from ui.ui_keyboard_controller import InputDispatcher, UIKeyboardController
 from ui.ui_main_window import UIMainWindow
 from ui.ui_settings_window import UISettingsWindow
 from ui.ui_style_sheet import style_sheet_light, style_sheet_dark
 
+# The flag set when each hotkey is pressed (see _react_to_hotkey_flags), and
+# the settings holding the hotkey's name and key code
+HOTKEY_FLAG_SETTINGS = {
+    "_split_hotkey_pressed": ("SPLIT_HOTKEY_NAME", "SPLIT_HOTKEY_CODE"),
+    "_reset_hotkey_pressed": ("RESET_HOTKEY_NAME", "RESET_HOTKEY_CODE"),
+    "_undo_hotkey_pressed": ("UNDO_HOTKEY_NAME", "UNDO_HOTKEY_CODE"),
+    "_skip_hotkey_pressed": ("SKIP_HOTKEY_NAME", "SKIP_HOTKEY_CODE"),
+    "_previous_hotkey_pressed": ("PREV_HOTKEY_NAME", "PREV_HOTKEY_CODE"),
+    "_next_hotkey_pressed": ("NEXT_HOTKEY_NAME", "NEXT_HOTKEY_CODE"),
+    "_screenshot_hotkey_pressed": ("SCREENSHOT_HOTKEY_NAME", "SCREENSHOT_HOTKEY_CODE"),
+    "_toggle_hotkeys_hotkey_pressed": (
+        "TOGGLE_HOTKEYS_HOTKEY_NAME",
+        "TOGGLE_HOTKEYS_HOTKEY_CODE",
+    ),
+    "_next_split_set_hotkey_pressed": (
+        "NEXT_SPLIT_SET_HOTKEY_NAME",
+        "NEXT_SPLIT_SET_HOTKEY_CODE",
+    ),
+}
+
 
 class UIController:
     """Manage the passing of information from the splitter to the UI, and from
@@ -61,7 +84,8 @@ class UIController:
 
     Perhaps the most important class method is _poll, which is ran once per
     frame using a QTimer. This method updates the UI and handles all user
-    inputs.
+    inputs. It only updates widgets whose state has changed, so an idle poll
+    costs almost nothing.
 
     UIController has no public attributes, as it is meant to operate after
     initialization without further input. For details about each attribute,
@@ -74,9 +98,10 @@ class UIController:
         Creates each UI window and then shows the main window.
         Connects pyqtSignals from each UI window to their respective slots.
         Sets initial flags and values used by poller.
-        Starts the keyboard listener.
         Starts poller, which checks for user input and splitter outputs at
         regular intervals.
+        Everything else (the keyboard listener, the video, and the update
+        check) waits until the window has been painted (see _finish_startup).
 
         Args:
             application (QApplication): The QApplication that the program is
@@ -94,21 +119,24 @@ class UIController:
         self._main_window.setStyleSheet(style)
         self._settings_window.setStyleSheet(style)
 
-        # Check if there's an update available and show message if so
-        if settings.get_bool("CHECK_FOR_UPDATES"):
-            latest_version = settings.get_latest_version()
-            if not settings.version_ge(settings.VERSION_NUMBER, latest_version):
-                msg = self._main_window.update_available_msg
-                msg.setStyleSheet(style)
-                msg.show()
-                msg.raise_()  # Make sure msg isn't hidden behind app
-
         ########################
         #                      #
         # Poller Values, Flags #
         #                      #
         ########################
 
+        # Set once the slow parts of startup have been started (see
+        # _finish_startup)
+        self._startup_finished = False
+
+        # Set by the update check thread if a newer version is out, so _poll
+        # can show update_available_msg (see _check_for_update)
+        self._latest_version = None
+
+        # Similar split image pairs the user has already been warned about
+        # (see _react_to_similar_split_images)
+        self._warned_similar_pairs = set()
+
         # Tell _update_ui to update split labels
         # Should be set whenever the split image is modified
         self._redraw_split_labels = True
@@ -120,6 +148,21 @@ class UIController:
         # Only update main_window's style sheet when it has changed
         self._most_recent_style_sheet = None
 
+        # Tell _poll to update every widget, not just the ones whose splitter
+        # state changed. Should be set when settings or the layout change
+        self._redraw_all = True
+        # Used by _poll to notice when threads start or stop, or split images
+        # finish loading
+        self._thread_states = None
+        self._splits_were_loading = False
+
+        # Values for throttling the video preview (see _poll)
+        self._preview_interval = 0
+        self._preview_off_while_running = False
+        self._preview_paused_while_running = False
+        self._last_preview_time = 0
+        self._video_feed_stale = True
+
         # Only resize record icon when aspect ratio changes
         self._resize_record_icon = False
         self._record_active_pixmap = None
@@ -131,6 +174,10 @@ class UIController:
         self._hotkey_box_key_code = None
         self._hotkey_box_key_name = None
         self._hotkey_box_lock = Lock()
+        # The hotkey box with focus, if any. Kept up to date on the main
+        # thread (see _track_hotkey_box_focus), so _handle_key_press doesn't
+        # have to ask each box from the listener thread
+        self._focused_hotkey_box = None
 
         # Flags to disable hotkeys
         self._split_hotkey_enabled = False
@@ -146,9 +193,10 @@ class UIController:
         self._next_hotkey_pressed = False
         self._screenshot_hotkey_pressed = False
         self._toggle_hotkeys_hotkey_pressed = False
+        self._next_split_set_hotkey_pressed = False
 
         # Values for keeping display awake (see _wake_display)
-        self._last_wake_time = time.perf_counter()
+        self._last_wake_time = self._splitter.clock.now()
         # Attempt wake after this many seconds. Should be < 1 min, since that's
         # the minimum allowed time to trigger display sleep on most OSs
         self._wake_interval = 45
@@ -188,6 +236,14 @@ class UIController:
         self._main_window.video_display.valid_double_click.connect(
             self._set_record_dir_path
         )
+        self._main_window.video_display.mouse_state_changed.connect(
+            self._update_split_and_video_css
+        )
+
+        # Split image (shows reset image when clicked)
+        self._main_window.split_display.mouse_state_changed.connect(
+            self._update_split_and_video_css
+        )
 
         # Minimal view / full view button
         self._main_window.min_view_button.clicked.connect(
@@ -259,9 +315,21 @@ class UIController:
         #               #
         #################
 
-        # Start keyboard listener
+        # Keyboard controller (the listener is started in _finish_startup)
         self._keyboard = UIKeyboardController()
-        self._keyboard.start_listener(on_press=self._handle_key_press, on_release=None)
+        # Maps key presses to hotkey flags (see _handle_key_press)
+        self._input_dispatcher = InputDispatcher()
+        self._set_hotkey_bindings()
+        self._application.focusChanged.connect(self._track_hotkey_box_focus)
+        # Let the splitter press split hotkeys itself, without waiting for
+        # _poll (see _react_to_split_flags)
+        self._splitter.action_dispatcher.press_key = self._keyboard.press_and_release
+        self._splitter.action_dispatcher.update_output()
+        # Shares the splitter's state with local programs, if enabled (started
+        # in _finish_startup)
+        self._state_server = None
+        # Writes screenshots without holding up the UI (see _take_screenshot)
+        self._screenshot_writer = ScreenshotWriter()
 
         # Start poller
         self._poller = QTimer()
@@ -269,6 +337,14 @@ class UIController:
         self._poller.timeout.connect(self._poll)
         self._poller.start()
 
+        # Finish starting up once the window is showing. The connection is
+        # queued so the first paint isn't held up. The timer is a fallback in
+        # case the window is never painted (e.g. it starts minimized)
+        self._main_window.first_painted.connect(
+            self._finish_startup, Qt.QueuedConnection
+        )
+        QTimer.singleShot(1000, self._finish_startup)
+
         self._main_window.show()
 
     ##################
@@ -277,6 +353,66 @@ class UIController:
     #                #
     ##################
 
+    def _finish_startup(self) -> None:
+        """Do the parts of startup that can wait until the window is showing.
+
+        Starts the keyboard listener, starts the video if START_WITH_VIDEO is
+        set, starts the state server if STATE_SERVER_ENABLED is set, and
+        checks for updates on a separate thread (see _check_for_update).
+        Opening a video source can take several seconds on some machines, so
+        doing this after the first paint means the window shows up right away
+        instead.
+
+        Only runs once, even though it's called by both first_painted and a
+        fallback timer (see __init__).
+        """
+        if self._startup_finished:
+            return
+        self._startup_finished = True
+        timeline.mark("first paint")
+
+        self._keyboard.start_listener(on_press=self._handle_key_press, on_release=None)
+        timeline.mark("start keyboard listener")
+
+        if settings.get_bool("START_WITH_VIDEO"):
+            self._splitter.restart()
+            timeline.mark("start video")
+
+        if settings.get_bool("STATE_SERVER_ENABLED"):
+            state_server = StateServer(
+                lambda: get_splitter_state(self._splitter),
+                settings.get_int("STATE_SERVER_PORT"),
+                settings.get_float("STATE_SERVER_RATE_HZ"),
+            )
+            if state_server.start():
+                self._state_server = state_server
+
+        if settings.get_bool("CHECK_FOR_UPDATES"):
+            update_check_thread = Thread(target=self._check_for_update)
+            update_check_thread.daemon = True
+            update_check_thread.start()
+
+    def _check_for_update(self) -> None:
+        """Get the latest version number, and tell _poll to show
+        update_available_msg if it's newer than this one.
+
+        Runs on its own thread, since fetching the version can take a while
+        and shouldn't freeze the UI. Usually the cached version is used and
+        nothing is fetched (see settings.get_latest_version).
+        """
+        with timeline.phase("check for updates"):
+            latest_version = settings.get_latest_version()
+        if not settings.version_ge(settings.VERSION_NUMBER, latest_version):
+            self._latest_version = latest_version
+
+    def _show_update_available_msg(self) -> None:
+        """Show update_available_msg (see _check_for_update)."""
+        self._latest_version = None
+        msg = self._main_window.update_available_msg
+        msg.setStyleSheet(self._get_style_sheet())
+        msg.show()
+        msg.raise_()  # Make sure msg isn't hidden behind app
+
     def _attempt_undo_hotkey(self) -> None:
         """Try to press the undo split hotkey.
 
@@ -353,17 +489,9 @@ class UIController:
         """Tell splitter.splits to call previous_split_image and ask
         splitter._look_for_split to reset its flags if needed.
 
-        If self._splitter.match_percent is None, this means that
-        splitter.look_for_split isn't active, and we can move to the next split
-        image without causing a segmentation fault or breaking splitter flags.
-
-        Otherwise, we know look_for_split is active, and we need to (1) pause
-        it while we change split images for thread safety, then (2) reset its
-        flags. We do this (or at least try to for 1 second) by setting the
-        splitter.changing_splits flag, waiting for splitter to confirm it's
-        paused (splitter sets its waiting_for_split_change flag). We change
-        the split image, then unset changing_splits, which signals to splitter
-        it can reset its flags.
+        If splitter._look_for_split is active, it needs to be paused while we
+        change split images for thread safety, then reset its flags.
+        splitter.change_splits takes care of this.
 
         In this method and the next two, we also kill the recording before
         changing splits so, if recording is on, the recording has the chance
@@ -378,21 +506,8 @@ class UIController:
         # Make sure UI image is updated
         self._redraw_split_labels = True
 
-        # Go to next split, no need to worry about flags / thread safety
-        if self._splitter.match_percent is None:
-            self._splitter.splits.previous_split_image()
-
-        # Pause splitter._look_for_split before getting next split
-        else:
-            start_time = time.perf_counter()
-            self._splitter.changing_splits = True
-            while (
-                time.perf_counter() - start_time < 1
-                and not self._splitter.waiting_for_split_change
-            ):
-                time.sleep(0.001)
-            self._splitter.splits.previous_split_image()
-            self._splitter.changing_splits = False
+        # Go to previous split (pausing splitter._look_for_split if needed)
+        self._splitter.change_splits(self._splitter.splits.previous_split_image)
 
         # Restart recording
         self._splitter.restart_record_thread()
@@ -401,17 +516,9 @@ class UIController:
         """Tell splitter.splits to call next_split_image, and ask
         splitter._look_for_split to reset its flags if needed.
 
-        If self._splitter.match_percent is None, this means that
-        splitter.look_for_split isn't active, and we can move to the next split
-        image without causing a segmentation fault or breaking splitter flags.
-
-        Otherwise, we know look_for_split is active, and we need to (1) pause
-        it while we change split images for thread safety, then (2) reset its
-        flags. We do this (or at least try to for 1 second) by by setting the
-        splitter.changing_splits flag, waiting for splitter to confirm it's
-        paused (splitter sets its waiting_for_split_change flag). We change
-        the split image, then unset changing_splits, which signals to splitter
-        it can reset its flags.
+        If splitter._look_for_split is active, it needs to be paused while we
+        change split images for thread safety, then reset its flags.
+        splitter.change_splits takes care of this.
 
         This method also kills the splitter's non-capture threads if we're on the
         last loop of the last split when this method is called, because if the
@@ -431,7 +538,7 @@ class UIController:
         # (This call must be the result of a split key hotpress)
         # (See docstring)
         split_index = self._splitter.splits.current_image_index
-        total_splits = len(self._splitter.splits.list) - 1
+        total_splits = self._splitter.splits.get_last_index()
         loop = self._splitter.splits.current_loop
         total_loops = self._splitter.splits.list[split_index].loops
         if (
@@ -448,22 +555,8 @@ class UIController:
             # Make sure UI image is updated
             self._redraw_split_labels = True
 
-            # Go to next split, no need to worry about flags / thread safety
-            if self._splitter.match_percent is None:
-                self._splitter.splits.next_split_image()
-
-            # Pause splitter._look_for_split before getting next split
-            else:
-                start_time = time.perf_counter()
-                self._splitter.changing_splits = True
-                while (
-                    time.perf_counter() - start_time < 1
-                    and not self._splitter.waiting_for_split_change
-                ):
-                    time.sleep(0.001)
-
-                self._splitter.splits.next_split_image()
-                self._splitter.changing_splits = False
+            # Go to next split (pausing splitter._look_for_split if needed)
+            self._splitter.change_splits(self._splitter.splits.next_split_image)
 
         # Restart recording if not calling this method as the result of
         # a dummy split
@@ -500,6 +593,61 @@ class UIController:
         # Restart recording
         self._splitter.restart_record_thread()
 
+    def _request_split_set(self, dir_path: str, reload: bool = False) -> None:
+        """Switch splitter.splits to a different split image directory, and
+        go to its first split.
+
+        Directories in splitter.split_sets are already loaded, so switching to
+        them is instant. The compare threads aren't restarted: like in
+        _request_previous_split, splitter._look_for_split is paused while the
+        split set changes, then resets its flags and keeps going with the new
+        split images. Threads are only started if they aren't already running
+        (e.g. if the previous directory was empty, or had no reset image).
+
+        Args:
+            dir_path (str): The split image directory to switch to.
+            reload (bool): If True, read the directory again even if it's
+                already loaded, so images changed on disk show up. Default is
+                False.
+        """
+        # Kill recording
+        self._splitter.safe_exit_record_thread()
+
+        # Make sure UI image is updated
+        self._redraw_split_labels = True
+
+        split_dir = self._splitter.split_sets.get(dir_path, reload=reload)
+        split_dir.first_split_image()
+
+        # Switch directories (pausing splitter._look_for_split if needed)
+        self._splitter.change_splits(
+            lambda: setattr(self._splitter, "splits", split_dir)
+        )
+
+        settings.set_value("LAST_IMAGE_DIR", dir_path)
+        self._set_split_directory_box_text()
+
+        # Start compare threads if they aren't running yet
+        if len(split_dir.list) > 0 and self._splitter.capture_thread.is_alive():
+            if not self._splitter.compare_split_thread.is_alive():
+                self._splitter.restart_compare_split_thread()
+            if (
+                split_dir.reset_image is not None
+                and not self._splitter.compare_reset_thread.is_alive()
+            ):
+                self._splitter.restart_compare_reset_thread()
+
+        # Restart recording
+        self._splitter.restart_record_thread()
+
+    def _request_next_split_set(self) -> None:
+        """Switch to the next recently used split image directory, if there is
+        one (see split_set_cache.get_next_recent_dir).
+        """
+        dir_path = get_next_recent_dir(settings.get_str("LAST_IMAGE_DIR"))
+        if dir_path is not None:
+            self._request_split_set(dir_path)
+
     def _set_split_dir_path(self) -> None:
         """Prompt the user to select a split image directory, then open the new
         directory in a threadsafe manner.
@@ -508,8 +656,9 @@ class UIController:
         the dir is within the user's home directory. If not, show an error msg
         and re-run the method.
 
-        Otherwise, change `LAST_IMAGE_DIR` to the new choice. Then reset splits
-        so the new ones show up.
+        Otherwise, switch to the new directory (see _request_split_set),
+        reading it again if it's already loaded in case its images were
+        changed.
         """
         path = QFileDialog.getExistingDirectory(
             self._main_window,
@@ -523,9 +672,7 @@ class UIController:
                 msg.show()
                 return self._set_split_dir_path()
 
-            settings.set_value("LAST_IMAGE_DIR", path)
-            self._set_split_directory_box_text()
-            self._request_reset_splits()
+            self._request_split_set(path, reload=True)
 
     def _set_record_dir_path(self) -> None:
         """Prompt the user to select a recordings directory.
@@ -562,6 +709,14 @@ class UIController:
         )
         self._main_window.split_directory_box.setText(elided_path)
 
+    def stop_state_server(self) -> None:
+        """Disconnect the state server's clients and stop listening, if the
+        state server was started. Called when the program quits.
+        """
+        if self._state_server is not None:
+            self._state_server.stop()
+            self._state_server = None
+
     def update_available_msg_action(self, button: QAbstractButton):
         """React to button press in _main_window.update_available_msg.
 
@@ -603,6 +758,7 @@ class UIController:
         if settings.get_str("ASPECT_RATIO") != "4:3 (320x240)":
             match_percent_label.setText(self._main_window.match_reset_percent_txt)
         self._show_reset_percents = True
+        self._update_match_percents()
 
     def _hide_reset_image_display(self) -> None:
         """Remove reset image / info from UI."""
@@ -615,17 +771,22 @@ class UIController:
 
         self._redraw_split_labels = True  # Force UI to show split image again
         self._show_reset_percents = False
+        self._update_match_percents()
 
     def _exec_settings_window(self) -> None:
         """Set up and open the settings window UI."""
         self._settings_window.setFocus(True)  # Make sure no widgets have focus
         self._reset_settings()
+        self._show_latency_stats()
         # On some platforms, the main window hides the settings window if we
         # don't set this flag
         self._settings_window.setWindowFlag(
             Qt.WindowStaysOnTopHint, settings.get_bool("ALWAYS_ON_TOP")
         )
+        # Hotkeys don't work while the settings window is open
+        self._input_dispatcher.paused = True
         self._settings_window.exec()
+        self._input_dispatcher.paused = False
 
     def _reset_settings(self) -> None:
         """Read settings from `settings.py` and write them into the settings
@@ -642,6 +803,15 @@ class UIController:
             ),
             self._settings_window.delay_spinbox: settings.get_float("DEFAULT_DELAY"),
             self._settings_window.pause_spinbox: settings.get_float("DEFAULT_PAUSE"),
+            self._settings_window.split_set_memory_spinbox: settings.get_int(
+                "SPLIT_SET_MEMORY_MB"
+            ),
+            self._settings_window.pre_split_spinbox: settings.get_float(
+                "RECORD_PRE_SPLIT_SECS"
+            ),
+            self._settings_window.post_split_spinbox: settings.get_float(
+                "RECORD_POST_SPLIT_SECS"
+            ),
         }.items():
             spinbox.setProperty("value", value)
 
@@ -662,6 +832,12 @@ class UIController:
             self._settings_window.always_on_top_checkbox: settings.get_bool(
                 "ALWAYS_ON_TOP"
             ),
+            self._settings_window.compress_frames_checkbox: settings.get_bool(
+                "RECORD_COMPRESS_FRAMES"
+            ),
+            self._settings_window.sync_game_time_checkbox: settings.get_bool(
+                "LIVESPLIT_SYNC_GAME_TIME"
+            ),
         }.items():
             if value:
                 checkbox.setCheckState(Qt.Checked)
@@ -706,6 +882,10 @@ class UIController:
                 settings.get_str("TOGGLE_HOTKEYS_HOTKEY_NAME"),
                 settings.get_str("TOGGLE_HOTKEYS_HOTKEY_CODE"),
             ),
+            self._settings_window.next_split_set_hotkey_box: (
+                settings.get_str("NEXT_SPLIT_SET_HOTKEY_NAME"),
+                settings.get_str("NEXT_SPLIT_SET_HOTKEY_CODE"),
+            ),
         }.items():
             hotkey_box.setText(values[0])
             hotkey_box.key_name = values[0]
@@ -728,6 +908,42 @@ class UIController:
         elif theme == "light":
             self._settings_window.theme_combo_box.setCurrentIndex(1)
 
+        record_mode = settings.get_str("RECORD_MODE")
+        if record_mode == "whole split":
+            self._settings_window.record_mode_combo_box.setCurrentIndex(0)
+        elif record_mode == "around split":
+            self._settings_window.record_mode_combo_box.setCurrentIndex(1)
+
+        self._settings_window.preview_fps_combo_box.setCurrentText(
+            settings.get_str("PREVIEW_FPS")
+        )
+
+        self._settings_window.split_output_combo_box.setCurrentText(
+            settings.get_str("SPLIT_OUTPUT")
+        )
+        self._settings_window.livesplit_address_line_edit.setText(
+            settings.get_str("LIVESPLIT_SERVER_ADDRESS")
+        )
+
+    def _show_latency_stats(self) -> None:
+        """Show how quickly splits have been sent (see
+        ActionDispatcher.get_stats) and hotkey presses have been picked up
+        (see InputDispatcher.get_stats) so far in the settings window.
+        """
+        stats = self._splitter.action_dispatcher.get_stats()
+        label = self._settings_window.split_latency_value_label
+        if stats.actions_sent == 0:
+            label.setText("none yet")
+        else:
+            label.setText(f"{stats.mean_latency_ms:.1f} ms")
+        label.setToolTip(stats.describe())
+
+        # The header is cut off, so its tooltip also shows it in full
+        self._settings_window.hotkey_settings_label.setToolTip(
+            "Hotkeys (click + type to change)\n"
+            f"{self._input_dispatcher.get_stats().describe()}"
+        )
+
     def _save_settings(self) -> None:
         """Write the current values in settings_window to settings, and update
         program variables as needed.
@@ -739,6 +955,9 @@ class UIController:
             self._settings_window.decimals_spinbox: "MATCH_PERCENT_DECIMALS",
             self._settings_window.delay_spinbox: "DEFAULT_DELAY",
             self._settings_window.pause_spinbox: "DEFAULT_PAUSE",
+            self._settings_window.split_set_memory_spinbox: "SPLIT_SET_MEMORY_MB",
+            self._settings_window.pre_split_spinbox: "RECORD_PRE_SPLIT_SECS",
+            self._settings_window.post_split_spinbox: "RECORD_POST_SPLIT_SECS",
         }.items():
             if spinbox == self._settings_window.threshold_spinbox:
                 value = float(spinbox.value()) / 100
@@ -751,9 +970,10 @@ class UIController:
                 self._poller.setInterval(self._get_interval())
                 self._splitter.target_fps = value
 
-        self._splitter.splits.set_default_threshold()
-        self._splitter.splits.set_default_delay()
-        self._splitter.splits.set_default_pause()
+        for split_dir in self._splitter.split_sets.get_loaded():
+            split_dir.set_default_threshold()
+            split_dir.set_default_delay()
+            split_dir.set_default_pause()
 
         # Checkboxes
         for checkbox, setting_string in {
@@ -762,6 +982,8 @@ class UIController:
             self._settings_window.global_hotkeys_checkbox: "GLOBAL_HOTKEYS_ENABLED",
             self._settings_window.check_for_updates_checkbox: "CHECK_FOR_UPDATES",
             self._settings_window.always_on_top_checkbox: "ALWAYS_ON_TOP",
+            self._settings_window.compress_frames_checkbox: "RECORD_COMPRESS_FRAMES",
+            self._settings_window.sync_game_time_checkbox: "LIVESPLIT_SYNC_GAME_TIME",
         }.items():
             if checkbox.checkState() == 0:
                 value = False
@@ -815,10 +1037,15 @@ class UIController:
                 "TOGGLE_HOTKEYS_HOTKEY_NAME",
                 "TOGGLE_HOTKEYS_HOTKEY_CODE",
             ),
+            self._settings_window.next_split_set_hotkey_box: (
+                "NEXT_SPLIT_SET_HOTKEY_NAME",
+                "NEXT_SPLIT_SET_HOTKEY_CODE",
+            ),
         }.items():
             name, code = hotkey.text(), hotkey.key_code
             settings.set_value(setting_strings[0], name)
             settings.set_value(setting_strings[1], code)
+        self._set_hotkey_bindings()
 
         # Comboboxes --
         # Only update these settings if the value changed, since calling
@@ -841,7 +1068,8 @@ class UIController:
                 settings.set_value("ASPECT_RATIO", "16:9 (432x243)")
                 settings.set_value("FRAME_WIDTH", 432)
                 settings.set_value("FRAME_HEIGHT", 243)
-            self._splitter.splits.resize_images()
+            for split_dir in self._splitter.split_sets.get_loaded():
+                split_dir.resize_images()
             self._set_main_window_layout()
 
         theme = self._settings_window.theme_combo_box.currentText()
@@ -855,11 +1083,35 @@ class UIController:
             self._main_window.setStyleSheet(style)
             self._settings_window.setStyleSheet(style)
 
+        record_mode = self._settings_window.record_mode_combo_box.currentText()
+        settings.set_value("RECORD_MODE", record_mode)
+
+        preview_fps = self._settings_window.preview_fps_combo_box.currentText()
+        settings.set_value("PREVIEW_FPS", preview_fps)
+
+        split_output = self._settings_window.split_output_combo_box.currentText()
+        settings.set_value("SPLIT_OUTPUT", split_output)
+        livesplit_address = self._settings_window.livesplit_address_line_edit.text()
+        settings.set_value("LIVESPLIT_SERVER_ADDRESS", livesplit_address.strip())
+        self._splitter.action_dispatcher.update_output()
+
+        # Not in the settings window, but may have been changed in the
+        # settings file since the splitter started
+        self._splitter.update_run_history()
+        self._splitter.update_frame_export()
+
+        # Any displayed value could depend on the new settings
+        self._redraw_all = True
+
     def _take_screenshot(self) -> None:
-        """Write `spltter.comparison_frame` to a file (and optionally open it
-        in machine's default image viewer).
+        """Save the most recent frame, at the capture source's resolution, to
+        a file in the split image directory.
+
+        The file is written by self._screenshot_writer on its own thread, so
+        the UI doesn't freeze while a big frame is encoded. Once it's written,
+        _react_to_saved_screenshots tells the user.
         """
-        frame = self._splitter.comparison_frame
+        frame = self._splitter.capture_frame
         if frame is None:
             msg = self._main_window.screenshot_err_no_video
             msg.setStyleSheet(self._get_style_sheet())
@@ -869,60 +1121,66 @@ class UIController:
             return
 
         image_dir = settings.get_str("LAST_IMAGE_DIR")
-        if not Path(image_dir).is_dir:
+        if not Path(image_dir).is_dir():
             image_dir = os.path.expanduser("~")  # Home directory is default
 
-        screenshot_path = (
-            f"{image_dir}/{self.get_file_number(image_dir)}_screenshot.png"
-        )
-        cv2.imwrite(screenshot_path, frame)
+        self._screenshot_writer.save(image_dir, frame)
 
-        if Path(screenshot_path).is_file():
-            if settings.get_bool("OPEN_SCREENSHOT_ON_CAPTURE"):
-                self._open_file_or_dir(screenshot_path)
-            else:
-                msg = self._main_window.screenshot_ok_msg
-                msg.setInformativeText(f"Screenshot saved to:\n{screenshot_path}")
-                msg.setIconPixmap(QPixmap(screenshot_path).scaledToWidth(150))
+    def _react_to_saved_screenshots(self) -> None:
+        """Open each screenshot written since the last poll (or show it in a
+        message box), or tell the user it couldn't be written.
+        """
+        for screenshot_path, written in self._screenshot_writer.get_results():
+            if written:
+                if settings.get_bool("OPEN_SCREENSHOT_ON_CAPTURE"):
+                    self._open_file_or_dir(screenshot_path)
+                else:
+                    msg = self._main_window.screenshot_ok_msg
+                    msg.setInformativeText(f"Screenshot saved to:\n{screenshot_path}")
+                    msg.setIconPixmap(QPixmap(screenshot_path).scaledToWidth(150))
+                    msg.setStyleSheet(self._get_style_sheet())
+                    msg.show()
+                    # Close message box after 10 seconds
+                    QTimer.singleShot(10000, lambda: msg.done(0))
+
+            else:  # File couldn't be written to the split image directory
+                msg = self._main_window.screenshot_err_no_file
                 msg.setStyleSheet(self._get_style_sheet())
                 msg.show()
                 # Close message box after 10 seconds
                 QTimer.singleShot(10000, lambda: msg.done(0))
 
-        else:  # File couldn't be written to the split image directory
-            msg = self._main_window.screenshot_err_no_file
-            msg.setStyleSheet(self._get_style_sheet())
-            msg.show()
-            # Close message box after 10 seconds
-            QTimer.singleShot(10000, lambda: msg.done(0))
-
-    def get_file_number(self, dir: str) -> str:
-        """Return the lowest three-digit number not already used as a .png
-        filename suffix in the given directory.
+    def _react_to_similar_split_images(self) -> None:
+        """Warn the user about split images that are similar enough to trigger
+        each other (see SplitDir.similar_pairs).
 
-        Args:
-            dir (str): The target directory for the file.
+        Each pair is only shown once, so reloading the split images (e.g.
+        when resetting) doesn't show the same warning again.
+        """
+        similar_pairs = self._splitter.splits.similar_pairs
+        if similar_pairs is None:
+            return
 
-        Raises:
-            Exception: Throw an exception if there are more than 1,000 files in
-                the abovementioned format. This should never happen, but it's
-                included because I didn't feel like thinking up a workaround.
+        dir_path = settings.get_str("LAST_IMAGE_DIR")
+        new_pairs = []
+        for pair in similar_pairs:
+            key = (dir_path, pair.first.name, pair.second.name)
+            if key not in self._warned_similar_pairs:
+                self._warned_similar_pairs.add(key)
+                new_pairs.append(pair)
+        if len(new_pairs) == 0:
+            return
 
-        Returns:
-            file_number (str): The lowest three-digit number as a string.
-        """
-        file_int = 0
-        while True:
-            if file_int > 999:
-                raise Exception(f"Error: over 1000 split images already in {dir}")
-
-            leading_zeros = "0" * (3 - len(str(file_int)))
-            file_number = f"{leading_zeros}{file_int}"
-            files_with_same_number = glob.glob(f"{dir}/{file_number}*.png")
-            if len(files_with_same_number) > 0:
-                file_int += 1
-            else:
-                return file_number
+        lines = [pair.describe() for pair in new_pairs[:10]]
+        if len(new_pairs) > 10:
+            lines.append(f"...and {len(new_pairs) - 10} more")
+        msg = self._main_window.similar_images_msg
+        msg.setInformativeText(
+            "These images are similar enough that one could split when the "
+            "other is onscreen:\n\n" + "\n".join(lines)
+        )
+        msg.setStyleSheet(self._get_style_sheet())
+        msg.show()
 
     def _open_file_or_dir(self, path: str) -> None:
         """Enables cross-platform opening of a file or directory.
@@ -986,6 +1244,7 @@ class UIController:
         if self._splitter.capture_thread.is_alive():
             old_setting = settings.get_bool("RECORD_CLIPS")
             settings.set_value("RECORD_CLIPS", not old_setting)
+            self._redraw_all = True
 
             # Show recordings dest. hint when turned on
             if old_setting is False:
@@ -1014,6 +1273,8 @@ class UIController:
         self._redraw_split_labels = True
         # Video overlay icon will be resized after this call finishes
         self._resize_record_icon = True
+        # Everything else will be redrawn, too
+        self._redraw_all = True
         # Refresh the split directory text so it elides correctly
         self._set_split_directory_box_text()
 
@@ -1488,37 +1749,151 @@ class UIController:
         Uses information from UI, splitter, mouse, and keyboard to update UI
         and splitter. Also keeps the computer's display awake if the splitter
         is active.
+
+        Only widgets whose state changed since the last poll are updated: the
+        splitter reports its own changes (see Splitter.take_changes), split
+        image changes set self._redraw_split_labels, and mouse interaction with
+        the video feed and split image updates the style sheet as it happens.
+        Rarer changes, like threads starting or stopping or settings being
+        saved, update everything.
+
+        The video preview is refreshed at most once per PREVIEW_FPS interval,
+        however fast frames are captured, and not at all while the window is
+        minimized (see _update_preview_paused).
         """
-        self._update_video_feed()
-        self._update_video_record_overlay()
-        self._update_video_info_overlay()
-        self._update_video_title()
-        self._update_split_and_video_css()
-        self._update_split_image_labels()
-        self._update_split_delay_suspend()
-        self._update_match_percents()
-        self._update_pause_button()
-        self._set_buttons_and_hotkeys_enabled()
         self._react_to_hotkey_flags()
+        self._react_to_state_server_commands()
+        self._react_to_saved_screenshots()
+        self._react_to_similar_split_images()
         self._react_to_settings_menu_flags()
         self._react_to_split_flags()
         self._wake_display()
+        if self._latest_version is not None:
+            self._show_update_available_msg()
+
+        changes = self._splitter.take_changes()
+
+        thread_states = (
+            self._splitter.capture_thread.is_alive(),
+            self._splitter.compare_split_thread.is_alive(),
+            self._splitter.compare_reset_thread.is_alive(),
+        )
+        if thread_states != self._thread_states:
+            self._thread_states = thread_states
+            self._redraw_all = True
+
+        # Split images loading in the background don't report their progress,
+        # so check on them each poll until they're done
+        splits_loading = self._splitter.splits.loading
+        if splits_loading or self._splits_were_loading:
+            changes |= Change.COUNTDOWN
+        self._splits_were_loading = splits_loading
+
+        # Countdowns are worked out from their deadlines when they're read, so
+        # they don't report each tick either (starting and ending them does)
+        if (
+            self._splitter.split_delay_remaining is not None
+            or self._splitter.reset_delay_remaining is not None
+            or self._splitter.suspend_remaining is not None
+        ):
+            changes |= Change.COUNTDOWN
+
+        redraw_all = self._redraw_all
+        if redraw_all:
+            self._redraw_all = False
+            self._redraw_split_labels = True
+            changes = Change.ALL
+            self._update_video_title()
+            self._set_preview_rate()
+
+        self._update_preview_paused()
+        if changes & Change.FRAME:
+            self._video_feed_stale = True
+        if self._video_feed_stale:
+            now = self._splitter.clock.now()
+            if (
+                self._splitter.ui_frame is None
+                or now - self._last_preview_time >= self._preview_interval
+            ):
+                self._video_feed_stale = False
+                self._last_preview_time = now
+                self._update_video_feed()
+        if changes & Change.RESULT:
+            self._update_video_info_overlay()
+
+        if self._redraw_split_labels:
+            self._update_split_and_video_css()
+            self._update_split_image_labels()
+            self._redraw_split_labels = False
+            self._set_buttons_and_hotkeys_enabled()
+            self._update_video_record_overlay()
+            changes |= Change.MATCH  # The threshold may have changed
+
+        if changes & Change.COUNTDOWN:
+            self._update_split_delay_suspend()
+        if changes & Change.MATCH:
+            self._update_match_percents()
+            self._update_pause_button()
 
     def _update_video_feed(self) -> None:
         """Clear video if video is down; update video if video is alive."""
         if settings.get_bool("SHOW_MIN_VIEW"):
             return
 
-        frame = self._splitter.frame_pixmap
+        frame = self._splitter.ui_frame
         video = self._main_window.video_display
 
-        # Video not connected, but video frame on UI
+        # Video not connected, but video frame on UI. (The video can also be
+        # connected with no frame, e.g. right after leaving minimal view, or
+        # while the preview is paused)
         if frame is None:
-            if video.text() == "":
-                video.setText(self._main_window.video_display_txt)
+            video.set_frame(None)
+            if not self._splitter.capture_thread.is_alive():
+                text = self._main_window.video_display_txt
+            elif self._preview_paused_while_running:
+                text = self._main_window.video_preview_paused_txt
+            else:
+                text = ""
+            if video.text() != text:
+                video.setText(text)
         # Video is connected, update it
         else:
-            video.setPixmap(frame)
+            video.set_frame(frame, self._splitter.frame_generation)
+
+    def _set_preview_rate(self) -> None:
+        """Read PREVIEW_FPS into the values _poll uses to throttle the video
+        preview.
+
+        The preview can't be refreshed more often than _poll is called, so
+        "same as FPS" is an interval of 0.
+        """
+        preview_fps = settings.get_str("PREVIEW_FPS")
+        self._preview_off_while_running = preview_fps == "off while running"
+        if preview_fps.isdigit():
+            self._preview_interval = 1 / int(preview_fps)
+        else:
+            self._preview_interval = 0
+
+    def _update_preview_paused(self) -> None:
+        """Tell the splitter whether the video preview is shown, so it only
+        makes frames for the preview when they'll be seen.
+
+        The preview is paused while the main window is minimized, and while
+        the splitter is comparing split images if PREVIEW_FPS is "off while
+        running".
+        """
+        self._preview_paused_while_running = (
+            self._preview_off_while_running
+            and self._splitter.compare_split_thread.is_alive()
+        )
+        paused = (
+            self._preview_paused_while_running
+            or self._main_window.isMinimized()
+            or not self._main_window.isVisible()
+        )
+        if paused != self._splitter.preview_paused:
+            self._splitter.preview_paused = paused
+            self._video_feed_stale = True
 
     def _update_video_record_overlay(self) -> None:
         """Show recording symbol when RECORD_CLIPS is True and video's on."""
@@ -1771,11 +2146,16 @@ class UIController:
             splits_min_label.lower()  # Make sure it's not covering others
 
     def _update_split_delay_suspend(self) -> None:
-        """Display remaining delay or suspend time on the split image overlay."""
+        """Display remaining delay or suspend time on the split image overlay.
+
+        If none of those are happening but split images are still being loaded
+        in the background, display loading progress instead.
+        """
         overlay = self._main_window.split_overlay
         split_delay = self._splitter.split_delay_remaining
         reset_delay = self._splitter.reset_delay_remaining
         suspend = self._splitter.suspend_remaining
+        splits = self._splitter.splits
         min_view = settings.get_bool("SHOW_MIN_VIEW")
 
         # Splitter is delaying pre-split
@@ -1838,6 +2218,12 @@ class UIController:
                 else:  # At least 1 hour, show the whole thing
                     overlay.setText(pause_txt.format(str(delta)).split(".")[0])
 
+        # Split images are still loading in the background
+        elif splits.loading and not min_view:
+            overlay.setVisible(True)
+            loading_txt = self._main_window.overlay_loading_txt
+            overlay.setText(loading_txt.format(len(splits.list), splits.image_count))
+
         # Splitter isn't pausing or delaying, but the overlay is showing
         elif overlay.text() != "":
             overlay.setVisible(False)
@@ -1942,7 +2328,7 @@ class UIController:
         else:
             loop = self._splitter.splits.current_loop
             total_loops = self._splitter.splits.list[current_split_index].loops
-            total_splits = len(self._splitter.splits.list) - 1
+            total_splits = self._splitter.splits.get_last_index()
 
             # Enable split hotkey
             self._split_hotkey_enabled = True
@@ -2026,15 +2412,18 @@ class UIController:
         Called each time any key is pressed, whether or not the program is in
         focus. This method has two main uses:
             1) Updates users' custom hotkey bindings. It does this by checking
-                if a given hotkey "line edit" has focus and, if so, setting
-                flags so its name and key code are updated.
+                if a hotkey "line edit" has focus (see _track_hotkey_box_focus)
+                and, if so, setting flags so its name and key code are updated.
 
                 Uses a lock so the poller doesn't try to update these values as
                 they're being written (the worst case would be setting a hotkey
                 with the correct name but wrong key code -- unlikely but not
                 impossible).
 
-            2) If a hotkey is pressed, sets a flag indicating it was pressed.
+            2) If a hotkey is pressed, queues the flag indicating it was
+                pressed. The key is looked up in the input dispatcher's table
+                (see _set_hotkey_bindings), so settings aren't read here, and
+                repeat presses from a held-down key are ignored.
 
         We set flags when keys are pressed instead of directly calling a method
         because PyQt5 doesn't play nice when other threads try to manipulate
@@ -2056,7 +2445,48 @@ class UIController:
             return
 
         # Use #1 (set hotkey settings in settings window)
-        for hotkey_box in [
+        hotkey_box = self._focused_hotkey_box
+        if hotkey_box is not None:
+
+            # Set flags to be picked up by _react_to_settings_menu_flags
+            with self._hotkey_box_lock:
+                self._hotkey_box_to_change = hotkey_box
+                self._hotkey_box_key_code = key_code
+                self._hotkey_box_key_name = key_name
+
+            # Take focus off hotkey box so hotkey saves properly
+            # (needed on some Linux versions)
+            if platform.system() != "Windows" and platform.system() != "Darwin":
+                hotkey_box.clearFocus()
+
+            return
+
+        # Use #2 (queue the hotkey's flag for _react_to_hotkey_flags)
+        self._input_dispatcher.handle_key(key_name, key_code)
+
+    def _set_hotkey_bindings(self) -> None:
+        """Rebuild the input dispatcher's lookup table from the hotkey
+        settings. Must be called whenever a hotkey setting changes.
+        """
+        self._input_dispatcher.set_bindings(
+            {
+                flag: (settings.get_str(name), settings.get_str(code))
+                for flag, (name, code) in HOTKEY_FLAG_SETTINGS.items()
+            }
+        )
+
+    def _track_hotkey_box_focus(
+        self, old: Optional[QWidget], new: Optional[QWidget]
+    ) -> None:
+        """Remember which hotkey box has focus, if any, for _handle_key_press.
+
+        Connected to QApplication.focusChanged.
+
+        Args:
+            old (QWidget | None): The widget that lost focus.
+            new (QWidget | None): The widget that gained focus.
+        """
+        if new in (
             self._settings_window.split_hotkey_box,
             self._settings_window.reset_hotkey_box,
             self._settings_window.pause_hotkey_box,
@@ -2066,45 +2496,11 @@ class UIController:
             self._settings_window.next_hotkey_box,
             self._settings_window.screenshot_hotkey_box,
             self._settings_window.toggle_global_hotkeys_hotkey_box,
-        ]:
-            if hotkey_box.hasFocus():
-
-                # Set flags to be picked up by _react_to_settings_menu_flags
-                with self._hotkey_box_lock:
-                    self._hotkey_box_to_change = hotkey_box
-                    self._hotkey_box_key_code = key_code
-                    self._hotkey_box_key_name = key_name
-
-                # Take focus off hotkey box so hotkey saves properly
-                # (needed on some Linux versions)
-                if platform.system() != "Windows" and platform.system() != "Darwin":
-                    hotkey_box.clearFocus()
-
-                return
-
-        # Use #2 (set "hotkey pressed" flag for _react_to_hotkey_flags)
-        if not self._settings_window.isVisible():
-            for hotkey_pressed, setting in {
-                "_split_hotkey_pressed": ("SPLIT_HOTKEY_NAME", "SPLIT_HOTKEY_CODE"),
-                "_reset_hotkey_pressed": ("RESET_HOTKEY_NAME", "RESET_HOTKEY_CODE"),
-                "_undo_hotkey_pressed": ("UNDO_HOTKEY_NAME", "UNDO_HOTKEY_CODE"),
-                "_skip_hotkey_pressed": ("SKIP_HOTKEY_NAME", "SKIP_HOTKEY_CODE"),
-                "_previous_hotkey_pressed": ("PREV_HOTKEY_NAME", "PREV_HOTKEY_CODE"),
-                "_next_hotkey_pressed": ("NEXT_HOTKEY_NAME", "NEXT_HOTKEY_CODE"),
-                "_screenshot_hotkey_pressed": (
-                    "SCREENSHOT_HOTKEY_NAME",
-                    "SCREENSHOT_HOTKEY_CODE",
-                ),
-                "_toggle_hotkeys_hotkey_pressed": (
-                    "TOGGLE_HOTKEYS_HOTKEY_NAME",
-                    "TOGGLE_HOTKEYS_HOTKEY_CODE",
-                ),
-            }.items():
-                settings_name = settings.get_str(setting[0])
-                settings_code = settings.get_str(setting[1])
-                if str(key_name) == settings_name and str(key_code) == settings_code:
-                    # Use setattr because that allows us to use this dict format
-                    setattr(self, hotkey_pressed, True)
+            self._settings_window.next_split_set_hotkey_box,
+        ):
+            self._focused_hotkey_box = new
+        else:
+            self._focused_hotkey_box = None
 
     def _react_to_hotkey_flags(self) -> None:
         """React to the flags set in _handle_key_press for hotkeys.
@@ -2119,7 +2515,14 @@ class UIController:
 
         Pressing the split hotkey also sets a flag telling _record to save its
         current recording.
+
+        Hotkey presses queued by _handle_key_press are turned into flags here,
+        on the main thread.
         """
+        for hotkey_pressed in self._input_dispatcher.get_actions():
+            # Use setattr because the actions are the flags' names
+            setattr(self, hotkey_pressed, True)
+
         global_hotkeys_enabled = settings.get_bool("GLOBAL_HOTKEYS_ENABLED")
         hotkey_presses_allowed = (
             global_hotkeys_enabled or self._application.focusWindow() is not None
@@ -2177,6 +2580,47 @@ class UIController:
                 self._main_window.screenshot_button.click()
             self._screenshot_hotkey_pressed = False
 
+        elif self._next_split_set_hotkey_pressed:
+            if hotkey_presses_allowed:
+                self._request_next_split_set()
+            self._next_split_set_hotkey_pressed = False
+
+    def _react_to_state_server_commands(self) -> None:
+        """Carry out the commands sent to self._state_server by its clients.
+
+        Split and reset commands are treated like a split or reset found by
+        the splitter: the hotkey is pressed (or the action is sent to
+        LiveSplit Server), and _react_to_split_flags moves the split image if
+        the application doesn't hear the hotkey. Undo and skip commands work
+        like the undo and skip buttons, and pause commands like the pause
+        button. Unlike hotkeys, commands work whether or not the application
+        is in focus.
+        """
+        if self._state_server is None:
+            return
+
+        for command in self._state_server.get_commands():
+            if command == "split":
+                if self._split_hotkey_enabled:
+                    self._splitter.save_recording = True
+                    self._splitter.normal_split_action = True
+                    self._splitter.action_dispatcher.dispatch(SplitAction.SPLIT)
+
+            elif command == "reset":
+                self._splitter.reset_split_action = True
+                self._splitter.action_dispatcher.dispatch(SplitAction.RESET)
+
+            elif command == "undo":
+                if self._undo_hotkey_enabled:
+                    self._request_previous_split()
+
+            elif command == "skip":
+                if self._skip_hotkey_enabled:
+                    self._request_next_split()
+
+            elif command == "pause":
+                self._main_window.pause_button.click()
+
     def _react_to_settings_menu_flags(self) -> None:
         """React to the flags set in _handle_key_press for updating hotkeys.
 
@@ -2218,31 +2662,36 @@ class UIController:
             self._hotkey_box_to_change = None
 
     def _react_to_split_flags(self) -> None:
-        """Press a hotkey & go to next split when self._splitter sets flags.
+        """Go to next split when self._splitter sets flags.
+
+        The hotkeys themselves have already been pressed by
+        self._splitter.action_dispatcher, the moment the splitter decided on
+        the action, so they don't have to wait for the next poll.
 
         If the normal_split_action flag is set but no split hotkey is assigned,
-        or the hotkey wasn't heard by the application, request the next split
+        the hotkey wasn't heard by the application, or the split was sent to
+        LiveSplit Server instead of pressing the hotkey, request the next split
         image manually.
         """
-        # Pause split (press pause hotkey)
+        hotkeys_pressed = self._splitter.action_dispatcher.output is None
+
+        # Pause split (pause hotkey already pressed)
         if self._splitter.pause_split_action:
             self._splitter.pause_split_action = False
-            key_code = settings.get_str("PAUSE_HOTKEY_CODE")
-            if len(key_code) > 0:
-                self._keyboard.press_and_release(key_code)
+            self._post_split_event("pause split")
             self._request_next_split()
 
         # Dummy split (silently advance to next split image)
         elif self._splitter.dummy_split_action:
             self._splitter.dummy_split_action = False
+            self._post_split_event("dummy split")
             self._request_next_split()
 
-        # Normal split (press split hotkey)
+        # Normal split (split hotkey already pressed)
         elif self._splitter.normal_split_action:
             self._splitter.normal_split_action = False
+            self._post_split_event("split")
             key_code = settings.get_str("SPLIT_HOTKEY_CODE")
-            if len(key_code) > 0:
-                self._keyboard.press_and_release(key_code)
             # If key didn't get pressed, OR if it did get pressed but global
             # hotkeys are off and the app isn't in focus, move the split image
             # forward, since pressing the key on its own won't do that
@@ -2250,15 +2699,14 @@ class UIController:
                 self._application.focusWindow() is None
                 and not settings.get_bool("GLOBAL_HOTKEYS_ENABLED")
             )
-            if len(key_code) == 0 or hotkey_not_caught:
+            if len(key_code) == 0 or hotkey_not_caught or not hotkeys_pressed:
                 self._request_next_split()
 
-        # Reset splits (press reset hotkey)
+        # Reset splits (reset hotkey already pressed)
         elif self._splitter.reset_split_action:
             self._splitter.reset_split_action = False
+            self._post_split_event("reset")
             key_code = settings.get_str("RESET_HOTKEY_CODE")
-            if len(key_code) > 0:
-                self._keyboard.press_and_release(key_code)
             # If key didn't get pressed, OR if it did get pressed but global
             # hotkeys are off and the app isn't in focus, go back to the first
             # split image, since pressing the key on its own won't do that
@@ -2266,9 +2714,25 @@ class UIController:
                 self._application.focusWindow() is None
                 and not settings.get_bool("GLOBAL_HOTKEYS_ENABLED")
             )
-            if len(key_code) == 0 or hotkey_not_caught:
+            if len(key_code) == 0 or hotkey_not_caught or not hotkeys_pressed:
                 self._request_reset_splits()
 
+    def _post_split_event(self, event: str) -> None:
+        """Tell self._state_server's clients about a split action on the
+        current split image.
+
+        Args:
+            event (str): The kind of split action, e.g. "split" or "reset".
+        """
+        if self._state_server is None:
+            return
+
+        split_name = None
+        split_index = self._splitter.splits.current_image_index
+        if split_index is not None and split_index < len(self._splitter.splits.list):
+            split_name = self._splitter.splits.list[split_index].name
+        self._state_server.post_event(event, split_name)
+
     def _wake_display(self):
         """Keep the display awake when the splitter is active.
 
@@ -2304,8 +2768,9 @@ class UIController:
 
         Linux: Key release (untested, may not be reliable)
         """
-        if time.perf_counter() - self._last_wake_time >= self._wake_interval:
-            self._last_wake_time = time.perf_counter()
+        now = self._splitter.clock.now()
+        if now - self._last_wake_time >= self._wake_interval:
+            self._last_wake_time = now
             splitter_active = self._splitter.compare_split_thread.is_alive()
 
             # Key should be alphanumeric to work cross platform; beyond that it
@@ -27,12 +27,17 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 """Wrapper for separate keyboard manip libraries to support cross-platform dev.
+
+Also holds InputDispatcher, which turns the key presses heard by the listener
+into hotkey actions.
 """
 
 
 import platform
+import queue
 import time
-from typing import Callable, Optional, Tuple, Union
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 if platform.system() == "Windows" or platform.system() == "Darwin":
     # Don't import the whole pynput library since that takes a while
@@ -172,6 +177,191 @@ class UIKeyboardController:
         pass
 
 
+# Ignore repeat presses of the same hotkey that come less than this many
+# seconds apart (e.g. key repeat from a held-down key)
+HOTKEY_DEBOUNCE_SECS = 0.1
+
+
+class InputStats:
+    """How quickly InputDispatcher's hotkey presses have been picked up.
+
+    Latency is measured from the moment the listener heard a hotkey press to
+    the moment get_actions returned it.
+
+    Attributes:
+        events_debounced (int): The number of hotkey presses ignored because
+            they came too soon after the last press of the same hotkey.
+        events_handled (int): The number of hotkey presses returned by
+            get_actions.
+        last_latency_ms (float | None): The most recent latency, in
+            milliseconds, or None if no hotkey presses have been handled.
+        max_latency_ms (float): The highest latency, in milliseconds.
+        mean_latency_ms (float): The average latency, in milliseconds.
+    """
+
+    def __init__(
+        self,
+        events_handled: int,
+        events_debounced: int,
+        total_latency: float,
+        max_latency: float,
+        last_latency: Optional[float],
+    ) -> None:
+        """Convert the dispatcher's totals (in seconds) to a snapshot.
+
+        Args:
+            events_handled (int): The number of hotkey presses handled.
+            events_debounced (int): The number of hotkey presses ignored.
+            total_latency (float): The sum of every latency, in seconds.
+            max_latency (float): The highest latency, in seconds.
+            last_latency (float | None): The most recent latency, in seconds.
+        """
+        self.events_handled = events_handled
+        self.events_debounced = events_debounced
+        self.mean_latency_ms = total_latency / max(events_handled, 1) * 1000
+        self.max_latency_ms = max_latency * 1000
+        self.last_latency_ms = None if last_latency is None else last_latency * 1000
+
+    def describe(self) -> str:
+        """Summarize the stats in a sentence, e.g. for a tooltip.
+
+        Returns:
+            str: The summary.
+        """
+        if self.events_handled == 0:
+            summary = "No hotkey presses handled yet"
+        else:
+            summary = (
+                f"{self.events_handled} hotkey press(es) handled, "
+                f"{self.mean_latency_ms:.2f} ms average latency, "
+                f"{self.max_latency_ms:.2f} ms slowest"
+            )
+        return f"{summary} ({self.events_debounced} repeat press(es) ignored)"
+
+
+class InputDispatcher:
+    """Look up which hotkey action (if any) a key press is bound to.
+
+    handle_key is called by the keyboard listener's hook for every key pressed
+    anywhere on the system, so it does as little as possible: one dict lookup
+    in a table that is only rebuilt when the bindings change (see
+    set_bindings), a debounce check, and a put on a queue.SimpleQueue, which
+    doesn't take a Python-level lock. It never reads settings, so it never
+    waits on the settings backend.
+
+    The actions are read back with get_actions, which should be called from
+    the thread that acts on them (ui_controller._poll).
+
+    Attributes:
+        paused (bool): If True, handle_key ignores every key (e.g. while the
+            settings window is open, so users can pick new hotkeys without
+            triggering the old ones).
+    """
+
+    def __init__(self, debounce_secs: float = HOTKEY_DEBOUNCE_SECS) -> None:
+        """Set up the dispatcher with no bindings.
+
+        Args:
+            debounce_secs (float): Presses of the same hotkey less than this
+                many seconds apart are ignored. Default is
+                HOTKEY_DEBOUNCE_SECS.
+        """
+        self.paused = False
+        self._debounce_secs = debounce_secs
+        # (key name, key code) -> action. Replaced, never modified, so the
+        # listener thread always sees a whole table
+        self._bindings = MappingProxyType({})
+        # action -> time.perf_counter() when it was last heard. Only written
+        # by the listener thread, like _events_debounced
+        self._last_heard = {}
+        self._events_debounced = 0
+        # Holds (action, time.perf_counter() when it was heard) pairs
+        self._actions = queue.SimpleQueue()
+        # Only used by the thread calling get_actions and get_stats
+        self._events_handled = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._last_latency = None
+
+    def set_bindings(self, bindings: Dict[str, Tuple[str, str]]) -> None:
+        """Rebuild the lookup table. Call whenever a hotkey changes.
+
+        Args:
+            bindings (Dict[str, Tuple[str, str]]): Each action and the (key
+                name, key code) of its hotkey, as stored in settings. Actions
+                whose name or code is blank are left out.
+        """
+        table = {}
+        for action, (key_name, key_code) in bindings.items():
+            if key_name not in ("", "None") and key_code not in ("", "None"):
+                table[(key_name, key_code)] = action
+        self._bindings = MappingProxyType(table)
+
+    def handle_key(self, key_name: str, key_code: Union[str, int]) -> Optional[str]:
+        """Queue the action a key is bound to. Called by the listener's hook.
+
+        Args:
+            key_name (str): The key's name (see
+                UIKeyboardController.parse_key_info).
+            key_code (str | int): The key's code (see
+                UIKeyboardController.parse_key_info).
+
+        Returns:
+            str | None: The action that was queued, or None if the key isn't
+            bound, the dispatcher is paused, or the press was debounced.
+        """
+        if self.paused:
+            return None
+        action = self._bindings.get((str(key_name), str(key_code)))
+        if action is None:
+            return None
+
+        now = time.perf_counter()
+        last_heard = self._last_heard.get(action)
+        self._last_heard[action] = now
+        if last_heard is not None and now - last_heard < self._debounce_secs:
+            self._events_debounced += 1
+            return None
+
+        self._actions.put((action, now))
+        return action
+
+    def get_actions(self) -> List[str]:
+        """Take every action queued since the last call, oldest first.
+
+        Returns:
+            List[str]: The actions.
+        """
+        actions = []
+        now = time.perf_counter()
+        while True:
+            try:
+                action, heard_at = self._actions.get_nowait()
+            except queue.Empty:
+                break
+            latency = now - heard_at
+            self._events_handled += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+            self._last_latency = latency
+            actions.append(action)
+        return actions
+
+    def get_stats(self) -> InputStats:
+        """Get how quickly hotkey presses have been picked up so far.
+
+        Returns:
+            InputStats: The stats.
+        """
+        return InputStats(
+            self._events_handled,
+            self._events_debounced,
+            self._total_latency,
+            self._max_latency,
+            self._last_latency,
+        )
+
+
 if __name__ == "__main__":
 
     # Test key names and codes -- press any key to see its values
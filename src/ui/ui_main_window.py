@@ -34,6 +34,8 @@ import os
 import platform
 from typing import Optional
 
+import numpy
+
 from PyQt5.QtCore import (
     pyqtSignal,
     QEvent,
@@ -43,7 +45,7 @@ from PyQt5.QtCore import (
     Qt,
     QTimer,
 )
-from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtGui import QImage, QMouseEvent, QPainter, QPaintEvent
 from PyQt5.QtWidgets import (
     QAction,
     QApplication,
@@ -96,6 +98,9 @@ class UIMainWindow(QMainWindow):
             especially if they're running the program as root (e.g. on Linux)).
         err_not_found_msg (QMessageBox): Message to display if the
             controller attempts to open a file or directory that doesn't exist.
+        first_painted (pyqtSignal): Emitted the first time the window is
+            painted, so ui_controller can hold off on slow startup work until
+            the window is visible.
         help_action (QAction): Adds a menu bar item which triggers opening the
             user manual.
         highest_percent (QLabel): Displays the highest image match
@@ -144,6 +149,8 @@ class UIMainWindow(QMainWindow):
             screenshots on capture" enabled.
         settings_action (QAction): Adds a menu bar item which triggers opening
             the settings menu.
+        similar_images_msg (QMessageBox): Message to display if split images
+            in the current directory are similar enough to trigger each other.
         skip_button (QPushButton): Allows the user to move to the next
             split. Does the same thing as pressing the skip split hotkey.
         split_dir_button (QPushButton): Allows the user to select a split
@@ -160,7 +167,8 @@ class UIMainWindow(QMainWindow):
         split_loop_label_reset_txt (QLabel): Tells the user the currently
             displayed image is the reset image.
         split_overlay (QLabel): Informs the user that a pre-split delay
-            or post-split pause is taking place.
+            or post-split pause is taking place, or that split images are
+            still loading.
         split_name_label (QLabel): Shows the current split name.
         threshold_percent (QLabel): Displays the threshold image match
             percent for the current split, or a null string (see
@@ -180,10 +188,12 @@ class UIMainWindow(QMainWindow):
             "open" button in update_available_msg.
         never_button_txt (str): The text that appears on the
             "don't ask again" button in update_available_msg.
-        video_display (QLabel): Display video feed if connected, or else
+        video_display (FrameQLabel): Display video feed if connected, or else
             show the video_display_txt.
         video_display_txt (str): Informs the user there is no
             video connected currently.
+        video_preview_paused_txt (str): Informs the user the video preview is
+            off while the splitter is running.
         video_title (QLabel): Show information about the current video if
             loaded.
         video_down_txt_min (str): In minimal view, inform the user
@@ -194,6 +204,8 @@ class UIMainWindow(QMainWindow):
             the video is connected.
     """
 
+    first_painted = pyqtSignal()
+
     def __init__(self) -> None:
         """Initialize all widgets in the main window."""
         #################
@@ -210,6 +222,7 @@ class UIMainWindow(QMainWindow):
         self.setWindowTitle(f"Pilgrim Autosplitter {VERSION_NUMBER}")
 
         self._mouse_allowed = True  # For usage, see self.eventFilter
+        self._painted = False  # For usage, see self.paintEvent
 
         # Menu bar
         self.settings_action = QAction("Open settings menu", self)
@@ -270,13 +283,14 @@ class UIMainWindow(QMainWindow):
         self.video_live_txt = "Video feed"
         self.video_down_txt = ""
 
-        self.video_display = ClickableQLabel(self._container)
+        self.video_display = FrameQLabel(self._container)
         self.video_display.setAlignment(Qt.AlignCenter)
         self.video_display.setObjectName("video_label")
         # Prevent clicking this widget when window is out of focus
         # from having any effect (see self.eventFilter)
         self.video_display.installEventFilter(self)
         self.video_display_txt = "No video feed detected"
+        self.video_preview_paused_txt = "Preview paused while splitting"
 
         self.video_record_overlay = QLabel(self._container)
         self.video_record_overlay.setAlignment(Qt.AlignCenter)
@@ -336,6 +350,7 @@ class UIMainWindow(QMainWindow):
         self.overlay_reset_delay_txt_mins = "Resetting in {}"
         self.overlay_pause_txt_secs = "Paused for {:.1f} s"
         self.overlay_pause_txt_mins = "Paused for {}"
+        self.overlay_loading_txt = "Loading split images ({} / {})"
 
         self.split_info_min_label = QLabel(self._container)
         self.split_info_min_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
@@ -476,6 +491,12 @@ class UIMainWindow(QMainWindow):
         )
         self.screenshot_err_no_file.setIcon(QMessageBox.Warning)
 
+        # Similar split images warning message box
+        # (No parent widget -- parent widget keeps it from closing)
+        self.similar_images_msg = QMessageBox()
+        self.similar_images_msg.setText("Some split images look alike")
+        self.similar_images_msg.setIcon(QMessageBox.Warning)
+
         ################################
         #                              #
         # Widgets (Right side buttons) #
@@ -588,6 +609,17 @@ class UIMainWindow(QMainWindow):
         )
         self.err_invalid_dir_msg.setIcon(QMessageBox.Warning)
 
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """Paint the window, and emit first_painted the first time.
+
+        Args:
+            event (QPaintEvent): The paint event.
+        """
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
+
     def eventFilter(self, obj: QObject, event: QEvent):
         """Watch for QEvent.WindowActivate, which is triggered when the window
         was not in focus and is brought into focus.
@@ -782,6 +814,8 @@ class ClickableQLabel(QLabel):
             Will not reflect a mouse hover if the hover began while the mouse
             was clicked on another widget and the mouse has not yet been
             released from that click.
+        mouse_state_changed (pyqtSignal): Emitted when clicked or hovered
+            changes.
         valid_double_click (pyqtSignal): Emitted when the widget is clicked and
             released twice within 200 ms while the mouse is over the widget.
         valid_single_click (pyqtSignal): Emitted when the widget is clicked and
@@ -791,6 +825,7 @@ class ClickableQLabel(QLabel):
 
     valid_single_click = pyqtSignal()
     valid_double_click = pyqtSignal()
+    mouse_state_changed = pyqtSignal()
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         """Inherit from QLabel and set default attribute values.
@@ -823,6 +858,7 @@ class ClickableQLabel(QLabel):
         if event.button() == Qt.LeftButton:
             self.clicked = True
             self.double_click = False
+            self.mouse_state_changed.emit()
             QTimer.singleShot(
                 QApplication.doubleClickInterval(),
                 lambda event=event: self.mouseSingleClickEvent(event),
@@ -860,6 +896,7 @@ class ClickableQLabel(QLabel):
             event: The mouse press event. See help(PyQt5.QtCore.QEvent).
         """
         self.clicked = self.double_click = True
+        self.mouse_state_changed.emit()
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         """Set self.clicked to False when the left mouse button is released.
@@ -875,6 +912,7 @@ class ClickableQLabel(QLabel):
         """
         if event.button() == Qt.LeftButton:
             self.clicked = False
+            self.mouse_state_changed.emit()
 
             if self.delayed_single_click:
                 self.delayed_single_click = False
@@ -895,7 +933,10 @@ class ClickableQLabel(QLabel):
             event (QMouseEvent | None): The mouse drag event.
                 See help(PyQt5.QtGui.QMouseEvent).
         """
-        self.hovered = event.pos() in self.rect()
+        hovered = event.pos() in self.rect()
+        if hovered != self.hovered:
+            self.hovered = hovered
+            self.mouse_state_changed.emit()
 
     def enterEvent(self, event: QMouseEvent) -> None:
         """Detect when the unclicked mouse enters the widget.
@@ -909,6 +950,7 @@ class ClickableQLabel(QLabel):
                 See help(PyQt5.QtGui.QMouseEvent).
         """
         self.hovered = True
+        self.mouse_state_changed.emit()
 
     def leaveEvent(self, event: QMouseEvent) -> None:
         """Detect when the unclicked mouse leaves the widget.
@@ -922,6 +964,93 @@ class ClickableQLabel(QLabel):
                 See help(PyQt5.QtGui.QMouseEvent).
         """
         self.hovered = False
+        self.mouse_state_changed.emit()
+
+
+class FrameQLabel(ClickableQLabel):
+    """ClickableQLabel that paints video frames itself.
+
+    Showing a frame with QLabel.setPixmap means converting it to a QPixmap and
+    updating the label's layout, every frame. Instead, this class wraps the
+    frame's memory in a QImage (no copy) and draws it in paintEvent. It only
+    repaints when a new frame arrives, and only scales the frame if it isn't
+    the label's size (e.g. for a moment after the aspect ratio changes).
+
+    Text set with setText (e.g. when there's no video) is shown when there's
+    no frame.
+
+    Attributes:
+        generation (int | None): The generation of the frame being shown, or
+            None if there isn't one.
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        """Inherit from ClickableQLabel and set default attribute values.
+
+        Args:
+            parent (QWidget, optional): The parent class. Defaults to None.
+        """
+        ClickableQLabel.__init__(self, parent)
+        self.generation = None
+        self._frame = None
+        self._image = None
+
+    def set_frame(self, frame: Optional[numpy.ndarray], generation: int = 0) -> None:
+        """Show a frame, repainting only if it's a new one.
+
+        Args:
+            frame (numpy.ndarray | None): A 3-channel BGR image. It must not be
+                modified while it's shown. If None, stop showing a frame.
+            generation (int): Identifies the frame. If it's the same as the
+                frame being shown, nothing happens. Default is 0.
+        """
+        if frame is None:
+            if self._image is not None:
+                self.generation = self._frame = self._image = None
+                self.update()
+            return
+
+        if generation == self.generation:
+            return
+
+        if self._image is None and self.text() != "":
+            self.setText("")
+
+        # Keep a reference to frame, since the QImage doesn't
+        self._frame = frame
+        self._image = QImage(
+            frame.data,
+            frame.shape[1],
+            frame.shape[0],
+            frame.strides[0],
+            QImage.Format_BGR888,
+        )
+        self.generation = generation
+        self.update()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """Paint the label (background, border, and any text), then the frame.
+
+        The frame is centered, like QLabel centers a pixmap, if it's the
+        label's size, and scaled to fit the label (keeping its aspect ratio)
+        otherwise.
+
+        Args:
+            event (QPaintEvent): The paint event.
+        """
+        QLabel.paintEvent(self, event)
+        if self._image is None:
+            return
+
+        painter = QPainter(self)
+        contents = self.contentsRect()
+        image_size = self._image.size()
+        if image_size != self.size():
+            image_size.scale(contents.size(), Qt.KeepAspectRatio)
+        target = QRect(0, 0, image_size.width(), image_size.height())
+        target.moveCenter(contents.center())
+        painter.drawImage(target, self._image)
+        painter.end()
 
 
 class ClickableLineEdit(QLineEdit):
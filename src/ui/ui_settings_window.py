@@ -74,6 +74,8 @@ class UISettingsWindow(QDialog):
         check_for_updates_checkbox (QCheckBox): Enable and disable checking for
             new versions on launch.
         close_window_shortcut (QShortcut): Same as cancel_button.
+        compress_frames_checkbox (QCheckBox): Store and allow selection of
+            whether frames are compressed while waiting for a split.
         delay_spinbox (QDoubleSpinBox): Store and allow
             selection of default delay before splitting.
         pause_spinbox (QDoubleSpinBox): Store and allow
@@ -87,14 +89,26 @@ class UISettingsWindow(QDialog):
             whether global hotkeys are enabled.
         decimals_spinbox (QSpinBox): Store and allow selection of
             amount of decimal places shown when displaying match percents.
+        livesplit_address_line_edit (QLineEdit): Store and allow selection
+            of the address of LiveSplit Server.
         next_hotkey_box (KeyLineEdit): Store and allow selection of
             next split hotkey.
+        next_split_set_hotkey_box (KeyLineEdit): Store and allow selection of
+            next split set hotkey.
         open_screenshots_checkbox (QCheckBox): Store and allow selection of
             whether screenshots are opened when they are captured.
         pause_hotkey_box (KeyLineEdit): Store and allow selection of
             pause timer hotkey.
+        post_split_spinbox (QDoubleSpinBox): Store and allow selection of
+            seconds of video saved after each split.
+        pre_split_spinbox (QDoubleSpinBox): Store and allow selection of
+            seconds of video saved before each split.
+        preview_fps_combo_box (QComboBox): Store and allow selection of how
+            often the video preview is refreshed.
         previous_hotkey_box (KeyLineEdit): Store and allow
             selection of previous split hotkey.
+        record_mode_combo_box (QComboBox): Store and allow selection of
+            what each recorded clip contains.
         reset_hotkey_box (KeyLineEdit): Store and allow selection of
             reset splits hotkey.
         save_button (QPushButton): Save all settings and close the window.
@@ -104,8 +118,14 @@ class UISettingsWindow(QDialog):
             skip split hotkey.
         split_hotkey_box (KeyLineEdit): Store and allow selection
             of split hotkey.
+        split_output_combo_box (QComboBox): Store and allow selection of
+            whether splits are sent as hotkeys or to LiveSplit Server.
+        split_set_memory_spinbox (QSpinBox): Store and allow selection of
+            how much memory can be used to keep split image folders loaded.
         start_with_video_checkbox (QCheckBox): Store and allow selection of
             whether this program should try to open a video feed on startup.
+        sync_game_time_checkbox (QCheckBox): Store and allow selection of
+            whether LiveSplit's game time is set on each split.
         theme_combo_box (QComboBox): Store and allow selection of UI theme.
         toggle_global_hotkeys_hotkey_box (KeyLineEdit): Store and allow
             selection of toggle global hotkeys enabled hotkey.
@@ -138,7 +158,7 @@ class UISettingsWindow(QDialog):
         # Left side widgets are, generally, this many pixels high
         self._LEFT_SIDE_WIDGET_HEIGHT = 27
 
-        self.setFixedSize(610, 392)
+        self.setFixedSize(880, 422)
         self.setWindowTitle("Settings")
 
         self.close_window_shortcut = QShortcut("ctrl+w", self)
@@ -157,7 +177,7 @@ class UISettingsWindow(QDialog):
 
         # Border
         self.border = QFrame(self)
-        self.border.setGeometry(QRect(10, 10, 590, 372))
+        self.border.setGeometry(QRect(10, 10, 860, 402))
         self.border.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         self.border.setObjectName("border")
 
@@ -407,6 +427,25 @@ class UISettingsWindow(QDialog):
             self._checkbox_shadow
         )
 
+        # Split set memory spinbox
+        self._split_set_memory_label = QLabel("Split set memory:", self)
+        self._split_set_memory_label.setGeometry(
+            QRect(20 + self._LEFT, 370 + self._TOP, 141, 31)
+        )
+        self._split_set_memory_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._split_set_memory_label.setToolTip(
+            "Keep recently used split image folders loaded, up to this much memory"
+        )
+
+        self.split_set_memory_spinbox = QSpinBox(self)
+        self.split_set_memory_spinbox.setGeometry(
+            QRect(160 + self._LEFT, 372 + self._TOP, 82, 27)
+        )
+        self.split_set_memory_spinbox.setMinimum(0)
+        self.split_set_memory_spinbox.setMaximum(16384)
+        self.split_set_memory_spinbox.setSingleStep(64)
+        self.split_set_memory_spinbox.setSuffix(" MB")
+
         ######################
         #                    #
         # Right Side Widgets #
@@ -414,11 +453,11 @@ class UISettingsWindow(QDialog):
         ######################
 
         # Hotkey header
-        self._hotkey_settings_label = QLabel("Hotkeys (click + type to change):", self)
-        self._hotkey_settings_label.setGeometry(
+        self.hotkey_settings_label = QLabel("Hotkeys (click + type to change):", self)
+        self.hotkey_settings_label.setGeometry(
             QRect(300 + self._LEFT, 10 + self._TOP, 216, 31)
         )
-        self._hotkey_settings_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.hotkey_settings_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
 
         # Split hotkey
         self.split_hotkey_box = KeyLineEdit(self)
@@ -647,16 +686,270 @@ class UISettingsWindow(QDialog):
             lambda: setattr(self.toggle_global_hotkeys_hotkey_box, "key_code", "")
         )
 
+        # Next split set hotkey
+        self.next_split_set_hotkey_box = KeyLineEdit(self)
+        self.next_split_set_hotkey_box.setGeometry(
+            QRect(410 + self._LEFT, 312 + self._TOP, 121, 25)
+        )
+        self.next_split_set_hotkey_box.setReadOnly(True)
+
+        self._next_split_set_hotkey_label = QLabel("Next split set", self)
+        self._next_split_set_hotkey_label.setGeometry(
+            QRect(300 + self._LEFT, 310 + self._TOP, 100, 31)
+        )
+        self._next_split_set_hotkey_label.setTextInteractionFlags(
+            Qt.TextSelectableByMouse
+        )
+        self._next_split_set_hotkey_label.setToolTip(
+            "Switch to the next recently used split image folder"
+        )
+
+        self._next_split_set_hotkey_clear_button = QPushButton("clear", self)
+        self._next_split_set_hotkey_clear_button.setGeometry(
+            QRect(545 + self._LEFT, 315 + self._TOP, 39, 20)
+        )
+        self._next_split_set_hotkey_clear_button.setFocusPolicy(Qt.NoFocus)
+        self._next_split_set_hotkey_clear_button.clicked.connect(
+            lambda: self.next_split_set_hotkey_box.setText("")
+        )
+        self._next_split_set_hotkey_clear_button.clicked.connect(
+            lambda: setattr(self.next_split_set_hotkey_box, "key_code", "")
+        )
+
+        ##########################
+        #                        #
+        # Clip Recording Widgets #
+        #                        #
+        ##########################
+
+        # Clip recording header
+        self._clip_settings_label = QLabel("Clip recording:", self)
+        self._clip_settings_label.setGeometry(
+            QRect(620 + self._LEFT, 10 + self._TOP, 216, 31)
+        )
+        self._clip_settings_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        # Record mode combobox
+        self._record_mode_label = QLabel("Clips contain:", self)
+        self._record_mode_label.setGeometry(
+            QRect(620 + self._LEFT, 40 + self._TOP, 131, 31)
+        )
+        self._record_mode_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._record_mode_label.setToolTip(
+            "Record each whole split, or keep the last few seconds in memory and "
+            "only save the video around each split"
+        )
+
+        self.record_mode_combo_box = QComboBox(self)
+        self.record_mode_combo_box.setGeometry(
+            QRect(740 + self._LEFT, 44 + self._TOP, 110, 23)
+        )
+        self.record_mode_combo_box.addItems(["whole split", "around split"])
+
+        # Seconds before split spinbox
+        self._pre_split_label = QLabel("Secs. before split:", self)
+        self._pre_split_label.setGeometry(
+            QRect(620 + self._LEFT, 70 + self._TOP, 131, 31)
+        )
+        self._pre_split_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._pre_split_label.setToolTip(
+            "Seconds of video saved before each split (around split mode only)"
+        )
+
+        self.pre_split_spinbox = QDoubleSpinBox(self)
+        self.pre_split_spinbox.setGeometry(
+            QRect(740 + self._LEFT, 72 + self._TOP, 82, 27)
+        )
+        self.pre_split_spinbox.setDecimals(1)
+        self.pre_split_spinbox.setMinimum(0)
+        self.pre_split_spinbox.setMaximum(60)
+        self.pre_split_spinbox.setSingleStep(0.5)
+
+        # Seconds after split spinbox
+        self._post_split_label = QLabel("Secs. after split:", self)
+        self._post_split_label.setGeometry(
+            QRect(620 + self._LEFT, 100 + self._TOP, 131, 31)
+        )
+        self._post_split_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._post_split_label.setToolTip(
+            "Seconds of video saved after each split (around split mode only)"
+        )
+
+        self.post_split_spinbox = QDoubleSpinBox(self)
+        self.post_split_spinbox.setGeometry(
+            QRect(740 + self._LEFT, 102 + self._TOP, 82, 27)
+        )
+        self.post_split_spinbox.setDecimals(1)
+        self.post_split_spinbox.setMinimum(0)
+        self.post_split_spinbox.setMaximum(60)
+        self.post_split_spinbox.setSingleStep(0.5)
+
+        # Compress frames checkbox
+        self._compress_frames_label = QLabel("Compress frames:", self)
+        self._compress_frames_label.setGeometry(
+            QRect(620 + self._LEFT, 130 + self._TOP, 131, 31)
+        )
+        self._compress_frames_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._compress_frames_label.setToolTip(
+            "Store frames as JPEGs while waiting for a split, using much less "
+            "memory (around split mode only)"
+        )
+
+        self.compress_frames_checkbox = QCheckBox(self)
+        self.compress_frames_checkbox.setGeometry(
+            QRect(741 + self._LEFT, 139 + self._TOP, 13, 13)
+        )
+
+        self._compress_frames_checkbox_helper_label = QLabel(self)
+        self._compress_frames_checkbox_helper_label.setGeometry(
+            QRect(741 + self._LEFT, 138 + self._TOP, 14, 15)
+        )
+        self._compress_frames_checkbox_helper_label.setObjectName("checkbox_helper")
+        self._compress_frames_checkbox_helper_label.setAttribute(
+            Qt.WidgetAttribute.WA_TransparentForMouseEvents
+        )
+        self._compress_frames_checkbox_helper_label.setGraphicsEffect(
+            self._checkbox_shadow
+        )
+
+        #########################
+        #                       #
+        # Video Preview Widgets #
+        #                       #
+        #########################
+
+        # Video preview header
+        self._preview_settings_label = QLabel("Video preview:", self)
+        self._preview_settings_label.setGeometry(
+            QRect(620 + self._LEFT, 170 + self._TOP, 216, 31)
+        )
+        self._preview_settings_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        # Preview FPS combobox
+        self._preview_fps_label = QLabel("Preview FPS:", self)
+        self._preview_fps_label.setGeometry(
+            QRect(620 + self._LEFT, 200 + self._TOP, 131, 31)
+        )
+        self._preview_fps_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._preview_fps_label.setToolTip(
+            "How often the video feed is redrawn. Splits are still checked at the "
+            "full FPS, so a lower rate only saves CPU"
+        )
+
+        self.preview_fps_combo_box = QComboBox(self)
+        self.preview_fps_combo_box.setGeometry(
+            QRect(740 + self._LEFT, 204 + self._TOP, 110, 23)
+        )
+        self.preview_fps_combo_box.addItems(
+            ["same as FPS", "30", "15", "10", "off while running"]
+        )
+
+        ########################
+        #                      #
+        # Split Output Widgets #
+        #                      #
+        ########################
+
+        # Split output header
+        self._split_output_settings_label = QLabel("Split output:", self)
+        self._split_output_settings_label.setGeometry(
+            QRect(620 + self._LEFT, 240 + self._TOP, 216, 31)
+        )
+        self._split_output_settings_label.setTextInteractionFlags(
+            Qt.TextSelectableByMouse
+        )
+
+        # Split output combobox
+        self._split_output_label = QLabel("Send splits as:", self)
+        self._split_output_label.setGeometry(
+            QRect(620 + self._LEFT, 270 + self._TOP, 131, 31)
+        )
+        self._split_output_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._split_output_label.setToolTip(
+            "Press the split hotkeys, or send splits straight to LiveSplit's "
+            "server component (Control > Start TCP Server in LiveSplit)"
+        )
+
+        self.split_output_combo_box = QComboBox(self)
+        self.split_output_combo_box.setGeometry(
+            QRect(740 + self._LEFT, 274 + self._TOP, 110, 23)
+        )
+        self.split_output_combo_box.addItems(["hotkeys", "LiveSplit Server"])
+
+        # LiveSplit Server address line edit
+        self._livesplit_address_label = QLabel("Server address:", self)
+        self._livesplit_address_label.setGeometry(
+            QRect(620 + self._LEFT, 300 + self._TOP, 131, 31)
+        )
+        self._livesplit_address_label.setTextInteractionFlags(
+            Qt.TextSelectableByMouse
+        )
+        self._livesplit_address_label.setToolTip(
+            "The host and port of LiveSplit Server, e.g. localhost:16834"
+        )
+
+        self.livesplit_address_line_edit = QLineEdit(self)
+        self.livesplit_address_line_edit.setGeometry(
+            QRect(740 + self._LEFT, 302 + self._TOP, 110, 25)
+        )
+
+        # Sync game time checkbox
+        self._sync_game_time_label = QLabel("Sync game time:", self)
+        self._sync_game_time_label.setGeometry(
+            QRect(620 + self._LEFT, 330 + self._TOP, 131, 31)
+        )
+        self._sync_game_time_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._sync_game_time_label.setToolTip(
+            "Set LiveSplit's game time to when each split actually happened, "
+            "leaving out the time taken to notice it (LiveSplit Server only)"
+        )
+
+        self.sync_game_time_checkbox = QCheckBox(self)
+        self.sync_game_time_checkbox.setGeometry(
+            QRect(741 + self._LEFT, 339 + self._TOP, 13, 13)
+        )
+
+        self._sync_game_time_checkbox_helper_label = QLabel(self)
+        self._sync_game_time_checkbox_helper_label.setGeometry(
+            QRect(741 + self._LEFT, 338 + self._TOP, 14, 15)
+        )
+        self._sync_game_time_checkbox_helper_label.setObjectName("checkbox_helper")
+        self._sync_game_time_checkbox_helper_label.setAttribute(
+            Qt.WidgetAttribute.WA_TransparentForMouseEvents
+        )
+        self._sync_game_time_checkbox_helper_label.setGraphicsEffect(
+            self._checkbox_shadow
+        )
+
+        # Split latency (read-only, filled in when the window is opened)
+        self._split_latency_label = QLabel("Split latency:", self)
+        self._split_latency_label.setGeometry(
+            QRect(620 + self._LEFT, 360 + self._TOP, 131, 31)
+        )
+        self._split_latency_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._split_latency_label.setToolTip(
+            "The average time from when a split happened (when its frame was "
+            "captured, plus any delay) to when it was sent"
+        )
+
+        self.split_latency_value_label = QLabel(self)
+        self.split_latency_value_label.setGeometry(
+            QRect(740 + self._LEFT, 360 + self._TOP, 110, 31)
+        )
+        self.split_latency_value_label.setTextInteractionFlags(
+            Qt.TextSelectableByMouse
+        )
+
         # Cancel button
         self.cancel_button = QPushButton("Cancel", self)
         self.cancel_button.setGeometry(
-            QRect(319 + self._LEFT, 326 + self._TOP, 111, 31)
+            QRect(319 + self._LEFT, 356 + self._TOP, 111, 31)
         )
         self.cancel_button.setFocusPolicy(Qt.NoFocus)
 
         # Save button
         self.save_button = QPushButton("Save", self)
-        self.save_button.setGeometry(QRect(459 + self._LEFT, 326 + self._TOP, 111, 31))
+        self.save_button.setGeometry(QRect(459 + self._LEFT, 356 + self._TOP, 111, 31))
         self.save_button.setFocusPolicy(Qt.NoFocus)
 
     def event(self, event: QWidget.event) -> Union[bool, QWidget.event]:
@@ -28,6 +28,10 @@
 
 """Test settings.py."""
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 import requests
 from pathlib import Path
@@ -49,6 +53,96 @@ class TestURLs:
         assert self.get_url_code(settings.USER_MANUAL_URL) == 200
 
 
+class TestFileSettings:
+    """Test the JSON file settings store used without Qt."""
+
+    def test_values_persist(self, tmp_path):
+        path = str(tmp_path / "settings" / "settings.json")
+        file_settings = settings.FileSettings(path)
+        settings.set_value("test", 1.5, settings=file_settings)
+        assert file_settings.contains("test")
+        assert not file_settings.contains("missing")
+        assert file_settings.value("missing") is None
+
+        reopened = settings.FileSettings(path)
+        assert settings.get_float("test", settings=reopened) == 1.5
+        assert settings.get_str("missing", settings=reopened) == "None"
+
+    def test_set_program_vals(self, tmp_path):
+        file_settings = settings.FileSettings(str(tmp_path / "settings.json"))
+        settings.set_program_vals(file_settings)
+        assert settings.get_bool("SETTINGS_SET", settings=file_settings)
+        assert settings.get_int("FPS", settings=file_settings) == 30
+
+
+class ReleaseHandler(BaseHTTPRequestHandler):
+    """Stand in for GitHub's latest release endpoint."""
+
+    etag = '"abc123"'
+    version = "v9.9.9"
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"tag_name": self.version}).encode()
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestGetLatestVersion:
+    """Test the cached update check against a local server."""
+
+    @pytest.fixture(autouse=True)
+    def release_server(self, tmp_path):
+        """Start a local release server and a blank settings file.
+
+        Yields:
+            str: The server's URL.
+        """
+        ReleaseHandler.requests_seen = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), ReleaseHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.url = f"http://127.0.0.1:{server.server_address[1]}/releases/latest"
+        self.settings = settings.FileSettings(str(tmp_path / "settings.json"))
+        settings.set_program_vals(self.settings)
+        yield self.url
+        server.shutdown()
+        server.server_close()
+
+    def test_cached_within_ttl(self):
+        assert settings.get_latest_version(self.url, self.settings) == "v9.9.9"
+        assert settings.get_latest_version(self.url, self.settings) == "v9.9.9"
+        assert len(ReleaseHandler.requests_seen) == 1
+        assert settings.get_str("LATEST_VERSION_ETAG", self.settings) == '"abc123"'
+
+    def test_conditional_request_after_ttl(self):
+        settings.get_latest_version(self.url, self.settings)
+        settings.set_value("LATEST_VERSION_CHECK_TIME", 0, self.settings)
+        assert settings.get_latest_version(self.url, self.settings) == "v9.9.9"
+        assert len(ReleaseHandler.requests_seen) == 2
+        assert ReleaseHandler.requests_seen[1]["If-None-Match"] == '"abc123"'
+        assert settings.get_float("LATEST_VERSION_CHECK_TIME", self.settings) > 0
+
+    def test_server_down(self):
+        down_url = "http://127.0.0.1:1/releases/latest"
+        assert settings.get_latest_version(down_url, self.settings) == (
+            settings.VERSION_NUMBER
+        )
+        settings.set_value("LATEST_VERSION", "v1.2.3", self.settings)
+        assert settings.get_latest_version(down_url, self.settings) == "v1.2.3"
+
+
 class TestSettingsFunctionsWithDummySettings:
     """Test functions in settings.py that rely on a "settings" var."""
 
@@ -0,0 +1,99 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Test action_dispatcher.py."""
+
+import threading
+import time
+
+from splitter import action_dispatcher
+from splitter.action_dispatcher import ActionDispatcher, SplitAction
+
+
+class TestActionDispatcher:
+    """Test pressing hotkeys on the output thread."""
+
+    def test_presses_hotkeys_in_order(self, monkeypatch):
+        hotkeys = {"SPLIT_HOTKEY_CODE": "f1", "RESET_HOTKEY_CODE": "f2"}
+        monkeypatch.setattr(
+            action_dispatcher.settings, "get_str", lambda key: hotkeys.get(key, "")
+        )
+        pressed = []
+        sent = []
+        dispatcher = ActionDispatcher(press_key=pressed.append)
+        dispatcher.on_action_sent = lambda action, latency: sent.append(action)
+
+        dispatcher.dispatch(SplitAction.SPLIT)
+        dispatcher.dispatch(SplitAction.PAUSE)  # No pause hotkey set
+        dispatcher.dispatch(SplitAction.RESET)
+        dispatcher.stop()
+
+        assert pressed == ["f1", "f2"]
+        assert sent == [SplitAction.SPLIT, SplitAction.RESET]
+        stats = dispatcher.get_stats()
+        assert stats.actions_sent == 2
+        assert 0 <= stats.mean_latency_ms <= stats.max_latency_ms
+
+    def test_press_happens_off_the_calling_thread(self, monkeypatch):
+        monkeypatch.setattr(action_dispatcher.settings, "get_str", lambda key: "f1")
+        pressed_on = []
+        dispatcher = ActionDispatcher(
+            press_key=lambda key_code: pressed_on.append(threading.current_thread())
+        )
+        dispatcher.dispatch(SplitAction.SPLIT)
+        dispatcher.stop()
+        assert pressed_on[0] is not threading.current_thread()
+
+    def test_latency_is_measured_from_when_action_happened(self, monkeypatch):
+        monkeypatch.setattr(action_dispatcher.settings, "get_str", lambda key: "f1")
+        latencies = []
+        dispatcher = ActionDispatcher(press_key=lambda key_code: None)
+        dispatcher.on_action_sent = lambda action, latency: latencies.append(latency)
+        dispatcher.dispatch(SplitAction.SPLIT, time.perf_counter() - 0.5)
+        dispatcher.stop()
+        assert 0.5 <= latencies[0] < 1
+        assert dispatcher.get_stats().describe().startswith("1 split action(s) sent")
+
+    def test_sends_to_output_instead_of_pressing_hotkeys(self, monkeypatch):
+        monkeypatch.setattr(action_dispatcher.settings, "get_str", lambda key: "f1")
+        pressed = []
+        sent = []
+
+        class Output:
+            def send(self, action, occurred_at):
+                sent.append(action)
+                return True
+
+        dispatcher = ActionDispatcher(press_key=pressed.append)
+        dispatcher.output = Output()
+        dispatcher.dispatch(SplitAction.SPLIT)
+        dispatcher.stop()
+        assert sent == [SplitAction.SPLIT]
+        assert pressed == []
+        assert dispatcher.get_stats().actions_sent == 1
@@ -0,0 +1,63 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test clip_buffer.py."""
+
+import numpy
+
+from splitter.clip_buffer import FrameRing, decode_frame
+
+
+class TestFrameRing:
+    """Test FrameRing's size limit and compression."""
+
+    def make_frame(self, value: int) -> numpy.ndarray:
+        return numpy.full((240, 320, 3), value, dtype=numpy.uint8)
+
+    def test_keeps_most_recent_frames(self):
+        ring = FrameRing(max_frames=3)
+        for value in range(5):
+            ring.append(self.make_frame(value))
+        assert [frame[0, 0, 0] for frame in ring.snapshot()] == [2, 3, 4]
+
+    def test_compressed_frames_decode_and_use_less_memory(self):
+        ring = FrameRing(max_frames=2, jpeg_quality=90)
+        frame = self.make_frame(100)
+        ring.append(frame)
+        assert ring.get_memory_usage() < frame.nbytes
+        decoded = decode_frame(ring.snapshot()[0])
+        assert decoded.shape == frame.shape
+        assert numpy.abs(decoded.astype(int) - frame).max() <= 2
+
+    def test_configure_clears_ring_only_when_changed(self):
+        ring = FrameRing(max_frames=2)
+        ring.append(self.make_frame(1))
+        ring.configure(max_frames=2, jpeg_quality=0)
+        assert len(ring.snapshot()) == 1
+        ring.configure(max_frames=4, jpeg_quality=0)
+        assert len(ring.snapshot()) == 0
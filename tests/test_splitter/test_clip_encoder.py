@@ -0,0 +1,86 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test clip_encoder.py."""
+
+import cv2
+import numpy
+
+from splitter.clip_encoder import ClipEncoder
+
+
+class TestClipEncoder:
+    """Test writing clips with the encoder process."""
+
+    def make_frame(self, value: int) -> numpy.ndarray:
+        return numpy.full((240, 320, 3), value, dtype=numpy.uint8)
+
+    def test_saves_and_deletes_clips(self, tmp_path):
+        encoder = ClipEncoder(slot_count=4)
+        saved_stream = encoder.open_stream(str(tmp_path / "saved.mp4"), 30)
+        deleted_stream = encoder.open_stream(str(tmp_path / "deleted.mp4"), 30)
+        for value in range(20):
+            assert encoder.write(saved_stream, self.make_frame(value), block=True)
+            assert encoder.write(deleted_stream, self.make_frame(value), block=True)
+        encoder.close_stream(saved_stream, save_path=str(tmp_path / "renamed.mp4"))
+        encoder.close_stream(deleted_stream)
+        encoder.stop()
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["renamed.mp4"]
+        clip = cv2.VideoCapture(str(tmp_path / "renamed.mp4"))
+        assert clip.get(cv2.CAP_PROP_FRAME_COUNT) == 20
+        clip.release()
+
+        stats = encoder.get_stats()
+        assert stats.frames_encoded == 40
+        assert stats.frames_dropped == 0
+        assert stats.queue_depth == 0
+        assert stats.mean_encode_ms > 0
+
+    def test_drops_frames_when_slots_are_full(self, tmp_path):
+        encoder = ClipEncoder(slot_count=2)
+        stream = encoder.open_stream(str(tmp_path / "clip.mp4"), 30)
+        sent = sum(encoder.write(stream, self.make_frame(0)) for _ in range(100))
+        encoder.close_stream(stream)
+        encoder.stop()
+
+        assert encoder.get_stats().frames_dropped == 100 - sent
+        assert sent < 100
+
+    def test_blocking_write_gives_up_when_encoder_dies(self, tmp_path):
+        encoder = ClipEncoder(slot_count=1)
+        stream = encoder.open_stream(str(tmp_path / "clip.mp4"), 30)
+        encoder._process.terminate()
+        encoder._process.join()
+
+        # The first frame takes the only slot, which is never handed back
+        encoder.write(stream, self.make_frame(0), block=True)
+        assert not encoder.write(stream, self.make_frame(0), block=True)
+        encoder.stop()
+        assert not encoder.write(stream, self.make_frame(0), block=True)
+        assert encoder.get_stats().frames_dropped >= 2
@@ -0,0 +1,80 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Test clock.py."""
+
+import threading
+import time
+
+from splitter.clock import SimulatedClock
+from splitter.deadline_timer import DeadlineTimer, wait_until
+
+
+class TestSimulatedClock:
+    """Test moving a simulated clock and waiting on it."""
+
+    def test_sleeping_moves_the_clock(self):
+        clock = SimulatedClock(10)
+        clock.sleep(2)
+        assert clock.now() == 12
+
+        event = threading.Event()
+        assert not clock.wait(event, 3)
+        assert clock.now() == 15
+        event.set()
+        assert clock.wait(event, 3)
+        assert clock.now() == 15
+
+        # Never goes backwards
+        clock.advance_to(14)
+        assert clock.now() == 15
+        clock.advance_to(20)
+        assert clock.now() == 20
+
+    def test_deadlines_finish_instantly(self):
+        clock = SimulatedClock()
+        timer = DeadlineTimer(clock)
+        timer.start(60)
+        assert timer.get_remaining() == 60
+
+        start_time = time.perf_counter()
+        assert timer.wait(threading.Event())
+        assert wait_until(clock.now() + 60, threading.Event(), clock)
+        assert time.perf_counter() - start_time < 1
+        assert clock.now() == 120
+
+        cancel = threading.Event()
+        cancel.set()
+        assert not wait_until(clock.now() + 60, cancel, clock)
+        assert clock.now() == 120
+
+    def test_wall_time_counts_from_wall_start_time(self):
+        clock = SimulatedClock(10, wall_start_time=1_700_000_000)
+        clock.advance(2.5)
+        assert clock.to_wall_time(clock.now()) == 1_700_000_002.5
@@ -0,0 +1,65 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Test deadline_timer.py."""
+
+import threading
+import time
+
+from splitter.deadline_timer import DeadlineTimer, wait_until
+
+
+class TestDeadlineTimer:
+    """Test waiting for deadlines and reading the time left."""
+
+    def test_wait_until_is_precise(self):
+        deadline = time.perf_counter() + 0.05
+        assert wait_until(deadline, threading.Event())
+        assert 0 <= time.perf_counter() - deadline < 0.005
+
+    def test_wait_is_cancellable(self):
+        cancel = threading.Event()
+        timer = DeadlineTimer()
+        timer.start(10)
+        threading.Timer(0.02, cancel.set).start()
+
+        start_time = time.perf_counter()
+        assert not timer.wait(cancel)
+        assert time.perf_counter() - start_time < 1
+        assert timer.get_remaining() is None
+
+    def test_remaining_counts_down_from_start_time(self):
+        timer = DeadlineTimer()
+        assert timer.get_remaining() is None
+        timer.start(1, start_time=time.perf_counter() - 0.5)
+        assert 0.4 < timer.get_remaining() <= 0.5
+        timer.start(1, start_time=time.perf_counter() - 2)
+        assert timer.get_remaining() == 0
+        timer.stop()
+        assert timer.get_remaining() is None
@@ -0,0 +1,128 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Test frame_export.py."""
+
+import math
+import threading
+import time
+
+import numpy
+
+from splitter import splitter as splitter_module
+from splitter.frame_export import FrameExport, FrameExportReader
+from splitter.splitter import Splitter
+
+
+class TestFrameExport:
+    """Test sharing frames through a memory-mapped file."""
+
+    def test_reader_gets_published_frame(self, tmp_path):
+        path = str(tmp_path / "export.mmap")
+        export = FrameExport(path)
+        reader = FrameExportReader(path)
+
+        telemetry, frame = reader.read()
+        assert frame is None
+        assert telemetry["split_index"] == -1
+
+        image = numpy.random.randint(0, 255, (240, 320, 3), numpy.uint8)
+        export.publish(image, time.perf_counter(), 2, 1, (0.5, 0.75, None, None))
+        telemetry, frame = reader.read()
+        assert numpy.array_equal(frame, image)
+        assert telemetry["frame_number"] == 1
+        assert telemetry["split_index"] == 2
+        assert telemetry["match_percent"] == 0.5
+        assert math.isnan(telemetry["reset_percent"])
+        assert abs(telemetry["captured_at"] - time.time()) < 1
+
+        reader.close()
+        export.close()
+
+    def test_reads_are_never_torn(self, tmp_path):
+        path = str(tmp_path / "export.mmap")
+        export = FrameExport(path)
+        reader = FrameExportReader(path)
+        stop = threading.Event()
+
+        def write_frames():
+            value = 0
+            while not stop.is_set():
+                value = (value + 1) % 256
+                frame = numpy.full((240, 320, 3), value, numpy.uint8)
+                export.publish(frame, time.perf_counter(), value, 1, (None,) * 4)
+
+        writer = threading.Thread(target=write_frames)
+        writer.start()
+        try:
+            for _ in range(200):
+                telemetry, frame = reader.read()
+                if frame is not None:
+                    # Every pixel and the telemetry come from the same write
+                    assert (frame == telemetry["split_index"]).all()
+        finally:
+            stop.set()
+            writer.join()
+            reader.close()
+            export.close()
+
+    def test_splitter_follows_settings(self, tmp_path, monkeypatch):
+        values = {"FRAME_EXPORT_ENABLED": False, "FRAME_EXPORT_PATH": ""}
+        get_bool = splitter_module.settings.get_bool
+        get_str = splitter_module.settings.get_str
+        monkeypatch.setattr(
+            splitter_module.settings,
+            "get_bool",
+            lambda key: values[key] if key in values else get_bool(key),
+        )
+        monkeypatch.setattr(
+            splitter_module.settings,
+            "get_str",
+            lambda key: values[key] if key in values else get_str(key),
+        )
+        splitter = Splitter(make_pixmaps=False)
+        assert splitter.frame_export is None
+
+        path = str(tmp_path / "a.mmap")
+        values.update(FRAME_EXPORT_ENABLED=True, FRAME_EXPORT_PATH=path)
+        splitter.update_frame_export()
+        first_export = splitter.frame_export
+        assert first_export.path == path
+        splitter.update_frame_export()
+        assert splitter.frame_export is first_export
+
+        values["FRAME_EXPORT_PATH"] = str(tmp_path / "b.mmap")
+        splitter.update_frame_export()
+        assert splitter.frame_export.path == str(tmp_path / "b.mmap")
+
+        values["FRAME_EXPORT_ENABLED"] = False
+        splitter.update_frame_export()
+        assert splitter.frame_export is None
+
@@ -0,0 +1,177 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Test livesplit_server.py against a local mock server."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from splitter.action_dispatcher import SplitAction
+from splitter.livesplit_server import LiveSplitServer, format_time, parse_address
+
+
+class MockServer:
+    """Accept connections on localhost and record each line received."""
+
+    def __init__(self):
+        self.lines = []
+        self.connections = []
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.address = self._listener.getsockname()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self._listener.accept()
+            except OSError:
+                return
+            self.connections.append(connection)
+            threading.Thread(target=self._read, args=(connection,), daemon=True).start()
+
+    def _read(self, connection):
+        with connection.makefile("rb") as stream:
+            for line in stream:
+                self.lines.append(line.decode("utf-8"))
+
+    def wait_for_lines(self, count, timeout=2):
+        end_time = time.perf_counter() + timeout
+        while len(self.lines) < count and time.perf_counter() < end_time:
+            time.sleep(0.005)
+        return self.lines
+
+    def close(self):
+        self._listener.close()
+        for connection in self.connections:
+            connection.close()
+
+
+@pytest.fixture
+def server():
+    mock_server = MockServer()
+    yield mock_server
+    mock_server.close()
+
+
+class TestLiveSplitServer:
+    """Test sending split actions over a persistent connection."""
+
+    def test_sends_commands_for_actions(self, server):
+        livesplit = LiveSplitServer(server.address)
+        assert livesplit.send(SplitAction.SPLIT, 0)
+        assert livesplit.send(SplitAction.PAUSE, 1)
+        assert livesplit.send(SplitAction.PAUSE, 2)
+        assert livesplit.send(SplitAction.RESET, 3)
+        livesplit.close()
+
+        assert server.wait_for_lines(4) == [
+            "startorsplit\r\n",
+            "pause\r\n",
+            "resume\r\n",
+            "reset\r\n",
+        ]
+        assert len(server.connections) == 1
+
+    def test_sync_game_time_leaves_out_pauses(self, server):
+        livesplit = LiveSplitServer(server.address, sync_game_time=True)
+        livesplit.send(SplitAction.SPLIT, 100)
+        livesplit.send(SplitAction.PAUSE, 110)
+        livesplit.send(SplitAction.PAUSE, 115)
+        livesplit.send(SplitAction.SPLIT, 3700.25)
+        livesplit.close()
+
+        assert server.wait_for_lines(6)[-2:] == [
+            "setgametime 0:59:55.250\r\n",
+            "split\r\n",
+        ]
+
+    def test_reconnects_after_server_drops_connection(self, server):
+        livesplit = LiveSplitServer(server.address)
+        assert livesplit.send(SplitAction.SPLIT, 0)
+        server.wait_for_lines(1)
+        server.connections[0].shutdown(socket.SHUT_RDWR)
+
+        assert livesplit.send(SplitAction.SPLIT, 1)
+        livesplit.close()
+        assert server.wait_for_lines(2) == ["startorsplit\r\n"] * 2
+        assert len(server.connections) == 2
+
+    def test_doesnt_resend_after_partial_write(self, monkeypatch):
+        class MockSocket:
+            """Takes bytes_taken bytes (or everything, if it's None), then
+            fails."""
+
+            def __init__(self, bytes_taken=None):
+                self.bytes_taken = bytes_taken
+
+            def send(self, data):
+                if self.bytes_taken is None:
+                    return len(data)
+                if self.bytes_taken == 0:
+                    raise OSError
+                bytes_taken, self.bytes_taken = self.bytes_taken, 0
+                return bytes_taken
+
+            def close(self):
+                pass
+
+        connections = []
+
+        def connect():
+            connections.append(1)
+            livesplit._socket = MockSocket()
+            return True
+
+        livesplit = LiveSplitServer(("127.0.0.1", 0))
+        monkeypatch.setattr(livesplit, "_is_connected", lambda: livesplit._socket)
+        monkeypatch.setattr(livesplit, "_connect", connect)
+
+        # LiveSplit may have gotten part of the command, so don't resend it
+        livesplit._socket = MockSocket(bytes_taken=5)
+        assert not livesplit.send(SplitAction.SPLIT, 0)
+        assert connections == []
+
+        # Nothing was written, so it's safe to reconnect and try again
+        livesplit._socket = MockSocket(bytes_taken=0)
+        assert livesplit.send(SplitAction.SPLIT, 0)
+        assert connections == [1]
+
+    def test_fails_without_server(self):
+        with socket.create_server(("127.0.0.1", 0)) as listener:
+            address = listener.getsockname()
+        assert not LiveSplitServer(address).send(SplitAction.SPLIT, 0)
+
+    def test_helpers(self):
+        assert parse_address("example.com:1234") == ("example.com", 1234)
+        assert parse_address("example.com") == ("example.com", 16834)
+        assert format_time(3725.5) == "1:02:05.500"
@@ -0,0 +1,94 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Test retimer.py."""
+
+import cv2
+import numpy
+import pytest
+
+from splitter import retimer
+
+
+class TestRetimer:
+    """Test retiming videos of runs."""
+
+    def test_retime_videos(self, tmp_path):
+        colors = {"red": (0, 0, 255), "blue": (255, 0, 0), "green": (0, 255, 0)}
+        frames = {
+            name: numpy.full((240, 320, 3), color, numpy.uint8)
+            for name, color in colors.items()
+        }
+        black = numpy.zeros((240, 320, 3), numpy.uint8)
+
+        split_dir = tmp_path / "splits"
+        split_dir.mkdir()
+        # Half a second of delay, then a second of pause
+        cv2.imwrite(str(split_dir / "001_red_(90)_#0.5#_[1].png"), frames["red"])
+        # Splits when the match percent falls back below the threshold
+        cv2.imwrite(str(split_dir / "002_blue_(90)_#0#_{b}.png"), frames["blue"])
+        cv2.imwrite(str(split_dir / "reset_(90)_#0#_%0%_{r}.png"), frames["green"])
+
+        # At 30 fps: red at frame 10, blue during the pause (ignored), blue
+        # again from 60 to 64, green (reset) at 80, then red again at 90
+        sequence = [black] * 10 + [frames["red"]] * 5 + [black] * 25
+        sequence += [frames["blue"]] * 5 + [black] * 15
+        sequence += [frames["blue"]] * 5 + [black] * 15 + [frames["green"]] * 5
+        sequence += [black] * 5 + [frames["red"]] * 5 + [black] * 5
+        video_paths = []
+        for index in range(2):
+            video_path = str(tmp_path / f"run_{index}.avi")
+            writer = cv2.VideoWriter(
+                video_path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (320, 240)
+            )
+            for frame in sequence:
+                writer.write(frame)
+            writer.release()
+            video_paths.append(video_path)
+
+        # A video that can't be opened fails on its own
+        missing_path = str(tmp_path / "missing.avi")
+        video_paths.insert(1, missing_path)
+
+        results = retimer.retime_videos(str(split_dir), video_paths, workers=2)
+        assert [result.video_path for result in results] == video_paths
+        failed = results.pop(1)
+        assert failed.error is not None and failed.events == []
+        assert failed.to_dict()["error"] == failed.error
+        for result in results:
+            assert result.error is None
+            assert result.frame_count == len(sequence)
+            assert [(event.kind, event.frame) for event in result.events] == [
+                ("split", 10),
+                ("split", 65),
+                ("reset", 80),
+                ("split", 90),
+            ]
+            assert result.events[0].time == pytest.approx(10 / 30 + 0.5)
+            assert result.events[2].time == pytest.approx(80 / 30)
@@ -0,0 +1,135 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Test run_history.py."""
+
+import pytest
+
+from splitter import splitter as splitter_module
+from splitter.run_history import (
+    RunEvent,
+    RunHistory,
+    get_margin_percentile,
+    get_match_margins,
+    open_history,
+)
+from splitter.splitter import Splitter
+
+
+def record_run(history, time, highest_percents):
+    for index, highest_percent in enumerate(highest_percents):
+        history.record(
+            RunEvent.SPLIT,
+            time + index,
+            "splits",
+            index,
+            f"split {index}",
+            1,
+            highest_percent,
+            highest_percent,
+            0.9,
+        )
+
+
+class TestRunHistory:
+    """Test writing split events and querying them."""
+
+    def test_groups_events_into_runs(self, tmp_path):
+        path = str(tmp_path / "history.sqlite3")
+        history = RunHistory(path)
+        record_run(history, 0, [0.95, 0.92])
+        history.record(
+            RunEvent.RESET, 2, "splits", 2, "reset", 1, 0.97, 0.97, 0.95, 0.0
+        )
+        record_run(history, 10, [0.99])  # Starts a new run
+        record_run(history, 20, [0.91, 0.93])  # Back to the first split
+        history.close()
+
+        connection = open_history(path)
+        assert connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 3
+        runs = connection.execute(
+            "SELECT run_id, event FROM events ORDER BY occurred_at"
+        ).fetchall()
+        assert [run_id for run_id, _ in runs] == [1, 1, 1, 2, 3, 3]
+
+        assert get_match_margins(connection, "split 0", runs=2) == pytest.approx(
+            [0.01, 0.09]
+        )
+        assert get_margin_percentile(connection, "split 0", 50) == pytest.approx(0.05)
+        assert get_margin_percentile(connection, "missing", 50) is None
+
+    def test_unopenable_database_drops_events(self, tmp_path):
+        # The database's directory would have to be inside a file
+        (tmp_path / "file").write_text("")
+        history = RunHistory(str(tmp_path / "file" / "history.sqlite3"))
+        record_run(history, 0, [0.95])
+        history._writer_thread.join(2)
+        assert history.error is not None
+
+        # The writer thread is gone, so later events are dropped instead of
+        # trying to start it again
+        record_run(history, 10, [0.95, 0.92])
+        assert not history._writer_thread.is_alive()
+        history.close()
+
+    def test_splitter_follows_settings(self, tmp_path, monkeypatch):
+        values = {"RUN_HISTORY_ENABLED": False, "RUN_HISTORY_PATH": ""}
+        get_bool = splitter_module.settings.get_bool
+        get_str = splitter_module.settings.get_str
+        monkeypatch.setattr(
+            splitter_module.settings,
+            "get_bool",
+            lambda key: values[key] if key in values else get_bool(key),
+        )
+        monkeypatch.setattr(
+            splitter_module.settings,
+            "get_str",
+            lambda key: values[key] if key in values else get_str(key),
+        )
+        splitter = Splitter(make_pixmaps=False)
+        assert splitter.run_history is None
+
+        values.update(RUN_HISTORY_ENABLED=True, RUN_HISTORY_PATH=str(tmp_path / "a"))
+        splitter.update_run_history()
+        first_history = splitter.run_history
+        assert first_history.path == str(tmp_path / "a")
+        splitter.update_run_history()
+        assert splitter.run_history is first_history
+
+        values["RUN_HISTORY_PATH"] = str(tmp_path / "b")
+        splitter.update_run_history()
+        assert splitter.run_history.path == str(tmp_path / "b")
+        # The old history is closed, so late events from the compare threads
+        # are dropped instead of restarting its writer thread
+        record_run(first_history, 0, [0.95])
+        assert not first_history._writer_thread.is_alive()
+
+        values["RUN_HISTORY_ENABLED"] = False
+        splitter.update_run_history()
+        assert splitter.run_history is None
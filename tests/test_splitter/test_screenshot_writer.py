@@ -0,0 +1,73 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Test screenshot_writer.py."""
+
+import time
+
+import cv2
+import numpy
+
+from splitter.screenshot_writer import FileNumberIndex, ScreenshotWriter
+
+
+class TestFileNumberIndex:
+    """Test finding unused file numbers."""
+
+    def test_skips_used_and_reserved_numbers(self, tmp_path):
+        for name in ("000_start.png", "002_boss_#0.5#.png", "001_notes.txt"):
+            (tmp_path / name).touch()
+        index = FileNumberIndex()
+        assert index.allocate(str(tmp_path)) == "001"
+        # 001 hasn't been written yet, but it's reserved
+        assert index.allocate(str(tmp_path)) == "003"
+
+    def test_has_no_upper_limit(self, tmp_path):
+        for number in range(1000):
+            (tmp_path / f"{number:03d}_screenshot.png").touch()
+        assert FileNumberIndex().allocate(str(tmp_path)) == "1000"
+
+
+class TestScreenshotWriter:
+    """Test writing screenshots on the writer thread."""
+
+    def test_writes_full_size_frame(self, tmp_path):
+        frame = numpy.random.randint(0, 255, (1080, 1920, 3), numpy.uint8)
+        writer = ScreenshotWriter()
+        path = writer.save(str(tmp_path), frame)
+        assert path == f"{tmp_path}/000_screenshot.png"
+
+        results = []
+        end_time = time.perf_counter() + 10
+        while not results and time.perf_counter() < end_time:
+            results = writer.get_results()
+            time.sleep(0.01)
+        assert results == [(path, True)]
+        assert numpy.array_equal(cv2.imread(path), frame)
@@ -0,0 +1,161 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test split_dir.py."""
+
+import pathlib
+import threading
+import time
+
+import cv2
+import numpy
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from splitter.split_dir import LOAD_WAIT_TIMEOUT, SplitDir
+
+IMAGE_COUNT = 12
+FIRST_GATED_INDEX = 3
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """Hold back every split image from FIRST_GATED_INDEX on until the
+    returned event is set, so tests can look at a directory halfway through
+    loading.
+    """
+    event = threading.Event()
+    get_split_image = SplitDir._get_split_image
+
+    def gated_get_split_image(self, path, old_images):
+        if int(pathlib.Path(path).stem) >= FIRST_GATED_INDEX:
+            event.wait()
+        return get_split_image(self, path, old_images)
+
+    monkeypatch.setattr(SplitDir, "_get_split_image", gated_get_split_image)
+    yield event
+    event.set()
+
+
+def make_images(dir_path, count=IMAGE_COUNT):
+    dir_path.mkdir()
+    rng = numpy.random.default_rng(0)
+    for index in range(count):
+        image = rng.integers(0, 256, (24, 32, 3), dtype=numpy.uint8)
+        cv2.imwrite(str(dir_path / f"{index:03}.png"), image)
+
+
+def wait_for_count(splits, count):
+    with splits._load_condition:
+        assert splits._load_condition.wait_for(
+            lambda: len(splits.list) >= count, timeout=10
+        )
+
+
+class TestSplitDir:
+    """Test loading split images in the background."""
+
+    def test_wait_for_image_blocks_until_loaded(self, tmp_path, gate):
+        make_images(tmp_path / "images")
+        splits = SplitDir(str(tmp_path / "images"), make_pixmaps=False)
+        wait_for_count(splits, FIRST_GATED_INDEX)
+
+        waiter = threading.Thread(
+            target=splits._wait_for_image, args=(IMAGE_COUNT - 1,)
+        )
+        waiter.start()
+        waiter.join(0.2)
+        assert waiter.is_alive()
+        assert len(splits.list) == FIRST_GATED_INDEX
+
+        gate.set()
+        waiter.join(10)
+        assert not waiter.is_alive()
+        assert len(splits.list) == IMAGE_COUNT
+
+    def test_changing_dir_stops_loading(self, tmp_path, gate):
+        make_images(tmp_path / "images")
+        make_images(tmp_path / "other", count=FIRST_GATED_INDEX)
+        splits = SplitDir(str(tmp_path / "images"), make_pixmaps=False)
+        wait_for_count(splits, FIRST_GATED_INDEX)
+        old_list = splits.list
+        old_thread = splits._load_thread
+
+        # Let the stuck images finish so the worker can see it was cancelled
+        threading.Timer(0.1, gate.set).start()
+        splits.dir_path = str(tmp_path / "other")
+        splits.reset_split_images()
+
+        assert not old_thread.is_alive()
+        assert len(old_list) < IMAGE_COUNT
+        splits.wait_for_loading()
+        assert [image.name for image in splits.list] == ["000", "001", "002"]
+        assert splits.list[0]._path.startswith(str(tmp_path / "other"))
+
+    def test_get_last_index_while_loading(self, tmp_path, gate):
+        make_images(tmp_path / "images")
+        splits = SplitDir(str(tmp_path / "images"), make_pixmaps=False)
+        wait_for_count(splits, FIRST_GATED_INDEX)
+        assert splits.loading
+        assert len(splits.list) == FIRST_GATED_INDEX
+        assert splits.get_last_index() == IMAGE_COUNT - 1
+
+        gate.set()
+        splits.wait_for_loading()
+        assert not splits.loading
+        assert splits.get_last_index() == IMAGE_COUNT - 1
+        assert len(splits.list) == IMAGE_COUNT
+
+    def test_next_split_image_waits_briefly(self, tmp_path, gate):
+        make_images(tmp_path / "images")
+        splits = SplitDir(str(tmp_path / "images"), make_pixmaps=False)
+        wait_for_count(splits, FIRST_GATED_INDEX)
+        splits.current_image_index = FIRST_GATED_INDEX - 1
+
+        # The next image is stuck, so stay put instead of blocking
+        start_time = time.perf_counter()
+        splits.next_split_image()
+        assert time.perf_counter() - start_time < LOAD_WAIT_TIMEOUT + 1
+        assert splits.current_image_index == FIRST_GATED_INDEX - 1
+
+        gate.set()
+        splits.next_split_image()
+        assert splits.current_image_index == FIRST_GATED_INDEX
+
+    def test_pixmaps_are_made_when_read(self, tmp_path):
+        # Required for making pixmaps. Kept on the class so it isn't deleted
+        TestSplitDir.app = QApplication.instance() or QApplication([])
+        make_images(tmp_path / "images")
+        splits = SplitDir(str(tmp_path / "images"))
+        splits.wait_for_loading()
+
+        # Nothing was made on the loading threads
+        assert all(image._pixmap is None for image in splits.list)
+        assert splits.list[-1].pixmap is not None
+        assert splits.list[-1]._pixmap is not None
+
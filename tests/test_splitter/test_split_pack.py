@@ -0,0 +1,127 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test split_pack.py."""
+
+import os
+
+import cv2
+import numpy
+import pytest
+
+from splitter import split_pack
+from splitter.split_dir import SplitDir
+
+
+class TestSplitPack:
+    """Test writing, reading, and converting split packs."""
+
+    def test_read_pack_returns_written_arrays(self, tmp_path):
+        pack_path = str(tmp_path / f"test{split_pack.PACK_EXTENSION}")
+        image = numpy.arange(320 * 240 * 3, dtype=numpy.uint8).reshape(240, 320, 3)
+        mask = numpy.ones((240, 320), dtype=numpy.uint8)
+        split_pack.write_pack(
+            pack_path,
+            [
+                ({"file_name": "a.png"}, {"image": image, "mask": mask}),
+                ({"file_name": "b.png"}, {"image": image[::2], "mask": None}),
+            ],
+        )
+
+        entries = split_pack.read_pack(pack_path)
+        assert [metadata["file_name"] for metadata, _ in entries] == ["a.png", "b.png"]
+        assert numpy.array_equal(entries[0][1]["image"], image)
+        assert numpy.array_equal(entries[0][1]["mask"], mask)
+        assert numpy.array_equal(entries[1][1]["image"], image[::2])
+        assert entries[1][1]["mask"] is None
+
+    def test_read_pack_rejects_other_files(self, tmp_path):
+        not_a_pack = tmp_path / "not_a_pack.splitpack"
+        not_a_pack.write_bytes(b"definitely not a split pack")
+        with pytest.raises(split_pack.SplitPackError):
+            split_pack.read_pack(str(not_a_pack))
+
+    def test_pack_and_unpack_round_trip(self, tmp_path):
+        image_dir = tmp_path / "images"
+        image_dir.mkdir()
+        image = numpy.random.default_rng(0).integers(0, 255, (60, 80, 4), numpy.uint8)
+        cv2.imwrite(str(image_dir / "001_split_#2#_(90).png"), image)
+        cv2.imwrite(str(image_dir / "002_reset_{r}.png"), image[:, :, 0])
+
+        pack_path = split_pack.pack_dir(str(image_dir))
+        entries = split_pack.read_pack(pack_path)
+        metadata = entries[0][0]
+        assert metadata["stripped_name"] == "001_split"
+        assert metadata["delay_duration"] == 2 and not metadata["delay_is_default"]
+        assert metadata["threshold"] == 0.9 and not metadata["threshold_is_default"]
+        assert entries[1][0]["reset_flag"]
+
+        out_dir = tmp_path / "unpacked"
+        for path in split_pack.unpack(pack_path, str(out_dir)):
+            original = image_dir / os.path.basename(path)
+            assert numpy.array_equal(
+                cv2.imread(path, cv2.IMREAD_UNCHANGED),
+                cv2.imread(str(original), cv2.IMREAD_UNCHANGED),
+            )
+            assert os.path.getmtime(path) == os.path.getmtime(original)
+
+    def test_renamed_image_makes_pack_stale(self, tmp_path):
+        image = numpy.random.default_rng(0).integers(0, 255, (60, 80, 3), numpy.uint8)
+        cv2.imwrite(str(tmp_path / "001_split_(90).png"), image)
+        pack_path = split_pack.pack_dir(str(tmp_path))
+
+        splits = SplitDir(str(tmp_path), make_pixmaps=False)
+        assert splits.pack_path == pack_path
+        assert splits.list[0]._path == str(tmp_path / "001_split_(90).png")
+        assert splits.list[0].threshold == 0.9
+
+        # Same file and mtime, new settings in the name
+        os.rename(tmp_path / "001_split_(90).png", tmp_path / "001_split_(80).png")
+        splits.reset_split_images()
+        assert splits.pack_path is None
+        assert splits.list[0].threshold == 0.8
+
+    def test_pack_loads_on_its_own(self, tmp_path):
+        image_dir = tmp_path / "images"
+        image_dir.mkdir()
+        image = numpy.random.default_rng(0).integers(0, 255, (60, 80, 3), numpy.uint8)
+        cv2.imwrite(str(image_dir / "001_split_(90).png"), image)
+        cv2.imwrite(str(image_dir / "002_split.png"), image)
+        pack_dir = tmp_path / "pack"
+        pack_dir.mkdir()
+        pack_path = split_pack.pack_dir(
+            str(image_dir), str(pack_dir / f"set{split_pack.PACK_EXTENSION}")
+        )
+
+        splits = SplitDir(str(pack_dir), make_pixmaps=False)
+        assert splits.pack_path == pack_path
+        assert [image.name for image in splits.list] == ["001_split_(90)", "002_split"]
+        assert splits.list[0]._path is None  # No image file next to the pack
+        assert numpy.array_equal(
+            splits.list[0]._thumbnail, splits.list[0].get_thumbnail()
+        )
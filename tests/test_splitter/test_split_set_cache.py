@@ -0,0 +1,128 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test split_set_cache.py."""
+
+import os
+
+import cv2
+import numpy
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from splitter import split_set_cache
+from splitter.split_dir import SplitDir
+from splitter.split_set_cache import SplitSetCache
+
+
+@pytest.fixture
+def split_sets(tmp_path, monkeypatch):
+    """Make three one-image split image directories, and set the memory
+    budget so two of them fit but three don't.
+
+    Returns:
+        List[str]: The directory paths.
+    """
+    dir_paths = []
+    for name in ("a", "b", "c"):
+        dir_path = tmp_path / name
+        dir_path.mkdir()
+        image = numpy.full((480, 640, 3), ord(name), dtype=numpy.uint8)
+        cv2.imwrite(str(dir_path / "001_split.png"), image)
+        dir_paths.append(str(dir_path))
+
+    usage = SplitDir(dir_paths[0], make_pixmaps=False).get_memory_usage()
+    budget_mb = 2 * usage // (1024 * 1024) + 1
+    assert 2 * usage <= budget_mb * 1024 * 1024 < 3 * usage
+
+    get_int = split_set_cache.settings.get_int
+    monkeypatch.setattr(
+        split_set_cache.settings,
+        "get_int",
+        lambda key: budget_mb if key == "SPLIT_SET_MEMORY_MB" else get_int(key),
+    )
+    monkeypatch.setattr(split_set_cache, "add_recent_dir", lambda dir_path: None)
+    return dir_paths
+
+
+def get_loaded_paths(cache):
+    return [split_dir.dir_path for split_dir in cache.get_loaded()]
+
+
+class TestSplitSetCache:
+    """Test keeping recently used split image directories loaded."""
+
+    def test_evicts_least_recently_used(self, split_sets):
+        a, b, c = split_sets
+        cache = SplitSetCache(make_pixmaps=False)
+        split_dir = cache.get(a)
+        cache.get(b)
+        assert cache.get(a) is split_dir  # Reused, and now most recently used
+        cache.get(c)
+        assert get_loaded_paths(cache) == [a, c]
+
+    def test_directory_in_use_is_kept_over_budget(self, split_sets, monkeypatch):
+        a, b, _ = split_sets
+        monkeypatch.setattr(split_set_cache.settings, "get_int", lambda key: 0)
+        cache = SplitSetCache(make_pixmaps=False)
+        cache.get(a)
+        assert get_loaded_paths(cache) == [a]
+        cache.get(b)
+        assert get_loaded_paths(cache) == [b]
+
+    def test_preload_stops_at_budget_without_pixmaps(self, split_sets):
+        # Required for making pixmaps. Kept on the class so it isn't deleted
+        TestSplitSetCache.app = QApplication.instance() or QApplication([])
+        a, b, c = split_sets
+        cache = SplitSetCache()
+        cache.get(a)
+        cache.preload([b, c])
+        cache._preload_thread.join(10)
+
+        # c didn't fit, and b was preloaded behind the directory in use
+        assert get_loaded_paths(cache) == [b, a]
+        preloaded = cache.get_loaded()[0]
+        assert preloaded.list[0].pixmap is None
+
+        assert cache.get(b) is preloaded
+        assert preloaded.list[0].pixmap is not None
+        pixmap = preloaded.list[0].pixmap
+        preloaded.resize_images()  # Frame size hasn't changed
+        assert preloaded.list[0].pixmap is pixmap
+
+    def test_reload_rereads_changed_images(self, split_sets):
+        a, _, _ = split_sets
+        cache = SplitSetCache(make_pixmaps=False)
+        split_dir = cache.get(a)
+        image_path = os.path.join(a, "001_split.png")
+        cv2.imwrite(image_path, numpy.zeros((480, 640, 3), dtype=numpy.uint8))
+        os.utime(image_path, (0, 0))
+
+        assert cache.get(a).list[0].image.any()  # Still the cached image
+        assert cache.get(a, reload=True) is split_dir
+        assert not split_dir.list[0].image.any()
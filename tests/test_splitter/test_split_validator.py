@@ -0,0 +1,82 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Test split_validator.py."""
+
+import time
+
+import cv2
+import numpy
+
+from splitter import split_validator
+from splitter.split_dir import SplitDir
+from splitter.splitter import get_match_percent
+
+
+class TestSplitValidator:
+    """Test finding split images that are similar to each other."""
+
+    def test_similarity_matrix_matches_get_match_percent(self, tmp_path):
+        rng = numpy.random.default_rng(0)
+        for index in range(3):
+            image = rng.integers(0, 256, (240, 320, 3), dtype=numpy.uint8)
+            cv2.imwrite(str(tmp_path / f"00{index}.png"), image)
+        # A transparent image, so masked distances are checked too
+        image = rng.integers(0, 256, (240, 320, 4), dtype=numpy.uint8)
+        image[:, :, 3] = 0
+        image[60:180, 80:240, 3] = 255
+        cv2.imwrite(str(tmp_path / "003.png"), image)
+
+        splits = SplitDir(str(tmp_path), make_pixmaps=False)
+        splits.wait_for_loading()
+        images = splits.list
+        similarity = split_validator.get_similarity_matrix(images)
+        expected = [
+            [get_match_percent(other.image, image) for other in images]
+            for image in images
+        ]
+        assert numpy.abs(similarity - expected).max() < split_validator.CONFIRM_MARGIN
+
+    def test_split_dir_finds_similar_images(self, tmp_path):
+        rng = numpy.random.default_rng(0)
+        image = rng.integers(0, 256, (240, 320, 3), dtype=numpy.uint8)
+        cv2.imwrite(str(tmp_path / "001_first.png"), image)
+        cv2.imwrite(str(tmp_path / "002_other.png"), 255 - image)
+        # Almost the same as the first image
+        image[0:2] = 0
+        cv2.imwrite(str(tmp_path / "003_again.png"), image)
+
+        splits = SplitDir(str(tmp_path), make_pixmaps=False)
+        deadline = time.perf_counter() + 10
+        while splits.similar_pairs is None and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+        assert [
+            (pair.first.name, pair.second.name) for pair in splits.similar_pairs
+        ] == [("001_first", "003_again")]
@@ -28,13 +28,19 @@
 
 """Test splitter.py."""
 
+import threading
 import time
+import types
 import cv2
+import numpy
 import pytest
 from PyQt5.QtWidgets import QApplication
 
 import settings
-from splitter.splitter import Splitter
+from splitter import splitter as splitter_module
+from splitter.clock import SimulatedClock
+from splitter.run_history import RunEvent
+from splitter.splitter import Change, Splitter, check_match, is_second_split
 from splitter.split_dir import SplitDir
 
 
@@ -167,3 +173,222 @@ class TestSplitter:
         assert (
             pytest.approx(new_time - start_time, abs=0.005) == self.splitter._interval
         )
+
+
+class TestChangeSplits:
+    """Test pausing compare_split_thread to change the split image."""
+
+    @pytest.fixture(autouse=True)
+    def comparing_splitter(self):
+        """Spin up a Splitter comparing frames (none will come) to a split
+        image.
+
+        Yields:
+            Splitter: The Splitter instance.
+        """
+        self.splitter = Splitter(make_pixmaps=False)
+        self.splitter.splits.list = [
+            SplitDir._SplitImage("resources/icon-macos.png", make_pixmap=False)
+        ]
+        self.splitter.splits.current_image_index = 0
+        self.splitter.splits.current_loop = 1
+        self.splitter.restart_compare_split_thread()
+        while self.splitter.match_percent is None:
+            time.sleep(0.001)
+
+        yield self.splitter
+
+        self.splitter.safe_exit_all_threads()
+
+    def test_change_waits_for_pause(self):
+        paused_during_change = []
+        start_time = time.perf_counter()
+        self.splitter.change_splits(
+            lambda: paused_during_change.append(
+                self.splitter._waiting_for_split_change
+            )
+        )
+
+        # No frames are coming, so the pause can't wait for the next frame
+        assert time.perf_counter() - start_time < 0.1
+        assert paused_during_change == [True]
+        assert self.splitter.compare_split_thread.is_alive()
+
+    def test_change_after_thread_dies(self):
+        self.splitter.safe_exit_compare_split_thread()
+        changes = []
+        self.splitter.change_splits(lambda: changes.append(True))
+        assert changes == [True]
+
+
+class TestWaitForChanges:
+    """Test waiting for specific kinds of changes."""
+
+    def test_wakes_only_for_awaited_changes(self):
+        splitter = Splitter(make_pixmaps=False)
+        splitter.take_changes()
+        splitter._mark_changed(Change.MATCH)
+        assert splitter.wait_for_changes(Change.ACTION, 0.01) == Change.NONE
+
+        threading.Timer(0.05, splitter._mark_changed, (Change.ACTION,)).start()
+        start_time = time.perf_counter()
+        assert splitter.wait_for_changes(Change.ACTION, 10) == Change.ACTION
+        assert time.perf_counter() - start_time < 1
+
+        # Changes that weren't waited for are left for take_changes
+        assert splitter.take_changes() == Change.MATCH
+
+
+class TestSplitDecisions:
+    """Test the decisions Splitter and retimer.py share."""
+
+    def test_below_flag_matches_after_falling_below(self):
+        image = types.SimpleNamespace(threshold=0.9, below_flag=True)
+        assert check_match(0.5, image, False) == (False, False)
+        assert check_match(0.95, image, False) == (False, True)
+        assert check_match(0.5, image, True) == (True, True)
+        image.below_flag = False
+        assert check_match(0.95, image, False)[0]
+
+    def test_loops_lead_to_second_split(self):
+        split_images = [types.SimpleNamespace(loops=2), types.SimpleNamespace(loops=1)]
+        assert SplitDir.get_next_split(split_images, 0, 1) == (0, 2)
+        assert is_second_split(split_images, 0, 2)
+        assert SplitDir.get_next_split(split_images, 0, 2) == (1, 1)
+        assert not is_second_split(split_images, 1, 1)
+        # The last split has nothing after it
+        assert SplitDir.get_next_split(split_images, 1, 1) == (1, 1)
+
+
+class TestCaptureTime:
+    """Test estimating when each frame was captured."""
+
+    class TimestampedCapture:
+        """Stands in for a cv2.VideoCapture that timestamps its frames."""
+
+        def __init__(self, pos_msecs):
+            self.pos_msecs = list(pos_msecs)
+
+        def get(self, prop_id):
+            return self.pos_msecs.pop(0)
+
+    def test_uses_backend_timestamps(self):
+        splitter = Splitter(make_pixmaps=False)
+        splitter._cap = self.TimestampedCapture([1000, 1100, 1200])
+
+        # The first frame sets the offset between the clocks; the third was
+        # read 30 ms late, so it gets an earlier time than when it was read
+        assert splitter._get_capture_time(50.0) == 50.0
+        assert splitter._get_capture_time(50.1) == pytest.approx(50.1)
+        assert splitter._get_capture_time(50.23) == pytest.approx(50.2, abs=0.001)
+
+    def test_falls_back_to_read_time(self):
+        splitter = Splitter(make_pixmaps=False)
+        splitter._cap = self.TimestampedCapture([0, 0])
+        assert splitter._get_capture_time(50.0) == 50.0
+        assert splitter._get_capture_time(50.1) == 50.1
+
+
+class TestSimulatedClock:
+    """Test running the split state machine on a simulated clock."""
+
+    def test_split_delay_and_pause_take_no_time(self):
+        clock = SimulatedClock(100)
+        splitter = Splitter(make_pixmaps=False, clock=clock)
+        split_images = [
+            SplitDir._SplitImage("resources/icon-macos.png", make_pixmap=False)
+            for _ in range(2)
+        ]
+        split_images[0].delay_duration = 30
+        split_images[0].pause_duration = 60
+        splitter.splits.list = split_images
+        splitter.splits.current_image_index = 0
+        splitter.splits.current_loop = 1
+        splitter._split_match_time = clock.now()
+
+        start_time = time.perf_counter()
+        assert splitter._split()
+        assert time.perf_counter() - start_time < 1
+        assert splitter.normal_split_action
+        assert clock.now() == 190
+        splitter.safe_exit_all_threads()
+
+    def test_replayed_frames_split_and_reset_on_time(self, monkeypatch):
+        class FrameFeed:
+            """Stands in for a compare queue, handing over recorded frames
+            and moving the clock to each one's capture time first.
+            """
+
+            def __init__(self, clock, frames, finished):
+                self.clock = clock
+                self.frames = list(frames)
+                self.finished = finished
+                self.first_get_time = None
+
+            def get(self):
+                if self.first_get_time is None:
+                    self.first_get_time = self.clock.now()
+                if len(self.frames) == 0:
+                    self.finished.set()
+                    return None
+                frame, captured_at = self.frames.pop(0)
+                self.clock.advance_to(captured_at)
+                return frame, captured_at
+
+        clock = SimulatedClock(100)
+        splitter = Splitter(make_pixmaps=False, clock=clock)
+        split_images = [
+            SplitDir._SplitImage("resources/icon-macos.png", make_pixmap=False)
+            for _ in range(2)
+        ]
+        split_images[0].delay_duration = 2
+        split_images[0].pause_duration = 5
+        reset_image = SplitDir._SplitImage(
+            "resources/record_active.png", make_pixmap=False
+        )
+        reset_image.delay_duration = 1
+        reset_image.reset_wait_duration = 3
+        splitter.splits.list = split_images
+        splitter.splits.reset_image = reset_image
+        splitter.splits.current_image_index = 0
+        splitter.splits.current_loop = 1
+        recorded = []
+        splitter.run_history = types.SimpleNamespace(
+            record=lambda *args: recorded.append(args[:2])
+        )
+        blank = numpy.zeros_like(split_images[0].image)
+        start_time = time.perf_counter()
+
+        # The split image matches at 101, so the split happens after its
+        # delay, at 103, and the pause after it runs to 108
+        feed = FrameFeed(
+            clock,
+            [(blank, 100.5), (split_images[0].image, 101)],
+            splitter._compare_split_thread_finished,
+        )
+        # The compare methods make a new queue each time they start, so they
+        # get whichever feed is current
+        monkeypatch.setattr(splitter_module, "Queue", lambda maxsize: feed)
+        assert splitter._look_for_split()
+        assert splitter._split()
+        assert recorded == [(RunEvent.SPLIT, 103)]
+        assert clock.now() == 108
+
+        # On the second split, the reset image waits 3 seconds before it's
+        # compared, then matches at 112 and resets after its delay, at 113
+        splitter.splits.current_image_index = 1
+        feed = FrameFeed(
+            clock,
+            [(blank, 111.5), (reset_image.image, 112)],
+            splitter._compare_reset_thread_finished,
+        )
+        assert splitter._look_for_reset()
+        assert feed.first_get_time == 111
+        splitter._reset()
+        assert recorded[1] == (RunEvent.RESET, 113)
+        assert clock.now() == 113
+        assert splitter.reset_split_action
+
+        # Nothing actually waited
+        assert time.perf_counter() - start_time < 1
+        splitter.safe_exit_all_threads()
@@ -0,0 +1,96 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Test state_server.py."""
+
+import json
+import socket
+import time
+
+import pytest
+
+from splitter.state_server import StateServer
+
+
+def read_messages(stream, count):
+    return [json.loads(stream.readline()) for _ in range(count)]
+
+
+@pytest.fixture
+def server():
+    state = {"type": "state", "match_percent": 0.5}
+    state_server = StateServer(lambda: dict(state), port=0, rate_hz=100)
+    # Port 0 picks a free port; look it up once the server is listening
+    assert state_server.start()
+    state_server.port = state_server._listener.getsockname()[1]
+    state_server.state = state
+    yield state_server
+    state_server.stop()
+
+
+class TestStateServer:
+    """Test streaming state and taking commands over TCP."""
+
+    def test_sends_state_and_events(self, server):
+        with socket.create_connection(("127.0.0.1", server.port)) as client:
+            stream = client.makefile("r")
+            assert read_messages(stream, 1)[0]["match_percent"] == 0.5
+
+            server.post_event("split", "first")
+            server.state["match_percent"] = 0.9
+            messages = read_messages(stream, 2)
+            assert messages[0]["event"] == "split"
+            assert messages[0]["split_name"] == "first"
+            assert messages[1]["match_percent"] == 0.9
+
+    def test_accepts_commands(self, server):
+        with socket.create_connection(("127.0.0.1", server.port)) as client:
+            client.sendall(b'split\n{"command": "reset"}\n\nfly\n')
+            stream = client.makefile("r")
+            messages = read_messages(stream, 2)
+            assert messages[1] == {"type": "error", "message": "Unknown command: fly"}
+        assert server.get_commands() == ["split", "reset"]
+
+    def test_slow_client_gets_latest_state_only(self, server):
+        with socket.create_connection(("127.0.0.1", server.port)) as client:
+            # Send more states than the sockets can buffer while the client
+            # isn't reading
+            for i in range(100):
+                server.state["match_percent"] = i / 100
+                server.state["padding"] = "x" * 100000
+                time.sleep(0.002)
+            server.state["match_percent"] = 1.0
+            time.sleep(0.1)
+
+            stream = client.makefile("r")
+            states = []
+            while not states or states[-1]["match_percent"] != 1.0:
+                states.extend(read_messages(stream, 1))
+            assert len(states) < 100
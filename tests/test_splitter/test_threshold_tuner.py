@@ -0,0 +1,109 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Test threshold_tuner.py."""
+
+import cv2
+import numpy
+import pytest
+
+from splitter import threshold_tuner
+
+
+class TestThresholdTuner:
+    """Test computing match percent curves and suggesting thresholds."""
+
+    def test_curve_peaks_on_matching_frames(self, tmp_path):
+        split_dir = tmp_path / "splits"
+        split_dir.mkdir()
+        red = numpy.zeros((240, 320, 3), numpy.uint8)
+        red[:, :, 2] = 255
+        cv2.imwrite(str(split_dir / "001_red.png"), red)
+
+        # 30 black frames, 10 red frames, 30 black frames. MPEG-4 only puts a
+        # keyframe every 12 frames, so most chunks have to seek between
+        # keyframes
+        video_path = str(tmp_path / "run.mp4")
+        writer = cv2.VideoWriter(
+            video_path, cv2.VideoWriter_fourcc(*"mp4v"), 30, (320, 240)
+        )
+        for index in range(70):
+            writer.write(red if 30 <= index < 40 else numpy.zeros_like(red))
+        writer.release()
+
+        images = threshold_tuner.load_images(str(split_dir))
+        curves, times = threshold_tuner.compute_curves(video_path, images, workers=4)
+        # Every frame is compared once, in order, whichever chunk it's in
+        assert curves.shape == (1, 70)
+        numpy.testing.assert_allclose(times, numpy.arange(70) / 30, atol=1e-3)
+        red_frames = numpy.flatnonzero(curves[0] > 0.5)
+        assert list(red_frames) == list(range(30, 40))
+
+        suggestion = threshold_tuner.suggest_threshold(
+            images[0].name, curves[0], times, window_secs=0.5
+        )
+        assert suggestion.ok
+        assert suggestion.background < suggestion.threshold < suggestion.peak
+        assert 1.0 <= suggestion.peak_time < 40 / 30
+
+        threshold_tuner.write_report(
+            str(tmp_path / "out"), images, curves, times, [suggestion]
+        )
+        assert (tmp_path / "out" / "report.html").exists()
+        assert numpy.load(tmp_path / "out" / "curves.npz")["curves"].shape == (1, 70)
+
+    def test_main_writes_report(self, tmp_path, capsys):
+        split_dir = tmp_path / "splits"
+        split_dir.mkdir()
+        red = numpy.zeros((240, 320, 3), numpy.uint8)
+        red[:, :, 2] = 255
+        cv2.imwrite(str(split_dir / "001_red.png"), red)
+        video_path = str(tmp_path / "run.avi")
+        writer = cv2.VideoWriter(
+            video_path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (320, 240)
+        )
+        for index in range(40):
+            writer.write(red if 20 <= index < 25 else numpy.zeros_like(red))
+        writer.release()
+
+        out_dir = tmp_path / "out"
+        threshold_tuner.main(
+            [video_path, str(split_dir), "-o", str(out_dir), "--workers", "1"]
+        )
+        assert "Wrote 40 frames" in capsys.readouterr().out
+        assert (out_dir / "report.html").exists()
+
+    def test_main_rejects_missing_video(self, tmp_path):
+        split_dir = tmp_path / "splits"
+        split_dir.mkdir()
+        cv2.imwrite(
+            str(split_dir / "001_black.png"), numpy.zeros((240, 320, 3), numpy.uint8)
+        )
+        with pytest.raises(SystemExit):
+            threshold_tuner.main([str(tmp_path / "missing.mp4"), str(split_dir)])
@@ -0,0 +1,62 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Test startup_timeline.py."""
+
+import time
+
+from startup_timeline import StartupTimeline
+
+
+class TestStartupTimeline:
+    """Test recording startup phases."""
+
+    def test_marks_follow_each_other(self, capsys):
+        timeline = StartupTimeline(enabled=True)
+        time.sleep(0.01)
+        timeline.mark("first")
+        with timeline.phase("background"):
+            time.sleep(0.01)
+        timeline.mark("second")
+
+        names = [name for name, _, _ in timeline.phases]
+        assert names == ["first", "background", "second"]
+        # "second" starts where "first" ended, not where "background" ended
+        assert timeline.phases[2][1] == timeline.phases[0][2]
+        assert timeline.get_elapsed("first") >= 0.01
+        assert timeline.get_elapsed("missing") is None
+        assert capsys.readouterr().out.count("[startup]") == 3
+
+    def test_disabled(self, capsys):
+        timeline = StartupTimeline(enabled=False)
+        timeline.mark("first")
+        with timeline.phase("second"):
+            pass
+        assert timeline.phases == []
+        assert capsys.readouterr().out == ""
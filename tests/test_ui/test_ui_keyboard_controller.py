@@ -0,0 +1,75 @@
+# Copyright (c) 2024-2025 pilgrim_tabby
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Test ui_keyboard_controller.py."""
+
+from ui.ui_keyboard_controller import InputDispatcher
+
+
+class TestInputDispatcher:
+    """Test looking up and queueing hotkey presses."""
+
+    def test_queues_bound_keys_in_order(self):
+        dispatcher = InputDispatcher(debounce_secs=0)
+        dispatcher.set_bindings(
+            {"split": ("f1", "f1"), "reset": ("f2", "112"), "undo": ("", "")}
+        )
+
+        assert dispatcher.handle_key("f1", "f1") == "split"
+        assert dispatcher.handle_key("f2", 112) == "reset"
+        assert dispatcher.handle_key("f3", "f3") is None
+        assert dispatcher.handle_key("", "") is None
+        assert dispatcher.get_actions() == ["split", "reset"]
+        assert dispatcher.get_actions() == []
+
+        stats = dispatcher.get_stats()
+        assert stats.events_handled == 2
+        assert 0 <= stats.mean_latency_ms <= stats.max_latency_ms
+        assert stats.describe().startswith("2 hotkey press(es) handled")
+
+    def test_rebinding_replaces_table(self):
+        dispatcher = InputDispatcher(debounce_secs=0)
+        dispatcher.set_bindings({"split": ("f1", "f1")})
+        dispatcher.set_bindings({"split": ("f5", "f5")})
+
+        assert dispatcher.handle_key("f1", "f1") is None
+        assert dispatcher.handle_key("f5", "f5") == "split"
+
+    def test_debounces_repeats_and_pauses(self):
+        dispatcher = InputDispatcher(debounce_secs=60)
+        dispatcher.set_bindings({"split": ("f1", "f1"), "skip": ("f2", "f2")})
+
+        assert dispatcher.handle_key("f1", "f1") == "split"
+        assert dispatcher.handle_key("f1", "f1") is None
+        assert dispatcher.handle_key("f2", "f2") == "skip"
+        dispatcher.paused = True
+        assert dispatcher.handle_key("f2", "f2") is None
+
+        assert dispatcher.get_actions() == ["split", "skip"]
+        assert dispatcher.get_stats().events_debounced == 1